@@ -0,0 +1,120 @@
+"""
+Benchmark loading artifacts from the memory-mappable format against dill pickles.
+
+Each object is saved once as a dill pickle and once in the artifact format
+(`src/utils/artifact_utils.py`). Every file is then loaded in a fresh
+process, and the median load time over the repeats and the resident memory
+added by the load are reported. The memory is split into private
+(anonymous) pages and file-backed pages, which are shared by every process
+that maps the same artifact. Linux only.
+
+Usage:
+    python benchmarks/artifact_benchmark.py --repeats 5
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+import dill
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sklearn.ensemble import RandomForestRegressor  # noqa: E402
+from xgboost import XGBRegressor  # noqa: E402
+
+from src.utils.artifact_utils import dump_artifact  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Loads one file, then prints the load time and the RSS added by the load
+PROBE = """
+import sys, time
+sys.path.insert(0, {root!r})
+from src.utils.file_utils import load_object
+
+def rss_kb():
+    values = {{}}
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(("RssAnon:", "RssFile:")):
+                name, value, _ = line.split()
+                values[name] = int(value)
+    return values["RssAnon:"], values["RssFile:"]
+
+import numpy, sklearn.ensemble, xgboost, dill
+anon, mapped = rss_kb()
+start = time.perf_counter()
+obj = load_object({path!r})
+elapsed = time.perf_counter() - start
+loaded_anon, loaded_mapped = rss_kb()
+print(elapsed, loaded_anon - anon, loaded_mapped - mapped)
+"""
+
+
+def build_objects() -> dict:
+    rng = np.random.default_rng(0)
+    X = rng.random((20000, 20))
+    y = rng.random(20000)
+    return {
+        "Random Forest (256 trees)": RandomForestRegressor(
+            n_estimators=256, random_state=0, n_jobs=-1
+        ).fit(X, y),
+        "XGBoost (256 trees, depth 7)": XGBRegressor(
+            n_estimators=256, max_depth=7
+        ).fit(X, y),
+        "NumPy arrays (4 x 64 MiB)": {
+            f"table_{index}": rng.random(8 * 1024 * 1024) for index in range(4)
+        },
+    }
+
+
+def measure(path: str) -> tuple:
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE.format(root=ROOT, path=path)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    elapsed, anon_kb, mapped_kb = result.stdout.split()[-3:]
+    return float(elapsed), int(anon_kb), int(mapped_kb)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    print(
+        "| Object | Format | Size (MiB) | Load (ms) | Private RSS (MiB) "
+        "| Shared file RSS (MiB) |"
+    )
+    print("|---|---|---|---|---|---|")
+    with tempfile.TemporaryDirectory() as directory:
+        for name, obj in build_objects().items():
+            dill_path = os.path.join(directory, "object.dill")
+            artifact_path = os.path.join(directory, "object.pkl")
+            with open(dill_path, "wb") as f:
+                dill.dump(obj, f)
+            with open(artifact_path, "wb") as f:
+                dump_artifact(obj, f)
+
+            for label, path in (("dill", dill_path), ("artifact", artifact_path)):
+                runs = [measure(path) for _ in range(args.repeats)]
+                elapsed = statistics.median(run[0] for run in runs)
+                anon_mb = statistics.median(run[1] for run in runs) / 1024
+                mapped_mb = statistics.median(run[2] for run in runs) / 1024
+                size_mb = os.path.getsize(path) / 2**20
+                print(
+                    f"| {name} | {label} | {size_mb:.0f} | {elapsed * 1000:.1f} "
+                    f"| {anon_mb:.0f} | {mapped_mb:.0f} |",
+                    flush=True,
+                )
+
+
+if __name__ == "__main__":
+    main()
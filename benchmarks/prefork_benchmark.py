@@ -0,0 +1,207 @@
+"""
+Benchmark the prefork launcher against independent uvicorn worker processes.
+
+For each worker count, the prediction REST API is started twice:
+- `prefork`: `launch_rest_api.py`, which loads the model once and forks the workers.
+- `uvicorn`: `uvicorn --workers N`, where every worker process loads its own copy.
+
+Each server is loaded by concurrent client processes posting random /predict
+requests (with the prediction cache disabled), and the throughput and the
+per-worker memory (RSS, PSS and USS from /proc/<pid>/smaps_rollup) are
+reported. Linux only.
+
+Usage:
+    python benchmarks/prefork_benchmark.py --workers 1 2 4 --clients 8 --duration 10
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+CATEGORIES = {
+    "gender": ["female", "male"],
+    "race_ethnicity": ["group A", "group B", "group C", "group D", "group E"],
+    "parental_level_of_education": [
+        "associate's degree",
+        "bachelor's degree",
+        "high school",
+        "master's degree",
+        "some college",
+        "some high school",
+    ],
+    "lunch": ["free/reduced", "standard"],
+    "test_preparation_course": ["completed", "none"],
+}
+
+
+def random_payload(rng: random.Random) -> dict:
+    data = {column: rng.choice(values) for column, values in CATEGORIES.items()}
+    data["reading_score"] = rng.randint(0, 100)
+    data["writing_score"] = rng.randint(0, 100)
+    return {"payload": {"data": data}}
+
+
+def run_client(uds: str, duration: float, seed: int) -> int:
+    rng = random.Random(seed)
+    requests = 0
+    with httpx.Client(
+        transport=httpx.HTTPTransport(uds=uds), base_url="http://prediction"
+    ) as client:
+        deadline = time.perf_counter() + duration
+        while time.perf_counter() < deadline:
+            response = client.post("/predict", json=random_payload(rng))
+            response.raise_for_status()
+            requests += 1
+    return requests
+
+
+def get_children(pid: int) -> list:
+    with open(f"/proc/{pid}/task/{pid}/children") as f:
+        return [int(child) for child in f.read().split()]
+
+
+def get_worker_pids(process: subprocess.Popen, mode: str, workers: int) -> list:
+    # uvicorn serves in-process with a single worker
+    if mode == "uvicorn" and workers == 1:
+        return [process.pid]
+    # uvicorn --workers keeps a multiprocessing helper next to the workers
+    return [
+        pid
+        for pid in get_children(process.pid)
+        if b"resource_tracker" not in open(f"/proc/{pid}/cmdline", "rb").read()
+    ]
+
+
+def get_memory_mib(pid: int) -> dict:
+    """Return the RSS, PSS and USS of a process in MiB."""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].endswith(":") and parts[1].isdigit():
+                fields[parts[0][:-1]] = int(parts[1]) / 1024
+    return {
+        "rss": fields["Rss"],
+        "pss": fields["Pss"],
+        "uss": fields["Private_Clean"] + fields["Private_Dirty"],
+    }
+
+
+def start_server(mode: str, workers: int, uds: str) -> subprocess.Popen:
+    if mode == "prefork":
+        command = [
+            sys.executable,
+            "launch_rest_api.py",
+            "--workers",
+            str(workers),
+            "--uds",
+            uds,
+        ]
+    else:
+        command = [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "predict_rest_api:app",
+            "--workers",
+            str(workers),
+            "--uds",
+            uds,
+        ]
+    env = {
+        **os.environ,
+        "PREDICTION_CACHE_ENABLED": "false",
+        "PIPELINE_RELOAD_INTERVAL": "0",
+        "LOG_LEVEL": "WARNING",
+    }
+    return subprocess.Popen(
+        command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+
+def wait_until_ready(process: subprocess.Popen, mode: str, workers: int, uds: str):
+    deadline = time.monotonic() + 120
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("Server exited during startup.")
+        try:
+            if len(get_worker_pids(process, mode, workers)) >= workers:
+                with httpx.Client(
+                    transport=httpx.HTTPTransport(uds=uds), base_url="http://prediction"
+                ) as client:
+                    # Warm up every worker
+                    for seed in range(workers * 20):
+                        client.post(
+                            "/predict", json=random_payload(random.Random(seed))
+                        ).raise_for_status()
+                return
+        except (httpx.HTTPError, OSError):
+            pass
+        time.sleep(0.5)
+    raise TimeoutError("Server did not become ready.")
+
+
+def benchmark(mode: str, workers: int, clients: int, duration: float) -> dict:
+    uds = os.path.join(tempfile.mkdtemp(), "predict.sock")
+    process = start_server(mode, workers, uds)
+    try:
+        wait_until_ready(process, mode, workers, uds)
+        with multiprocessing.Pool(clients) as pool:
+            counts = pool.starmap(
+                run_client, [(uds, duration, seed) for seed in range(clients)]
+            )
+
+        worker_pids = get_worker_pids(process, mode, workers)
+        memory = [get_memory_mib(pid) for pid in worker_pids]
+        # Include the supervising parent and any helper processes
+        total_pss = sum(
+            get_memory_mib(pid)["pss"]
+            for pid in set([process.pid] + get_children(process.pid))
+        )
+        return {
+            "mode": mode,
+            "workers": workers,
+            "requests_per_second": sum(counts) / duration,
+            "rss_mib": sum(m["rss"] for m in memory) / len(memory),
+            "pss_mib": sum(m["pss"] for m in memory) / len(memory),
+            "uss_mib": sum(m["uss"] for m in memory) / len(memory),
+            "total_pss_mib": total_pss,
+        }
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    print(
+        "| Mode | Workers | Requests/s | RSS/worker (MiB) | PSS/worker (MiB) "
+        "| USS/worker (MiB) | Total PSS (MiB) |"
+    )
+    print("|---|---|---|---|---|---|---|")
+    for workers in args.workers:
+        for mode in ("prefork", "uvicorn"):
+            result = benchmark(mode, workers, args.clients, args.duration)
+            print(
+                f"| {result['mode']} | {result['workers']} "
+                f"| {result['requests_per_second']:.0f} | {result['rss_mib']:.1f} "
+                f"| {result['pss_mib']:.1f} | {result['uss_mib']:.1f} "
+                f"| {result['total_pss_mib']:.1f} |",
+                flush=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark the cold-start time of the CLI and serving entry points.
+
+Each command is started as a fresh Python process several times, and the
+median and minimum wall-clock times are reported with the heavy libraries
+the process imported:
+- `help`: `launch_host.py --help`, which only parses the arguments.
+- `ingest`: `launch_host.py ingest`, which splits the dataset (written to a
+  temporary BASE_DIR).
+- `rest`: importing `predict_rest_api`, which loads the model.
+
+The benchmark exits with status 1 when a median exceeds its budget.
+
+Usage:
+    python benchmarks/startup_benchmark.py --repeats 5
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ("pandas", "sklearn", "xgboost", "catboost")
+
+# Median start-up budget per command, in seconds
+STARTUP_BUDGETS_SECONDS = {"help": 1.0, "ingest": 4.0, "rest": 5.0}
+
+# Runs the command in-process, then reports which heavy modules it imported
+PROBE = (
+    "import runpy, sys\n"
+    "sys.argv = {argv!r}\n"
+    "try:\n"
+    "    {run}\n"
+    "except SystemExit:\n"
+    "    pass\n"
+    "print('HEAVY_MODULES=' + ','.join(m for m in {modules!r} if m in sys.modules))\n"
+)
+
+COMMANDS = {
+    "help": (["launch_host.py", "--help"], "runpy.run_path('launch_host.py', run_name='__main__')"),
+    "ingest": (["launch_host.py", "ingest"], "runpy.run_path('launch_host.py', run_name='__main__')"),
+    "rest": (["predict_rest_api"], "import predict_rest_api"),
+}
+
+
+def measure(name: str, env: dict) -> tuple:
+    """
+    Start one command in a fresh interpreter.
+
+    Returns:
+        tuple: The wall-clock time in seconds and the heavy modules imported.
+    """
+    argv, run = COMMANDS[name]
+    code = PROBE.format(argv=argv, run=run, modules=HEAVY_MODULES)
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    elapsed = time.perf_counter() - start
+
+    modules = ""
+    for line in result.stdout.splitlines():
+        if line.startswith("HEAVY_MODULES="):
+            modules = line.split("=", 1)[1]
+    return elapsed, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument(
+        "--commands", nargs="+", choices=list(COMMANDS), default=list(COMMANDS)
+    )
+    args = parser.parse_args()
+
+    over_budget = False
+    with tempfile.TemporaryDirectory() as base_dir:
+        env = {
+            **os.environ,
+            "PIPELINE_RELOAD_INTERVAL": "0",
+            "TREE_ENGINE_MAX_ROWS": "1024",
+        }
+        print(f"{'command':<8} {'median (s)':>11} {'min (s)':>8} {'budget (s)':>11}  heavy modules")
+        for name in args.commands:
+            command_env = dict(env)
+            if name == "ingest":
+                command_env["BASE_DIR"] = base_dir
+            times = []
+            for _ in range(args.repeats):
+                elapsed, modules = measure(name, command_env)
+                times.append(elapsed)
+            median = statistics.median(times)
+            budget = STARTUP_BUDGETS_SECONDS[name]
+            over_budget |= median > budget
+            print(
+                f"{name:<8} {median:>11.3f} {min(times):>8.3f} {budget:>11.1f}  "
+                f"{modules or '-'}"
+            )
+
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark the array-backed tree ensemble engine against the native predict calls.
+
+Each tree ensemble from `config/model_config.yaml` is fitted on the student
+dataset (with the largest configured size) and the median latency of the
+native `model.predict` and of `TreeEnsemble.predict` is reported for several
+batch sizes.
+
+Usage:
+    python benchmarks/tree_engine_benchmark.py --batch-sizes 1 8 64 512
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from catboost import CatBoostRegressor  # noqa: E402
+from sklearn.ensemble import (  # noqa: E402
+    AdaBoostRegressor,
+    GradientBoostingRegressor,
+    RandomForestRegressor,
+)
+from xgboost import XGBRegressor  # noqa: E402
+
+from src.pipeline.tree_ensemble import TreeEnsemble  # noqa: E402
+from src.services.data_transformation_service import (  # noqa: E402
+    DataTransformationService,
+)
+
+MODELS = {
+    "Random Forest (256 trees)": lambda: RandomForestRegressor(
+        n_estimators=256, random_state=0
+    ),
+    "Gradient Boosting (256 trees)": lambda: GradientBoostingRegressor(
+        n_estimators=256, random_state=0
+    ),
+    "AdaBoost (256 trees)": lambda: AdaBoostRegressor(
+        n_estimators=256, random_state=0
+    ),
+    "XGBoost (256 trees, depth 7)": lambda: XGBRegressor(n_estimators=256, max_depth=7),
+    "CatBoost (100 trees, depth 10)": lambda: CatBoostRegressor(
+        iterations=100, depth=10, verbose=False, allow_writing_files=False
+    ),
+}
+
+
+def median_latency_us(predict, X, repeat: int = 7) -> float:
+    number = max(3, 2000 // len(X))
+    timings = timeit.repeat(lambda: predict(X), number=number, repeat=repeat)
+    return float(np.median(timings)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 64, 512])
+    args = parser.parse_args()
+
+    df = pd.read_csv("notebook/data/stud.csv")
+    preprocessor = DataTransformationService().get_data_transformer_object()
+    X = preprocessor.fit_transform(df.drop(columns=["math_score"]))
+    y = df["math_score"].to_numpy()
+    rng = np.random.default_rng(0)
+
+    print("| Model | Rows | Native (µs) | Engine (µs) | Speedup |")
+    print("|---|---|---|---|---|")
+    for name, factory in MODELS.items():
+        model = factory().fit(X, y)
+        engine = TreeEnsemble.from_model(model)
+        engine.verify(model, X)
+        for batch_size in args.batch_sizes:
+            batch = X[rng.integers(0, len(X), batch_size)]
+            native = median_latency_us(model.predict, batch)
+            array_engine = median_latency_us(engine.predict, batch)
+            print(
+                f"| {name} | {batch_size} | {native:.0f} | {array_engine:.0f} "
+                f"| {native / array_engine:.1f}x |",
+                flush=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Launch the prediction REST API with pre-forked workers.
+
+The parent process loads the model and preprocessor once, then forks the
+workers, which share the loaded model memory copy-on-write. The parent
+supervises the workers and restarts any that exit.
+"""
+
+import argparse
+
+from src.config.config import Config
+from src.logger_manager import LoggerManager
+from src.runtime.prefork_server import PreforkServer
+
+logging = LoggerManager.get_logger(__name__)
+
+
+def parse_arguments() -> argparse.Namespace:
+    config = Config()
+    parser = argparse.ArgumentParser(
+        description="Serve the prediction REST API with pre-forked workers."
+    )
+    parser.add_argument(
+        "--app",
+        type=str,
+        default="predict_rest_api:app",
+        help="Import path of the ASGI application.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=config.SERVE_WORKERS,
+        help="Number of worker processes.",
+    )
+    parser.add_argument(
+        "--host", type=str, default="0.0.0.0", help="Host to bind to."
+    )
+    parser.add_argument("--port", type=int, default=8008, help="Port to bind to.")
+    parser.add_argument(
+        "--uds",
+        type=str,
+        default=config.PREDICTION_SERVICE_UDS,
+        help="Unix domain socket to bind to instead of host and port.",
+    )
+    parser.add_argument(
+        "--pin-cpus",
+        action="store_true",
+        default=config.SERVE_PIN_CPUS,
+        help="Pin each worker to one CPU core.",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_arguments()
+    PreforkServer(
+        app_path=args.app,
+        workers=args.workers,
+        host=args.host,
+        port=args.port,
+        uds=args.uds or None,
+        pin_cpus=args.pin_cpus,
+    ).run()
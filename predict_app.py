@@ -5,7 +5,7 @@ from sklearn.preprocessing import StandardScaler
 
 
 from src.schemas.prediction_input_schema import PredictionInputSchema
-from src.pipeline.predict_pipeline import PredictPipeline
+from src.pipeline.pipeline_provider import PipelineProvider
 
 from src.logger_manager import LoggerManager
 from pydantic import ValidationError
@@ -13,6 +13,9 @@ from pydantic import ValidationError
 logging = LoggerManager.get_logger(__name__)
 application = Flask(__name__)
 
+# Shared prediction pipeline, loaded once and hot reloaded when artifacts change
+pipeline_provider = PipelineProvider()
+
 app = application
 
 ## Route for a home page
@@ -47,7 +50,7 @@ def predict_datapoint():
             logging.info(pred_df)
 
             # Perform prediction
-            predict_pipeline = PredictPipeline()
+            predict_pipeline = pipeline_provider.get()
             results = predict_pipeline.predict(pred_df)
             logging.info("Prediction successful.")
 
@@ -1,14 +1,29 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request, Form
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
-import httpx
 import uvicorn
 
-app = FastAPI()
+from src.services.prediction_transport_service import PredictionTransportService
+
+# Shared transport to the prediction service, created once per application
+prediction_transport = PredictionTransportService()
 
-templates = Jinja2Templates(directory="templates")
 
-FASTAPI_REST_URL = "http://127.0.0.1:8008/predict"
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Open the pooled prediction transport on startup and close it on shutdown.
+    """
+    await prediction_transport.start()
+    yield
+    await prediction_transport.close()
+
+
+app = FastAPI(lifespan=lifespan)
+
+templates = Jinja2Templates(directory="templates")
 
 
 @app.get("/", response_class=HTMLResponse)
@@ -31,7 +46,7 @@ async def submit(
     writing_score: float = Form(...),
 ):
     """
-    Handle form submission and call the FastAPI REST service.
+    Handle form submission and call the prediction service.
     """
     payload = {
         "payload": {
@@ -48,11 +63,9 @@ async def submit(
     }
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(FASTAPI_REST_URL, json=payload)
-            response_data = response.json()
+        status_code, response_data = await prediction_transport.predict(payload)
 
-        if response.status_code == 200:
+        if status_code == 200:
             result = response_data.get("data", {}).get("math_score", "N/A")
             return templates.TemplateResponse(
                 "fasthtml_result.html", {"request": request, "result": result}
@@ -1,19 +1,410 @@
-from fastapi import FastAPI, HTTPException
+import time
+from contextlib import asynccontextmanager
+
+import anyio.to_thread
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.exception_handlers import request_validation_exception_handler
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse
 from pydantic import ValidationError
+from src.config.config import Config
+from src.models.batch_prediction_request import BatchPredictionRequest
+from src.models.batch_prediction_response import BatchPredictionResponse
 from src.models.prediction_request import PredictionRequest
 from src.models.prediction_response import PredictionResponse
-from src.pipeline.predict_pipeline import PredictPipeline
+from src.pipeline.admission_control import AdmissionController, AdmissionMiddleware
+from src.pipeline.inference_pool import InferencePool
+from src.pipeline.micro_batcher import MicroBatcher
+from src.pipeline.pipeline_provider import PipelineProvider
+from src.pipeline.prediction_cache import PredictionCache
 from src.schemas.prediction_input_schema import PredictionInputSchema
 from src.logger_manager import LoggerManager
+from src.utils.metrics_utils import (
+    PROMETHEUS_CONTENT_TYPE,
+    MetricsRegistry,
+    RequestMetricsMiddleware,
+)
+from src.utils.ndjson_utils import NDJSONStreamingResponse, iter_ndjson_lines
+from src.utils.serialization_utils import (
+    ARROW_MEDIA_TYPE,
+    JSON_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE,
+    NegotiatedRoute,
+    dumps_json,
+    encode_arrow_table,
+    encode_content,
+    negotiate_media_type,
+)
+from src.utils.validation_utils import format_validation_errors, validate_columns
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Size the thread pool running the prediction work, and start the inference
+    pool workers with the server and stop them with it.
+    """
+    anyio.to_thread.current_default_thread_limiter().total_tokens = (
+        config.SERVER_THREAD_POOL_SIZE
+    )
+    if (
+        admission_controller is not None
+        and admission_controller.max_concurrency > config.SERVER_THREAD_POOL_SIZE
+    ):
+        logging.warning(
+            f"ADMISSION_MAX_CONCURRENCY ({admission_controller.max_concurrency}) is "
+            f"above SERVER_THREAD_POOL_SIZE ({config.SERVER_THREAD_POOL_SIZE}): "
+            "admitted requests will queue in the thread pool instead of being shed."
+        )
+    if inference_pool is not None:
+        await run_in_threadpool(inference_pool.start)
+    yield
+    if inference_pool is not None:
+        await run_in_threadpool(inference_pool.close)
+
 
-# Initialize the FastAPI application
-app = FastAPI()
+# Initialize the FastAPI application, decoding JSON, msgpack and Arrow request bodies
+app = FastAPI(lifespan=lifespan)
+app.router.route_class = NegotiatedRoute
 
 # Initialize the logger
 logging = LoggerManager.get_logger(__name__)
 
-# Initialize the prediction pipeline
-predict_pipeline = PredictPipeline()
+# Per-process latency and throughput metrics, exposed on /metrics
+metrics = MetricsRegistry()
+stage_duration = metrics.histogram(
+    "prediction_stage_duration_seconds",
+    "Time spent in each stage of the prediction request path.",
+    ("endpoint", "stage"),
+)
+request_duration = metrics.histogram(
+    "prediction_request_duration_seconds",
+    "End-to-end HTTP request duration.",
+    ("endpoint",),
+)
+requests_total = metrics.counter(
+    "prediction_requests_total",
+    "HTTP requests served, by endpoint and status code.",
+    ("endpoint", "status"),
+)
+requests_in_flight = metrics.gauge(
+    "prediction_requests_in_flight", "HTTP requests currently being served."
+)
+admission_queue_depth = metrics.gauge(
+    "admission_queue_depth", "Prediction requests waiting for admission."
+)
+requests_shed_total = metrics.counter(
+    "prediction_requests_shed_total",
+    "Prediction requests shed by admission control, by endpoint and reason.",
+    ("endpoint", "reason"),
+)
+predictions_total = metrics.counter(
+    "predictions_total",
+    "Records scored successfully, by endpoint and model version.",
+    ("endpoint", "model_version"),
+)
+
+# Bound the prediction requests served at once; shed the excess with 503
+config = Config()
+admission_controller = (
+    AdmissionController(
+        max_concurrency=config.ADMISSION_MAX_CONCURRENCY,
+        max_queue=config.ADMISSION_MAX_QUEUE,
+        queue_timeout_ms=config.ADMISSION_QUEUE_TIMEOUT_MS,
+    )
+    if config.ADMISSION_CONTROL_ENABLED
+    else None
+)
+if admission_controller is not None:
+    app.add_middleware(
+        AdmissionMiddleware,
+        controller=admission_controller,
+        paths=("/predict", "/predict/batch", "/predict/stream"),
+        queue_depth=admission_queue_depth,
+        shed_total=requests_shed_total,
+        stage_duration=stage_duration,
+    )
+# Added last, so it is the outermost middleware and also sees shed requests
+app.add_middleware(
+    RequestMetricsMiddleware,
+    requests_total=requests_total,
+    requests_in_flight=requests_in_flight,
+    request_duration=request_duration,
+)
+
+# Initialize the shared prediction pipeline (loaded once, hot reloaded on change)
+pipeline_provider = PipelineProvider()
+pipeline_provider.get()
+
+# Optionally score in a pool of worker processes, each holding its own pipelines
+inference_pool = (
+    InferencePool(
+        workers=config.INFERENCE_WORKERS,
+        task_batch_size=config.INFERENCE_TASK_BATCH_SIZE,
+    )
+    if config.INFERENCE_MODE == "process"
+    else None
+)
+
+
+# Request headers selecting the model version, and the response header naming it
+MODEL_VERSION_HEADER = "X-Model-Version"
+ROUTING_KEY_HEADER = "X-Routing-Key"
+
+
+# Location of the record in a request body, stripped from reported error fields
+DATA_LOC = ("body", "payload", "data")
+
+
+@app.exception_handler(RequestValidationError)
+async def handle_request_validation_error(request: Request, exc: RequestValidationError):
+    """
+    Report invalid input records as 400 Bad Request with `{field, error}` details
+    relative to the record. Malformed request envelopes keep the standard 422.
+    """
+    errors = exc.errors()
+    if not errors or any(tuple(err["loc"][:3]) != DATA_LOC for err in errors):
+        return await request_validation_exception_handler(request, exc)
+
+    formatted_errors = format_validation_errors(exc, loc_prefix=DATA_LOC)
+    logging.error(f"Validation Error: {formatted_errors}")
+    return JSONResponse(
+        status_code=400,
+        content={
+            "detail": {
+                "code": -1,
+                "code_text": "error",
+                "message": "Validation error occurred.",
+                "errors": formatted_errors,
+            }
+        },
+    )
+
+
+def resolve_model_version(request: Request) -> str:
+    """
+    Picks the model version serving a request, from its `X-Model-Version`
+    header or else the registry's routing (sticky per `X-Routing-Key`).
+
+    Raises:
+        HTTPException: 404 if the requested version is not loaded.
+    """
+    try:
+        return pipeline_provider.resolve_version(
+            request.headers.get(MODEL_VERSION_HEADER),
+            request.headers.get(ROUTING_KEY_HEADER),
+        )
+    except ValueError as e:
+        logging.error(f"Routing Error: {str(e)}")
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "code": -1,
+                "code_text": "error",
+                "message": str(e),
+                "errors": None,
+            },
+        )
+
+
+def predict_columns(columns: dict, endpoint: str, version: str = None):
+    """
+    Score a columnar batch with a single transform and predict call (in the
+    inference pool when it is enabled), recording the duration of each stage
+    for the given endpoint.
+    """
+    timings = {}
+    if inference_pool is not None:
+        predictions = inference_pool.predict(columns, version, timings=timings)
+    else:
+        predictions = pipeline_provider.get(version).predict(columns, timings=timings)
+    for stage, seconds in timings.items():
+        stage_duration.observe(seconds, endpoint, stage)
+    return predictions
+
+
+def predict_records(records, endpoint: str = "/predict", version: str = None):
+    """
+    Score a list of validated records with a single transform and predict call.
+    """
+    with stage_duration.time(endpoint, "to_columns"):
+        columns = PredictionInputSchema.to_columns(records)
+    return predict_columns(columns, endpoint, version)
+
+
+def predict_versioned_records(items: list) -> list:
+    """
+    Score micro-batched `(version, record)` items, with one transform and
+    predict call per model version present in the batch.
+    """
+    positions_by_version = {}
+    for position, (version, _) in enumerate(items):
+        positions_by_version.setdefault(version, []).append(position)
+
+    predictions = [None] * len(items)
+    for version, positions in positions_by_version.items():
+        records = [items[position][1] for position in positions]
+        for position, prediction in zip(
+            positions, predict_records(records, "/predict", version)
+        ):
+            predictions[position] = prediction
+    return predictions
+
+
+def observe_parse_duration(request: Request, endpoint: str, model_stage: str = "parse"):
+    """
+    Records the time from the request's admission (or arrival, for requests
+    not subject to admission control) until the endpoint was called. Reading
+    and decoding the body is the "parse" stage, and validating the typed
+    request model is recorded under `model_stage`. The wait for admission is
+    the separate "queue" stage.
+
+    Args:
+        request (Request): The request being served.
+        endpoint (str): Endpoint the stage durations are recorded for.
+        model_stage (str): Stage the request model validation is recorded under.
+    """
+    now = time.perf_counter()
+    started_at = getattr(request.state, "admitted_at", None)
+    if started_at is None:
+        started_at = getattr(request.state, "received_at", None)
+    if started_at is None:
+        return
+    decoded_at = getattr(request.state, "decoded_at", None)
+    if decoded_at is None or model_stage == "parse":
+        stage_duration.observe(now - started_at, endpoint, "parse")
+        return
+    stage_duration.observe(decoded_at - started_at, endpoint, "parse")
+    stage_duration.observe(now - decoded_at, endpoint, model_stage)
+
+
+def serialize_response(
+    content: dict,
+    endpoint: str,
+    request: Request,
+    supported: tuple = (JSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE),
+    version: str = None,
+) -> Response:
+    """
+    Serializes a response body in the media type negotiated from the request's
+    Accept header (JSON by default), recording the serialization time.
+
+    Args:
+        content (dict): The response body, shaped like the endpoint's response model.
+        endpoint (str): Endpoint the serialization time is recorded for.
+        request (Request): The incoming request.
+        supported (tuple): Media types the endpoint can produce.
+        version (str): Model version that served the request, reported in the
+            `X-Model-Version` response header.
+
+    Returns:
+        Response: The serialized response.
+    """
+    with stage_duration.time(endpoint, "serialization"):
+        media_type = negotiate_media_type(request.headers.get("accept"), supported)
+        if media_type == ARROW_MEDIA_TYPE:
+            # Per-record results as columns; the status fields as schema metadata
+            results = content["data"]
+            body = encode_arrow_table(
+                {
+                    "index": [result["index"] for result in results],
+                    "math_score": [result["math_score"] for result in results],
+                    "errors": [
+                        dumps_json(result["errors"]).decode("utf-8")
+                        if result["errors"] is not None
+                        else None
+                        for result in results
+                    ],
+                },
+                metadata={key: content[key] for key in ("code", "code_text", "message")},
+            )
+        else:
+            body = encode_content(content, media_type)
+    headers = {MODEL_VERSION_HEADER: version} if version is not None else None
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+def batch_result(index: int, math_score: float = None, errors: list = None) -> dict:
+    """
+    Returns one per-record result, shaped like `BatchPredictionResult`.
+    """
+    return {
+        "index": index,
+        "math_score": None if math_score is None else float(math_score),
+        "errors": errors,
+    }
+
+
+# Optionally group concurrent /predict calls into vectorized batches
+micro_batcher = (
+    MicroBatcher(
+        predict_versioned_records,
+        max_batch_size=config.MICRO_BATCH_MAX_SIZE,
+        window_ms=config.MICRO_BATCH_WINDOW_MS,
+    )
+    if config.MICRO_BATCHING_ENABLED
+    else None
+)
+
+# Cache /predict results per version, purging replaced versions on reload
+prediction_cache = (
+    PredictionCache(
+        max_entries=config.PREDICTION_CACHE_MAX_ENTRIES,
+        ttl_seconds=config.PREDICTION_CACHE_TTL_SECONDS,
+        max_bytes=config.PREDICTION_CACHE_MAX_BYTES,
+    )
+    if config.PREDICTION_CACHE_ENABLED
+    else None
+)
+if prediction_cache is not None:
+    pipeline_provider.add_reload_listener(prediction_cache.retain_versions)
+
+
+def predict_record(record, version: str = None):
+    """
+    Score one validated record, through the micro-batcher when it is enabled.
+    """
+    if micro_batcher is not None:
+        # Perform prediction as part of a micro-batch
+        return float(micro_batcher.submit((version, record)))
+
+    return float(predict_records([record], version=version)[0])
+
+
+def score_batch(records: list, indices: list, endpoint: str, version: str = None) -> list:
+    """
+    Validate raw records in bulk and score them with a single transform and predict call.
+
+    Args:
+        records (list): Raw input records (dictionaries).
+        indices (list): Index reported for each record in the results.
+        endpoint (str): Endpoint the stage durations are recorded for.
+        version (str): Model version scoring the records (defaults to the default version).
+
+    Returns:
+        list: One result per record (see `batch_result`), in input order.
+    """
+    # Validate all records, collecting errors per record
+    with stage_duration.time(endpoint, "validation"):
+        columns, valid_positions, errors = validate_columns(records)
+    logging.info(
+        f"Batch validated: {len(valid_positions)} valid, {len(errors)} invalid."
+    )
+
+    predictions = []
+    if valid_positions:
+        # Score the columnar batch in a single call
+        predictions = predict_columns(columns, endpoint, version)
+        predictions_total.inc(endpoint, version, amount=len(valid_positions))
+        logging.info("Batch prediction successful.")
+
+    results = [None] * len(records)
+    for position, record_errors in errors.items():
+        results[position] = batch_result(indices[position], errors=record_errors)
+    for position, prediction in zip(valid_positions, predictions):
+        results[position] = batch_result(indices[position], math_score=prediction)
+    return results
 
 
 @app.get("/")
@@ -24,45 +415,129 @@ def read_root():
     return {"message": "FastAPI Prediction Service is running"}
 
 
+@app.get("/stats")
+def read_stats():
+    """
+    Endpoint exposing serving statistics used to tune throughput against latency.
+    """
+    return {
+        "pipeline": pipeline_provider.stats(),
+        "micro_batching": (
+            micro_batcher.stats.to_dict() if micro_batcher is not None else None
+        ),
+        "prediction_cache": (
+            prediction_cache.stats() if prediction_cache is not None else None
+        ),
+        "admission": (
+            admission_controller.stats() if admission_controller is not None else None
+        ),
+        "inference_pool": (
+            inference_pool.stats() if inference_pool is not None else None
+        ),
+    }
+
+
+@app.get("/metrics")
+def read_metrics():
+    """
+    Endpoint exposing per-stage latency histograms and request counters in
+    the Prometheus text format.
+    """
+    return Response(content=metrics.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
 @app.post("/predict", response_model=PredictionResponse)
-def predict(data: PredictionRequest):
+def predict(data: PredictionRequest, request: Request):
     """
     Endpoint to handle prediction requests.
 
+    The request body is parsed and validated once, into the typed request
+    model, recorded as the "parse" and "validation" stages. Invalid input data
+    is reported by `handle_request_validation_error`.
+    Requests and responses can be JSON or msgpack, negotiated with the
+    Content-Type and Accept headers.
+
     Args:
         data (PredictionRequest): Input data for prediction.
+        request (Request): The incoming request, used for content negotiation and latency metrics.
 
     Returns:
-        PredictionResponse: Result with status and math score.
+        Response: A PredictionResponse body with status and math score, in the
+        negotiated media type.
     """
+    observe_parse_duration(request, "/predict", model_stage="validation")
+    version = resolve_model_version(request)
     try:
-        # Extract and validate the input data
-        inner_data = data.payload.get("data", {})
-        validated_data = PredictionInputSchema(**inner_data)
-        input_data = validated_data.to_dataframe()
+        validated_data = data.payload.data
 
-        logging.info("Input data validated and converted to DataFrame.")
-
-        # Perform prediction
-        prediction = predict_pipeline.predict(input_data)
+        # Perform prediction, reusing cached or in-flight results for identical inputs
+        if prediction_cache is not None:
+            prediction = prediction_cache.get_or_compute(
+                validated_data,
+                lambda: predict_record(validated_data, version),
+                version=pipeline_provider.content_version(version),
+            )
+        else:
+            prediction = predict_record(validated_data, version)
+        predictions_total.inc("/predict", version)
         logging.info("Prediction successful.")
 
         # Return successful response with 200 OK
-        return PredictionResponse(
-            code=0,
-            code_text="ok",
-            message="Processed successfully.",
-            data={"math_score": prediction[0]},
+        return serialize_response(
+            {
+                "code": 0,
+                "code_text": "ok",
+                "message": "Processed successfully.",
+                "data": {"math_score": prediction},
+            },
+            "/predict",
+            request,
+            version=version,
         )
 
-    except ValidationError as e:
-        # Parse validation errors
-        error_details = e.errors()
-        formatted_errors = [
-            {"field": ".".join(map(str, err["loc"])), "error": err["msg"]}
-            for err in error_details
-        ]
-        logging.error(f"Validation Error: {formatted_errors}")
+    except Exception as e:
+        # Log unexpected errors
+        logging.error(f"Unexpected Error: {str(e)}")
+
+        # Return 500 Internal Server Error with detailed error response
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "code": -1,
+                "code_text": "error",
+                "message": "An internal server error occurred.",
+                "errors": None,
+            },
+        )
+
+
+@app.post("/predict/batch", response_model=BatchPredictionResponse)
+def predict_batch(data: BatchPredictionRequest, request: Request):
+    """
+    Endpoint to handle batch prediction requests.
+
+    All valid records are scored with a single transform and predict call.
+    Invalid records are reported individually and do not fail the batch.
+    Requests and responses can be JSON, msgpack or Arrow IPC (a table with
+    one input record per row), negotiated with the Content-Type and Accept
+    headers.
+
+    Args:
+        data (BatchPredictionRequest): Input records for prediction.
+        request (Request): The incoming request, used for content negotiation and latency metrics.
+
+    Returns:
+        Response: A BatchPredictionResponse body with per-record math scores or
+        validation errors, in the negotiated media type.
+    """
+    observe_parse_duration(request, "/predict/batch")
+    version = resolve_model_version(request)
+    records = data.payload.data
+    max_batch_size = config.MAX_BATCH_SIZE
+
+    if len(records) > max_batch_size:
+        message = f"Batch size must not exceed {max_batch_size} records"
+        logging.error(f"Validation Error: {message}")
 
         # Return 400 Bad Request with detailed error response
         raise HTTPException(
@@ -71,10 +546,29 @@ def predict(data: PredictionRequest):
                 "code": -1,
                 "code_text": "error",
                 "message": "Validation error occurred.",
-                "errors": formatted_errors,
+                "errors": [{"field": "data", "error": message}],
             },
         )
 
+    try:
+        results = score_batch(
+            records, list(range(len(records))), "/predict/batch", version
+        )
+        n_failed = sum(result["errors"] is not None for result in results)
+
+        return serialize_response(
+            {
+                "code": 0 if not n_failed else 1,
+                "code_text": "ok" if not n_failed else "partial",
+                "message": f"Processed {len(records) - n_failed} of {len(records)} records successfully.",
+                "data": results,
+            },
+            "/predict/batch",
+            request,
+            supported=(JSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE, ARROW_MEDIA_TYPE),
+            version=version,
+        )
+
     except Exception as e:
         # Log unexpected errors
         logging.error(f"Unexpected Error: {str(e)}")
@@ -91,8 +585,106 @@ def predict(data: PredictionRequest):
         )
 
 
+async def stream_predictions(byte_stream, version: str = None):
+    """
+    Score an NDJSON stream of PredictionRequest payloads in fixed-size chunks.
+
+    Each line is parsed and validated once, into the typed request model.
+    Each chunk is scored with one transform and predict call, and its results
+    are yielded as NDJSON lines as soon as the chunk finishes.
+
+    Args:
+        byte_stream (AsyncIterator[bytes]): The request body stream.
+        version (str): Model version scoring the records (defaults to the default version).
+
+    Yields:
+        bytes: NDJSON result lines for one chunk.
+    """
+    records, indices, parse_errors = [], [], []
+    index = 0
+
+    async def score_chunk():
+        results = [
+            batch_result(error_index, errors=errors)
+            for error_index, errors in parse_errors
+        ]
+        try:
+            if records:
+                predictions = await run_in_threadpool(
+                    predict_records, records, "/predict/stream", version
+                )
+                predictions_total.inc("/predict/stream", version, amount=len(records))
+                results.extend(
+                    batch_result(record_index, math_score=prediction)
+                    for record_index, prediction in zip(indices, predictions)
+                )
+        except Exception as e:
+            logging.error(f"Unexpected Error: {str(e)}")
+            error = [{"field": "", "error": "An internal server error occurred."}]
+            results.extend(
+                batch_result(record_index, errors=error)
+                for record_index in indices
+            )
+        results.sort(key=lambda result: result["index"])
+        records.clear()
+        indices.clear()
+        parse_errors.clear()
+        with stage_duration.time("/predict/stream", "serialization"):
+            return b"".join(dumps_json(result) + b"\n" for result in results)
+
+    try:
+        async for line in iter_ndjson_lines(
+            byte_stream, max_line_bytes=config.STREAM_MAX_LINE_BYTES
+        ):
+            try:
+                with stage_duration.time("/predict/stream", "parse"):
+                    request = PredictionRequest.model_validate_json(line)
+                records.append(request.payload.data)
+                indices.append(index)
+            except ValidationError as e:
+                parse_errors.append(
+                    (index, format_validation_errors(e, loc_prefix=DATA_LOC[1:]))
+                )
+            index += 1
+
+            if len(records) + len(parse_errors) >= config.STREAM_CHUNK_SIZE:
+                yield await score_chunk()
+    except ValueError as e:
+        # Stop at an oversized line, after reporting it
+        parse_errors.append((index, [{"field": "", "error": str(e)}]))
+
+    if records or parse_errors:
+        yield await score_chunk()
+
+
+@app.post("/predict/stream")
+async def predict_stream(request: Request):
+    """
+    Endpoint to score an NDJSON stream of PredictionRequest payloads.
+
+    The request body is parsed incrementally and scored in chunks of
+    `STREAM_CHUNK_SIZE` records. Results are streamed back as NDJSON lines
+    with the same shape as the /predict/batch results, so memory stays flat
+    regardless of the upload size.
+
+    Args:
+        request (Request): The incoming request with an NDJSON body.
+
+    Returns:
+        NDJSONStreamingResponse: NDJSON results, one line per input line.
+    """
+    version = resolve_model_version(request)
+    return NDJSONStreamingResponse(
+        stream_predictions(request.stream(), version),
+        headers={MODEL_VERSION_HEADER: version},
+    )
+
+
 if __name__ == "__main__":
     import uvicorn
 
-    # Run the FastAPI application
-    uvicorn.run(app, host="0.0.0.0", port=8008)
+    # Run the FastAPI application, on a Unix domain socket for co-located front ends
+    if config.PREDICTION_SERVICE_UDS:
+        uvicorn.run(app, uds=config.PREDICTION_SERVICE_UDS)
+    else:
+        uvicorn.run(app, host="0.0.0.0", port=8008)
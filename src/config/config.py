@@ -26,6 +26,13 @@ class Config(metaclass=SingletonMeta):
         self._model_type = None  # Default value for model_type
         self._best_of_all = False  # Default value for best_of_all
         self._save_best = False  # Default value for save_best
+        self._model_version = None  # Registry version of the saved best model
+        self._cpu_budget = int(
+            os.getenv("TRAINING_CPU_BUDGET", str(os.cpu_count() or 1))
+        )  # Cores shared by the search workers and the libraries' threads
+        self._cpu_policy = os.getenv(
+            "TRAINING_CPU_POLICY", "auto"
+        )  # Default split of the cores: auto, outer, inner or balanced
 
         # Base directory for artifacts
         self.BASE_DIR = os.getenv("BASE_DIR", "artifacts")
@@ -37,6 +44,9 @@ class Config(metaclass=SingletonMeta):
             self.MODEL_DIR, "model.pkl"
         )  # Training history directory
         self.PREPROCESSOR_FILE_PATH = os.path.join(self.BASE_DIR, "preprocessor.pkl")
+        self.FOLDED_MODEL_FILE_PATH = os.path.join(
+            self.MODEL_DIR, "folded_model.pkl"
+        )  # Linear model with the preprocessor folded in
         self.LOG_DIR = os.path.join(self.BASE_DIR, "logs")
         self.HISTORY_DIR = os.path.join(
             self.BASE_DIR, "history"
@@ -47,15 +57,138 @@ class Config(metaclass=SingletonMeta):
         )  # Training history directory
 
         self.REPORTS_DIR = os.path.join(self.BASE_DIR, "reports")
+        self.TRAINING_CACHE_DIR = os.path.join(
+            self.BASE_DIR, "training_cache"
+        )  # Content-addressed CV scores and fitted models
         self.PROCESSED_DATA_DIR = os.path.join(self.BASE_DIR, "data", "processed")
 
-        # Ensure all necessary directories exist
-        self._ensure_directories_exist()
+        # Artifact settings
+        self.ARTIFACT_SERIALIZATION = os.getenv(
+            "ARTIFACT_SERIALIZATION", "artifact"
+        )  # "artifact" (memory-mappable, with a manifest) or "dill" (legacy pickles)
+
+        # Training settings
+        self.DATA_SPLIT_SEED = int(
+            os.getenv("DATA_SPLIT_SEED", "42")
+        )  # Seed of the train/test split, so runs on the same data can share cached results
+        self.TRAINING_SCHEDULER_ENABLED = (
+            os.getenv("TRAINING_SCHEDULER_ENABLED", "true").lower() == "true"
+        )  # Train --best-of-all models as one task graph on a shared worker pool
+        self.TRAINING_CACHE_ENABLED = (
+            os.getenv("TRAINING_CACHE_ENABLED", "true").lower() == "true"
+        )  # Reuse the CV scores and fitted models of earlier runs
+        self.TRAINING_CACHE_MAX_BYTES = int(
+            os.getenv("TRAINING_CACHE_MAX_BYTES", str(1024 * 1024 * 1024))
+        )  # Least recently used entries are evicted above this size
+
+        # Prediction service settings
+        self.MAX_BATCH_SIZE = int(
+            os.getenv("MAX_BATCH_SIZE", "10000")
+        )  # Maximum number of records accepted by /predict/batch
+        self.STREAM_CHUNK_SIZE = int(
+            os.getenv("STREAM_CHUNK_SIZE", "500")
+        )  # Records scored per chunk by /predict/stream
+        self.STREAM_MAX_LINE_BYTES = int(
+            os.getenv("STREAM_MAX_LINE_BYTES", str(1024 * 1024))
+        )
+        self.MICRO_BATCHING_ENABLED = (
+            os.getenv("MICRO_BATCHING_ENABLED", "false").lower() == "true"
+        )  # Group concurrent /predict calls into vectorized batches
+        self.MICRO_BATCH_MAX_SIZE = int(os.getenv("MICRO_BATCH_MAX_SIZE", "32"))
+        self.MICRO_BATCH_WINDOW_MS = float(os.getenv("MICRO_BATCH_WINDOW_MS", "2"))
+        self.INFERENCE_MODE = os.getenv(
+            "INFERENCE_MODE", "thread"
+        )  # One of: thread (in the server process), process (in a worker pool)
+        self.INFERENCE_WORKERS = int(
+            os.getenv("INFERENCE_WORKERS", str(os.cpu_count() or 1))
+        )  # Worker processes of the process inference pool
+        self.INFERENCE_TASK_BATCH_SIZE = int(
+            os.getenv("INFERENCE_TASK_BATCH_SIZE", "256")
+        )  # Maximum rows per task sent to an inference pool worker
+        self.PIPELINE_RELOAD_INTERVAL = float(
+            os.getenv("PIPELINE_RELOAD_INTERVAL", "5")
+        )  # Seconds between artifact change checks (0 disables hot reload)
+        self.COMPILED_PREPROCESSOR_ENABLED = (
+            os.getenv("COMPILED_PREPROCESSOR_ENABLED", "true").lower() == "true"
+        )  # Use the pandas-free compiled preprocessor when it verifies
+        self.LINEAR_FOLDING_ENABLED = (
+            os.getenv("LINEAR_FOLDING_ENABLED", "true").lower() == "true"
+        )  # Serve linear models from the folded closed form when it verifies
+        self.TREE_ENGINE_ENABLED = (
+            os.getenv("TREE_ENGINE_ENABLED", "true").lower() == "true"
+        )  # Serve tree ensembles from the array-backed engine when it verifies
+        tree_engine_max_rows = os.getenv("TREE_ENGINE_MAX_ROWS", "auto")
+        self.TREE_ENGINE_MAX_ROWS = (
+            None if tree_engine_max_rows == "auto" else int(tree_engine_max_rows)
+        )  # Larger batches use the native model predict (None: measured at load)
+        self.PREDICTION_CACHE_ENABLED = (
+            os.getenv("PREDICTION_CACHE_ENABLED", "true").lower() == "true"
+        )  # Cache /predict results keyed on the validated input
+        self.PREDICTION_CACHE_MAX_ENTRIES = int(
+            os.getenv("PREDICTION_CACHE_MAX_ENTRIES", "10000")
+        )
+        self.PREDICTION_CACHE_TTL_SECONDS = float(
+            os.getenv("PREDICTION_CACHE_TTL_SECONDS", "300")
+        )
+        self.PREDICTION_CACHE_MAX_BYTES = int(
+            os.getenv("PREDICTION_CACHE_MAX_BYTES", str(16 * 1024 * 1024))
+        )
+
+        self.ADMISSION_CONTROL_ENABLED = (
+            os.getenv("ADMISSION_CONTROL_ENABLED", "true").lower() == "true"
+        )  # Bound concurrent prediction requests and shed the excess with 503
+        self.SERVER_THREAD_POOL_SIZE = int(
+            os.getenv("SERVER_THREAD_POOL_SIZE", "40")
+        )  # Threads running the blocking prediction work (anyio's default limiter)
+        self.ADMISSION_MAX_CONCURRENCY = int(
+            os.getenv(
+                "ADMISSION_MAX_CONCURRENCY",
+                str(min(2 * (os.cpu_count() or 1), self.SERVER_THREAD_POOL_SIZE)),
+            )
+        )  # Above the thread pool size, requests queue in the pool instead of being shed
+        self.ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "64"))
+        self.ADMISSION_QUEUE_TIMEOUT_MS = float(
+            os.getenv("ADMISSION_QUEUE_TIMEOUT_MS", "500")
+        )
+
+        # Front end to prediction service transport settings
+        self.PREDICTION_TRANSPORT = os.getenv(
+            "PREDICTION_TRANSPORT", "http"
+        )  # One of: http, uds, inprocess
+        self.PREDICTION_SERVICE_URL = os.getenv(
+            "PREDICTION_SERVICE_URL", "http://127.0.0.1:8008/predict"
+        )
+        self.PREDICTION_SERVICE_UDS = os.getenv(
+            "PREDICTION_SERVICE_UDS"
+        )  # Unix domain socket path shared with the REST API
+        self.PREDICTION_SERVICE_TIMEOUT = float(
+            os.getenv("PREDICTION_SERVICE_TIMEOUT", "5")
+        )
+        self.PREDICTION_SERVICE_CONNECT_TIMEOUT = float(
+            os.getenv("PREDICTION_SERVICE_CONNECT_TIMEOUT", "1")
+        )
+        self.PREDICTION_SERVICE_RETRIES = int(
+            os.getenv("PREDICTION_SERVICE_RETRIES", "2")
+        )  # Connection retries; requests are never re-sent once delivered
+        self.PREDICTION_SERVICE_MAX_CONNECTIONS = int(
+            os.getenv("PREDICTION_SERVICE_MAX_CONNECTIONS", "100")
+        )
+
+        # Prefork launcher settings
+        self.SERVE_WORKERS = int(
+            os.getenv("SERVE_WORKERS", str(os.cpu_count() or 1))
+        )  # Worker processes forked by launch_rest_api.py
+        self.SERVE_PIN_CPUS = (
+            os.getenv("SERVE_PIN_CPUS", "false").lower() == "true"
+        )  # Pin each worker to one CPU core
+
+        # Directories are created by `ensure_directories_exist` when a workflow
+        # first writes artifacts, not as a side effect of reading the settings
 
         # Mark as initialized
         Config._is_initialized = True
 
-    def _ensure_directories_exist(self):
+    def ensure_directories_exist(self):
         """
         Ensures that all necessary directories exist. Creates them if they do not.
         """
@@ -129,6 +262,42 @@ class Config(metaclass=SingletonMeta):
             raise ValueError("save_best must be a boolean value.")
         self._save_best = value
 
+    @property
+    def model_version(self):
+        """Get the registry version the best model is saved as."""
+        return self._model_version
+
+    @model_version.setter
+    def model_version(self, value):
+        """Set the registry version the best model is saved as."""
+        if not isinstance(value, (str, type(None))):
+            raise ValueError("model_version must be a string or None.")
+        self._model_version = value
+
+    @property
+    def cpu_budget(self):
+        """Get the number of cores training may use."""
+        return self._cpu_budget
+
+    @cpu_budget.setter
+    def cpu_budget(self, value):
+        """Set the number of cores training may use."""
+        if not isinstance(value, int) or value < 1:
+            raise ValueError("cpu_budget must be a positive integer.")
+        self._cpu_budget = value
+
+    @property
+    def cpu_policy(self):
+        """Get the default split of the cores between search workers and threads."""
+        return self._cpu_policy
+
+    @cpu_policy.setter
+    def cpu_policy(self, value):
+        """Set the default split of the cores between search workers and threads."""
+        if not isinstance(value, str):
+            raise ValueError("cpu_policy must be a string.")
+        self._cpu_policy = value
+
     @classmethod
     def initialize(cls):
         """
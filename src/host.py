@@ -4,8 +4,6 @@ from src.config.config import Config
 from src.exception import CustomException
 from src.logger_manager import LoggerManager
 from src.models.command_line_args import CommandLineArgs
-from src.pipeline.train_pipeline import TrainPipeline
-from src.services.data_ingestion_service import DataIngestionService
 
 logging = LoggerManager.get_logger(__name__)
 
@@ -32,6 +30,11 @@ class Host:
         self.config.model_type = args.model_type
         self.config.best_of_all = args.best_of_all
         self.config.save_best = args.save_best
+        self.config.model_version = args.model_version
+        if args.cpu_budget is not None:
+            self.config.cpu_budget = args.cpu_budget
+        if args.cpu_policy is not None:
+            self.config.cpu_policy = args.cpu_policy
         logging.info("Host initialized with arguments: %s", self.args)
 
     def run(self):
@@ -50,6 +53,7 @@ class Host:
         """
         try:
             logging.info("Starting host operations.")
+            self.config.ensure_directories_exist()
 
             if self.args.command == "ingest":
                 logging.info("Executing data ingestion workflow.")
@@ -61,10 +65,20 @@ class Host:
                 #         "A model type must be specified for the 'train' command."
                 #     )
                 await self.run_training()
+            elif self.args.command == "promote":
+                logging.info("Executing model promotion workflow.")
+                await self.run_promotion()
+            elif self.args.command == "score":
+                logging.info("Executing scoring workflow.")
+                await self.run_scoring()
+            elif self.args.command == "route":
+                logging.info("Executing model routing workflow.")
+                await self.run_routing()
             else:
                 logging.error("No valid subcommand provided.")
                 raise ValueError(
-                    "Please specify a valid subcommand: 'ingest' or 'train'."
+                    "Please specify a valid subcommand: 'ingest', 'train', 'promote', "
+                    "'score' or 'route'."
                 )
 
         except CustomException as e:
@@ -80,6 +94,9 @@ class Host:
         """
         Execute the data ingestion workflow.
         """
+        # Workflows are imported on use, so each command only loads its own dependencies
+        from src.services.data_ingestion_service import DataIngestionService
+
         data_ingestion_service = DataIngestionService()
         data_ingestion_service.initiate_data_ingestion()
 
@@ -87,5 +104,50 @@ class Host:
         """
         Execute the model training workflow.
         """
+        from src.pipeline.train_pipeline import TrainPipeline
+
         train_pipeline = TrainPipeline()
         train_pipeline.run_pipeline()
+
+    async def run_promotion(self):
+        """
+        List the models of the training cache, or promote one of them.
+        """
+        from src.pipeline.train_pipeline import TrainPipeline
+        from src.pipeline.training_cache import MODEL, TrainingCache
+
+        if self.args.list_cache:
+            for key, entry in TrainingCache().entries(MODEL):
+                print(
+                    f"{key[:12]}  {entry['model_name']}  "
+                    f"train_r2={entry['train_r2']:.4f}  "
+                    f"test_r2={entry['test_r2']:.4f}  {entry['params']}"
+                )
+            return
+
+        TrainPipeline().promote(self.args.cache_key)
+
+    async def run_scoring(self):
+        """
+        Execute the offline scoring workflow.
+        """
+        from src.pipeline.score_pipeline import ScorePipeline
+
+        score_pipeline = ScorePipeline(
+            input_path=self.args.input_path,
+            output_path=self.args.output_path,
+            chunk_size=self.args.chunk_size,
+            workers=self.args.workers,
+            resume=self.args.resume,
+        )
+        score_pipeline.run()
+
+    async def run_routing(self):
+        """
+        Update the routing of prediction traffic between model versions.
+        """
+        from src.pipeline.model_registry import ModelRegistry
+
+        ModelRegistry().set_routing(
+            self.args.default_version, self.args.routing_weights
+        )
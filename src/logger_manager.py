@@ -17,8 +17,7 @@ class LoggerManager:
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
     LOG_JSON = os.getenv("LOG_JSON", "false").lower() == "true"
 
-    # Ensure the logs directory exists
-    os.makedirs(LOGS_DIR, exist_ok=True)
+    # The logs directory and file are created when the first record is written
     LOG_FILE_PATH = os.path.join(LOGS_DIR, LOG_FILE)
 
     # Shared formatter for plain text logs
@@ -38,6 +37,16 @@ class LoggerManager:
             }
             return json.dumps(log_record)
 
+    class DeferredRotatingFileHandler(RotatingFileHandler):
+        """Rotating file handler that creates its file and directory on first write."""
+
+        def __init__(self, filename, **kwargs):
+            super().__init__(filename, delay=True, **kwargs)
+
+        def _open(self):
+            os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+            return super()._open()
+
     @classmethod
     def set_log_level(cls, level):
         """Dynamically set the logging level."""
@@ -54,7 +63,7 @@ class LoggerManager:
 
         if not logger.hasHandlers():
             # Add a rotating file handler
-            file_handler = RotatingFileHandler(
+            file_handler = LoggerManager.DeferredRotatingFileHandler(
                 LoggerManager.LOG_FILE_PATH, maxBytes=5 * 1024 * 1024, backupCount=5
             )
             file_handler.setFormatter(
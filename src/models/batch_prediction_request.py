@@ -0,0 +1,12 @@
+# Define the input schema for the batch prediction API
+from pydantic import BaseModel
+
+
+class BatchPredictionPayload(BaseModel):
+    # Records are validated in bulk by the endpoint, so that invalid records
+    # are reported individually instead of failing the whole batch
+    data: list
+
+
+class BatchPredictionRequest(BaseModel):
+    payload: BatchPredictionPayload
@@ -0,0 +1,16 @@
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+
+class BatchPredictionResult(BaseModel):
+    index: int
+    math_score: Optional[float] = None
+    errors: Optional[List[Dict[str, str]]] = None
+
+
+class BatchPredictionResponse(BaseModel):
+    code: int
+    code_text: str
+    message: str
+    data: Optional[List[BatchPredictionResult]] = None
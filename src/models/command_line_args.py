@@ -1,5 +1,5 @@
-from dataclasses import dataclass
-from typing import List, Optional
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
 
 
 @dataclass
@@ -10,3 +10,15 @@ class CommandLineArgs:
     model_type: Optional[List[str]] = None  # List of models to train (optional).
     best_of_all: bool = False
     save_best: bool = False
+    model_version: Optional[str] = None  # Registry version of the saved model.
+    cpu_budget: Optional[int] = None  # Cores training may use (defaults to the config).
+    cpu_policy: Optional[str] = None  # Default split of the cores between search and threads.
+    input_path: Optional[str] = None  # Input file of the 'score' command.
+    output_path: Optional[str] = None  # Output file of the 'score' command.
+    chunk_size: int = 10000
+    workers: Optional[int] = None
+    resume: bool = False
+    default_version: Optional[str] = None  # Default version of the 'route' command.
+    routing_weights: Dict[str, float] = field(default_factory=dict)
+    cache_key: Optional[str] = None  # Cached model of the 'promote' command.
+    list_cache: bool = False  # List the cached models instead of promoting one.
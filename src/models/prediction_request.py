@@ -1,6 +1,12 @@
 # Define the input schema for the prediction API
 from pydantic import BaseModel
 
+from src.schemas.prediction_input_schema import PredictionInputSchema
+
+
+class PredictionPayload(BaseModel):
+    data: PredictionInputSchema
+
 
 class PredictionRequest(BaseModel):
-    payload: dict
+    payload: PredictionPayload
@@ -0,0 +1,330 @@
+import asyncio
+import math
+import time
+from collections import deque
+
+from src.logger_manager import LoggerManager
+from src.utils.serialization_utils import dumps_json
+
+logging = LoggerManager.get_logger(__name__)
+
+# Request header carrying the caller's time budget, in milliseconds from arrival
+DEADLINE_HEADER = "x-request-timeout-ms"
+
+# Smoothing factor of the per-endpoint service time moving average
+SERVICE_TIME_SMOOTHING = 0.2
+
+SHED_REASONS = ("queue_full", "queue_timeout", "deadline")
+
+
+class AdmissionRejected(Exception):
+    """
+    Raised when a request is shed instead of admitted.
+    """
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class AdmissionController:
+    """
+    Bounds the number of requests being served at once, with a bounded FIFO
+    queue in front.
+
+    A request is admitted immediately while fewer than `max_concurrency`
+    requests are being served. Otherwise it waits in the queue, for at most
+    `queue_timeout_ms` or until its deadline. Requests are shed when the
+    queue is full, when they time out in the queue, or when their remaining
+    time budget is shorter than the endpoint's recent service time, so they
+    are rejected before any work is done on them.
+
+    The controller is used from the event loop only, so it needs no lock.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        max_queue: int = 64,
+        queue_timeout_ms: float = 500.0,
+    ):
+        """
+        Initialize the AdmissionController.
+
+        Args:
+            max_concurrency (int): Maximum number of requests served at once.
+            max_queue (int): Maximum number of requests waiting for admission.
+            queue_timeout_ms (float): Maximum time a request waits in the queue, in milliseconds.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1.")
+
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout_ms = queue_timeout_ms
+
+        self.active = 0
+        self.admitted = 0
+        self.shed = dict.fromkeys(SHED_REASONS, 0)
+        self._waiters = deque()
+        self._service_times = {}  # endpoint -> moving average of the service time
+
+    @property
+    def queued(self) -> int:
+        """Number of requests waiting for admission."""
+        return sum(not waiter.done() for waiter in self._waiters)
+
+    def service_time(self, endpoint: str) -> float:
+        """Recent average service time of an endpoint, in seconds."""
+        return self._service_times.get(endpoint, 0.0)
+
+    def retry_after(self, endpoint: str) -> int:
+        """
+        Seconds a shed client should wait before retrying: the time needed to
+        drain the current queue, rounded up to at least one second.
+        """
+        drain = (self.queued + 1) * self.service_time(endpoint) / self.max_concurrency
+        return max(1, math.ceil(drain))
+
+    async def acquire(self, endpoint: str, deadline: float = None):
+        """
+        Take a serving slot, waiting in the queue if none is free.
+
+        Args:
+            endpoint (str): Endpoint of the request, for its service time estimate.
+            deadline (float): `time.perf_counter()` value by which the response
+                is due, or None.
+
+        Raises:
+            AdmissionRejected: If the request is shed.
+        """
+        if not self.try_acquire(endpoint, deadline):
+            await self.wait(endpoint, deadline)
+
+    def try_acquire(self, endpoint: str, deadline: float = None) -> bool:
+        """
+        Take a serving slot if one is free and no request is queued.
+
+        Returns:
+            bool: True if the request was admitted, False if it has to `wait`.
+
+        Raises:
+            AdmissionRejected: If the deadline cannot be met or the queue is full.
+        """
+        self._check_deadline(endpoint, deadline)
+        if self.active < self.max_concurrency and not self.queued:
+            self.active += 1
+            self.admitted += 1
+            return True
+        if self.queued >= self.max_queue:
+            self._reject("queue_full")
+        return False
+
+    async def wait(self, endpoint: str, deadline: float = None):
+        """
+        Wait in the queue until a serving slot is handed over.
+
+        Raises:
+            AdmissionRejected: If the request times out in the queue or would
+                miss its deadline.
+        """
+        timeout = self.queue_timeout_ms / 1000
+        if deadline is not None:
+            timeout = min(
+                timeout, deadline - time.perf_counter() - self.service_time(endpoint)
+            )
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            # The slot is handed over by `release`, which resolves the waiter
+            await asyncio.wait_for(waiter, max(timeout, 0))
+        except asyncio.TimeoutError:
+            self._reject(
+                "deadline"
+                if deadline is not None and timeout < self.queue_timeout_ms / 1000
+                else "queue_timeout"
+            )
+        except BaseException:
+            # Cancelled (e.g. the client went away) after the slot was handed over
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            self._prune()
+        self.admitted += 1
+
+    def release(self, endpoint: str = None, service_time: float = None):
+        """
+        Free a serving slot, handing it to the longest waiting request.
+
+        Args:
+            endpoint (str): Endpoint of the finished request.
+            service_time (float): Time the request was served for, in seconds.
+        """
+        if endpoint is not None and service_time is not None:
+            average = self._service_times.get(endpoint)
+            self._service_times[endpoint] = (
+                service_time
+                if average is None
+                else average + SERVICE_TIME_SMOOTHING * (service_time - average)
+            )
+
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def stats(self) -> dict:
+        """
+        Returns a JSON-serializable snapshot of the admission state.
+        """
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "queue_timeout_ms": self.queue_timeout_ms,
+            "active": self.active,
+            "queued": self.queued,
+            "admitted": self.admitted,
+            "shed": dict(self.shed),
+            "service_time_ms": {
+                endpoint: seconds * 1000
+                for endpoint, seconds in self._service_times.items()
+            },
+        }
+
+    def _check_deadline(self, endpoint: str, deadline: float):
+        if deadline is None:
+            return
+        if deadline - time.perf_counter() < self.service_time(endpoint):
+            self._reject("deadline")
+
+    def _reject(self, reason: str):
+        self.shed[reason] += 1
+        raise AdmissionRejected(reason)
+
+    def _prune(self):
+        while self._waiters and self._waiters[0].done():
+            self._waiters.popleft()
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware applying an AdmissionController to the given paths.
+
+    Requests are admitted before their body is read. Shed requests get
+    `503 Service Unavailable` with a `Retry-After` header, in the API's error
+    format. The caller's time budget is read from the `X-Request-Timeout-Ms`
+    header. The endpoint of a shed request is stored as `state["endpoint"]`,
+    so RequestMetricsMiddleware can label it. The admission time of a
+    request is stored as `state["admitted_at"]`, so the stages of its
+    endpoint are timed from there, and its wait in the queue is recorded as
+    the "queue" stage.
+    """
+
+    def __init__(
+        self,
+        app,
+        controller: AdmissionController,
+        paths,
+        queue_depth=None,
+        shed_total=None,
+        stage_duration=None,
+    ):
+        """
+        Args:
+            app: The ASGI application.
+            controller (AdmissionController): The admission controller.
+            paths (iterable): Request paths subject to admission control.
+            queue_depth (Gauge): Optional gauge of the requests waiting for admission.
+            shed_total (Counter): Optional counter of shed requests, by endpoint and reason.
+            stage_duration (Histogram): Optional histogram of the request stages,
+                by endpoint and stage, observing the queue wait.
+        """
+        self.app = app
+        self.controller = controller
+        self.paths = frozenset(paths)
+        self.queue_depth = queue_depth
+        self.shed_total = shed_total
+        self.stage_duration = stage_duration
+
+    async def __call__(self, scope, receive, send):
+        path = scope.get("path")
+        if scope["type"] != "http" or path not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        state = scope.setdefault("state", {})
+        received_at = state.get("received_at", time.perf_counter())
+        deadline = self._read_deadline(scope, received_at)
+        try:
+            if not self.controller.try_acquire(path, deadline):
+                await self._wait(path, deadline)
+        except AdmissionRejected as e:
+            state["endpoint"] = path
+            if self.shed_total is not None:
+                self.shed_total.inc(path, e.reason)
+            logging.warning(f"Request to {path} shed: {e.reason}.")
+            await self._send_rejection(send, path, e.reason)
+            return
+
+        start = time.perf_counter()
+        state["admitted_at"] = start
+        if self.stage_duration is not None:
+            self.stage_duration.observe(start - received_at, path, "queue")
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(path, time.perf_counter() - start)
+
+    async def _wait(self, path: str, deadline: float):
+        if self.queue_depth is not None:
+            self.queue_depth.inc()
+        try:
+            await self.controller.wait(path, deadline)
+        finally:
+            if self.queue_depth is not None:
+                self.queue_depth.dec()
+
+    @staticmethod
+    def _read_deadline(scope, received_at: float):
+        for name, value in scope["headers"]:
+            if name == DEADLINE_HEADER.encode("latin-1"):
+                try:
+                    return received_at + float(value) / 1000
+                except ValueError:
+                    return None
+        return None
+
+    async def _send_rejection(self, send, path: str, reason: str):
+        message = (
+            "The request deadline cannot be met."
+            if reason == "deadline"
+            else "The service is overloaded; retry later."
+        )
+        body = dumps_json(
+            {
+                "detail": {
+                    "code": -1,
+                    "code_text": "error",
+                    "message": message,
+                    "errors": None,
+                }
+            }
+        )
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode("latin-1")),
+                    (
+                        b"retry-after",
+                        str(self.controller.retry_after(path)).encode("latin-1"),
+                    ),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,326 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from sklearn.compose import ColumnTransformer
+from sklearn.impute import SimpleImputer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+from src.logger_manager import LoggerManager
+
+logging = LoggerManager.get_logger(__name__)
+
+
+@dataclass
+class NumericBlock:
+    """
+    Affine transform of numerical columns: `(x - shift) / scale`, with optional imputation.
+    """
+
+    columns: List[str]
+    output_slice: slice
+    fill: Optional[np.ndarray]  # Imputation value per column (None if no imputer)
+    shift: np.ndarray  # Scaler mean per column (0 if not centered)
+    scale: np.ndarray  # Scaler scale per column (1 if not scaled)
+
+
+@dataclass
+class CategoricalBlock:
+    """
+    One-hot encoding of one categorical column as a lookup table.
+
+    Every output column of the block is set to `cold`, then the position of
+    the record's category is set to `hot`.
+    """
+
+    column: str
+    output_start: int
+    lookup: Dict[object, int]  # Category -> position within the block
+    fill: object  # Imputation value (None if no imputer)
+    hot: np.ndarray  # Output value when the category matches
+    cold: np.ndarray  # Output value when the category does not match
+    ignore_unknown: bool
+
+
+def features_to_columns(features, input_columns: List[str]):
+    """
+    Accept a list of records (dicts or pydantic models), a mapping of column
+    name to values, or a DataFrame, and return a mapping of column name to values.
+    """
+    if isinstance(features, (list, tuple)):
+        records = [
+            record if isinstance(record, dict) else record.model_dump()
+            for record in features
+        ]
+        return {
+            column: [record[column] for record in records] for column in input_columns
+        }
+    return features
+
+
+def is_missing(value) -> bool:
+    return value is None or (isinstance(value, float) and value != value)
+
+
+class CompiledPreprocessor:
+    """
+    Pandas-free replacement for the fitted ColumnTransformer used at inference time.
+
+    The fitted imputers, scalers and one-hot encoders are flattened into NumPy
+    lookup tables and affine coefficients, so a validated record or a columnar
+    batch is transformed into the model input matrix without a DataFrame.
+    Only the preprocessing steps built by DataTransformationService are
+    supported: SimpleImputer, then StandardScaler for numerical columns, or
+    OneHotEncoder optionally followed by StandardScaler for categorical ones.
+    """
+
+    def __init__(
+        self,
+        numeric_blocks: List[NumericBlock],
+        categorical_blocks: List[CategoricalBlock],
+        n_features_out: int,
+    ):
+        self.numeric_blocks = numeric_blocks
+        self.categorical_blocks = categorical_blocks
+        self.n_features_out = n_features_out
+        self.input_columns = [
+            column for block in numeric_blocks for column in block.columns
+        ] + [block.column for block in categorical_blocks]
+
+    @classmethod
+    def compile(cls, preprocessor: ColumnTransformer) -> "CompiledPreprocessor":
+        """
+        Compile a fitted ColumnTransformer into lookup tables and affine coefficients.
+
+        Args:
+            preprocessor (ColumnTransformer): The fitted preprocessor.
+
+        Returns:
+            CompiledPreprocessor: The compiled preprocessor.
+
+        Raises:
+            ValueError: If the preprocessor contains unsupported steps or options.
+        """
+        if not isinstance(preprocessor, ColumnTransformer):
+            raise ValueError(
+                f"Unsupported preprocessor type: {type(preprocessor).__name__}"
+            )
+
+        numeric_blocks = []
+        categorical_blocks = []
+        n_features_out = 0
+
+        for name, transformer, columns in preprocessor.transformers_:
+            output_slice = preprocessor.output_indices_[name]
+            n_features_out = max(n_features_out, output_slice.stop)
+            if transformer == "drop" or output_slice.stop == output_slice.start:
+                continue
+
+            steps = (
+                [step for _, step in transformer.steps]
+                if isinstance(transformer, Pipeline)
+                else [transformer]
+            )
+            columns = list(columns)
+
+            imputer = None
+            if steps and isinstance(steps[0], SimpleImputer):
+                imputer = steps.pop(0)
+                if imputer.add_indicator:
+                    raise ValueError("SimpleImputer with add_indicator is not supported.")
+
+            if steps and isinstance(steps[0], OneHotEncoder):
+                categorical_blocks.extend(
+                    cls._compile_categorical(columns, output_slice, imputer, steps)
+                )
+            else:
+                numeric_blocks.append(
+                    cls._compile_numeric(columns, output_slice, imputer, steps)
+                )
+
+        return cls(numeric_blocks, categorical_blocks, n_features_out)
+
+    @staticmethod
+    def _compile_scaler(steps: list, n_features: int):
+        """
+        Extract the `(shift, scale)` coefficients of an optional trailing StandardScaler.
+        """
+        shift = np.zeros(n_features)
+        scale = np.ones(n_features)
+        if not steps or steps[0] == "passthrough":
+            return shift, scale
+        scaler = steps[0]
+        if len(steps) > 1 or not isinstance(scaler, StandardScaler):
+            raise ValueError(f"Unsupported preprocessing steps: {steps}")
+        if scaler.mean_ is not None and scaler.with_mean:
+            shift = np.asarray(scaler.mean_, dtype=float)
+        if scaler.scale_ is not None:
+            scale = np.asarray(scaler.scale_, dtype=float)
+        return shift, scale
+
+    @classmethod
+    def _compile_numeric(cls, columns, output_slice, imputer, steps) -> NumericBlock:
+        fill = (
+            np.asarray(imputer.statistics_, dtype=float) if imputer is not None else None
+        )
+        shift, scale = cls._compile_scaler(steps, len(columns))
+        return NumericBlock(
+            columns=columns,
+            output_slice=output_slice,
+            fill=fill,
+            shift=shift,
+            scale=scale,
+        )
+
+    @classmethod
+    def _compile_categorical(
+        cls, columns, output_slice, imputer, steps
+    ) -> List[CategoricalBlock]:
+        encoder = steps.pop(0)
+        if encoder.drop_idx_ is not None:
+            raise ValueError("OneHotEncoder with drop is not supported.")
+        if getattr(encoder, "_infrequent_enabled", False):
+            raise ValueError("OneHotEncoder with infrequent categories is not supported.")
+        if encoder.handle_unknown not in ("error", "ignore"):
+            raise ValueError(
+                f"Unsupported handle_unknown option: {encoder.handle_unknown}"
+            )
+
+        n_outputs = sum(len(categories) for categories in encoder.categories_)
+        shift, scale = cls._compile_scaler(steps, n_outputs)
+
+        blocks = []
+        start = 0
+        for index, (column, categories) in enumerate(
+            zip(columns, encoder.categories_)
+        ):
+            end = start + len(categories)
+            blocks.append(
+                CategoricalBlock(
+                    column=column,
+                    output_start=output_slice.start + start,
+                    lookup={category: i for i, category in enumerate(categories)},
+                    fill=imputer.statistics_[index] if imputer is not None else None,
+                    hot=(1.0 - shift[start:end]) / scale[start:end],
+                    cold=(0.0 - shift[start:end]) / scale[start:end],
+                    ignore_unknown=encoder.handle_unknown == "ignore",
+                )
+            )
+            start = end
+        return blocks
+
+    def transform(self, features) -> np.ndarray:
+        """
+        Transform input features into the model input matrix.
+
+        Args:
+            features: A list of records, a mapping of column name to values, or a DataFrame.
+
+        Returns:
+            np.ndarray: The transformed feature matrix.
+        """
+        columns = features_to_columns(features, self.input_columns)
+        n_rows = len(columns[self.input_columns[0]])
+        output = np.empty((n_rows, self.n_features_out), dtype=np.float64)
+        rows = np.arange(n_rows)
+
+        for block in self.numeric_blocks:
+            values = np.column_stack(
+                [
+                    np.asarray(columns[column], dtype=np.float64)
+                    for column in block.columns
+                ]
+            )
+            if block.fill is not None:
+                values = np.where(np.isnan(values), block.fill, values)
+            output[:, block.output_slice] = (values - block.shift) / block.scale
+
+        for block in self.categorical_blocks:
+            values = np.asarray(columns[block.column], dtype=object)
+            codes = np.fromiter(
+                (block.lookup.get(value, -1) for value in values),
+                dtype=np.intp,
+                count=n_rows,
+            )
+            unmatched = np.flatnonzero(codes < 0)
+            for row in unmatched:
+                value = values[row]
+                if block.fill is not None and is_missing(value):
+                    codes[row] = block.lookup.get(block.fill, -1)
+                if codes[row] < 0 and not block.ignore_unknown:
+                    raise ValueError(
+                        f"Found unknown categories [{value!r}] in column "
+                        f"'{block.column}' during transform"
+                    )
+
+            end = block.output_start + len(block.hot)
+            output[:, block.output_start : end] = block.cold
+            matched = codes >= 0
+            output[rows[matched], block.output_start + codes[matched]] = block.hot[
+                codes[matched]
+            ]
+
+        return output
+
+    def verify(self, preprocessor: ColumnTransformer, atol: float = 1e-12):
+        """
+        Check that the compiled transform matches the sklearn preprocessor.
+
+        The probe frame from `probe_frame` is transformed by both implementations.
+
+        Args:
+            preprocessor (ColumnTransformer): The fitted preprocessor that was compiled.
+            atol (float): Maximum allowed absolute difference.
+
+        Raises:
+            ValueError: If the outputs differ.
+        """
+        frame = self.probe_frame(preprocessor)
+        expected = preprocessor.transform(frame)
+        if hasattr(expected, "toarray"):
+            expected = expected.toarray()
+        actual = self.transform(frame)
+
+        if expected.shape != actual.shape or not np.allclose(
+            expected, actual, rtol=0, atol=atol
+        ):
+            raise ValueError(
+                "Compiled preprocessor output does not match the sklearn preprocessor."
+            )
+        logging.info("Compiled preprocessor verified against the sklearn preprocessor.")
+
+    def probe_frame(
+        self, preprocessor: ColumnTransformer, n_rows: int = None
+    ) -> pd.DataFrame:
+        """
+        Build a probe frame covering every category and a missing value per imputed column.
+
+        Args:
+            preprocessor (ColumnTransformer): The fitted preprocessor that was compiled.
+            n_rows (int): Number of rows; defaults to just enough to cover every category.
+
+        Returns:
+            pd.DataFrame: The probe frame, with columns in the preprocessor's input order.
+        """
+        n_rows = max(
+            [len(block.lookup) for block in self.categorical_blocks] + [1, (n_rows or 0) - 1]
+        ) + 1
+        probe = {}
+
+        for block in self.numeric_blocks:
+            for i, column in enumerate(block.columns):
+                values = block.shift[i] + block.scale[i] * np.linspace(-2, 2, n_rows)
+                if block.fill is not None:
+                    values[-1] = np.nan
+                probe[column] = values
+
+        for block in self.categorical_blocks:
+            categories = list(block.lookup)
+            values = [categories[i % len(categories)] for i in range(n_rows)]
+            if block.fill is not None:
+                values[-1] = np.nan
+            probe[block.column] = np.asarray(values, dtype=object)
+
+        return pd.DataFrame(probe)[list(preprocessor.feature_names_in_)]
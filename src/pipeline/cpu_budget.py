@@ -0,0 +1,160 @@
+import math
+import os
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+
+from src.logger_manager import LoggerManager
+
+logging = LoggerManager.get_logger(__name__)
+
+# How a model's share of the core budget is split:
+# - outer: one search fit per core, single-threaded libraries
+# - inner: one fit at a time, using every core
+# - balanced: about sqrt(cores) fits of sqrt(cores) threads each
+# - auto: outer when the model has a parameter grid to search, inner otherwise
+CPU_POLICIES = ("auto", "outer", "inner", "balanced")
+
+# Estimator parameter setting the library's own thread count, by model class
+# (XGBoost's `nthread` is set through its scikit-learn `n_jobs` alias).
+# Other estimators are limited through `n_jobs` when they have it.
+THREAD_PARAMETERS = {
+    "XGBRegressor": "n_jobs",
+    "CatBoostRegressor": "thread_count",
+}
+
+
+@dataclass(frozen=True)
+class CpuSplit:
+    """
+    A split of the core budget between outer search workers and the threads
+    each fit may use.
+    """
+
+    policy: str
+    outer_jobs: int
+    inner_threads: int
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def thread_parameter(model) -> str:
+    """
+    Returns the name of the parameter setting a model's thread count, or None.
+    """
+    name = THREAD_PARAMETERS.get(type(model).__name__)
+    if name is None and "n_jobs" in model.get_params(deep=False):
+        name = "n_jobs"
+    return name
+
+
+def set_model_threads(model, threads: int) -> dict:
+    """
+    Limit the threads a model's library uses.
+
+    Returns:
+        dict: The previous value of the thread parameter, for `restore_model_threads`
+            (empty if the model has none).
+    """
+    name = thread_parameter(model)
+    if name is None:
+        return {}
+    previous = {name: model.get_params(deep=False).get(name)}
+    model.set_params(**{name: threads})
+    return previous
+
+
+def restore_model_threads(model, previous: dict) -> dict:
+    """
+    Restore the thread parameter saved by `set_model_threads`, so saved
+    models keep their configured value. Fitted CatBoost models keep the
+    thread count they were fit with, as CatBoost refuses to change the
+    parameters of a fitted model.
+
+    Returns:
+        dict: The thread parameter the model keeps (empty if it has none).
+    """
+    if not previous:
+        return {}
+    if type(model).__name__ == "CatBoostRegressor" and model.is_fitted():
+        logging.debug("Keeping the thread count of a fitted CatBoost model.")
+    else:
+        model.set_params(**previous)
+    return {name: model.get_params(deep=False).get(name) for name in previous}
+
+
+@contextmanager
+def limit_threads(threads: int):
+    """
+    Limit the OpenMP and BLAS thread pools of this process, and those of
+    joblib's (loky) worker processes, to `threads`.
+    """
+    # Imported here, so the CLI can read CPU_POLICIES without loading them
+    from joblib import parallel_config
+    from threadpoolctl import threadpool_limits
+
+    # joblib only passes thread limits to workers of an explicit backend
+    with threadpool_limits(limits=threads), parallel_config(
+        backend="loky", inner_max_num_threads=threads
+    ):
+        yield
+
+
+class CpuBudgetManager:
+    """
+    Splits a global core budget between outer search workers and inner
+    library threads, so nested parallelism never runs more threads than
+    there are cores.
+    """
+
+    def __init__(self, total_cores: int = None, default_policy: str = "auto"):
+        """
+        Initialize the CpuBudgetManager.
+
+        Args:
+            total_cores (int): Cores available to training (defaults to the CPU count).
+            default_policy (str): Policy of models without their own `cpu_policy`.
+        """
+        self.total_cores = max(1, total_cores or os.cpu_count() or 1)
+        if default_policy not in CPU_POLICIES:
+            raise ValueError(
+                f"Unknown CPU policy '{default_policy}'. "
+                f"Supported policies are: {', '.join(CPU_POLICIES)}."
+            )
+        self.default_policy = default_policy
+
+    def split(self, policy=None, n_fits: int = 1) -> CpuSplit:
+        """
+        Split the core budget for a model.
+
+        Args:
+            policy: A policy name (see CPU_POLICIES), a mapping with explicit
+                `outer_jobs` and `inner_threads`, or None for the default policy.
+            n_fits (int): Number of independent fits of the model's search.
+
+        Returns:
+            CpuSplit: The outer jobs and inner threads, whose product never
+                exceeds the budget.
+        """
+        total = self.total_cores
+        policy = policy or self.default_policy
+        if isinstance(policy, dict):
+            outer = max(1, min(int(policy.get("outer_jobs", 1)), total))
+            inner = int(policy.get("inner_threads", total // outer))
+            return CpuSplit("custom", outer, max(1, min(inner, total // outer)))
+
+        if policy not in CPU_POLICIES:
+            raise ValueError(
+                f"Unknown CPU policy '{policy}'. "
+                f"Supported policies are: {', '.join(CPU_POLICIES)}."
+            )
+        if policy == "auto":
+            policy = "outer" if n_fits > 1 else "inner"
+
+        if policy == "outer":
+            outer = min(total, max(1, n_fits))
+        elif policy == "balanced":
+            outer = min(max(1, n_fits), max(1, round(math.sqrt(total))))
+        else:
+            outer = 1
+        return CpuSplit(policy, outer, max(1, total // outer))
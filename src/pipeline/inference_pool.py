@@ -0,0 +1,312 @@
+import atexit
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from src.exception import CustomException
+from src.logger_manager import LoggerManager
+from src.schemas.prediction_input_schema import PredictionInputSchema
+
+logging = LoggerManager.get_logger(__name__)
+
+# Input columns in schema order, split by how they are laid out in shared memory
+INPUT_COLUMNS = tuple(PredictionInputSchema.model_fields)
+NUMERIC_COLUMNS = tuple(
+    name
+    for name, field in PredictionInputSchema.model_fields.items()
+    if field.annotation in (int, float)
+)
+CATEGORICAL_COLUMNS = tuple(
+    name for name in INPUT_COLUMNS if name not in NUMERIC_COLUMNS
+)
+
+# Shared memory slots per worker, so the next task is written while one is scored
+SLOTS_PER_WORKER = 2
+
+# Pipeline provider and attached slots of a worker process, set up by `_init_worker`
+_worker_provider = None
+_worker_segments = {}
+
+
+def _slot_size(capacity: int) -> int:
+    return capacity * (8 * len(NUMERIC_COLUMNS) + 4 * len(CATEGORICAL_COLUMNS) + 8)
+
+
+def _slot_views(buffer, capacity: int) -> tuple:
+    """
+    Returns the views of a slot: the numeric columns (float64), the
+    categorical columns as codes into a per-task vocabulary (int32), and the
+    predictions (float64), each `capacity` rows long.
+    """
+    numeric_bytes = 8 * len(NUMERIC_COLUMNS) * capacity
+    codes_bytes = 4 * len(CATEGORICAL_COLUMNS) * capacity
+    numeric = np.ndarray(
+        (len(NUMERIC_COLUMNS), capacity), dtype=np.float64, buffer=buffer
+    )
+    codes = np.ndarray(
+        (len(CATEGORICAL_COLUMNS), capacity),
+        dtype=np.int32,
+        buffer=buffer,
+        offset=numeric_bytes,
+    )
+    predictions = np.ndarray(
+        (capacity,), dtype=np.float64, buffer=buffer, offset=numeric_bytes + codes_bytes
+    )
+    return numeric, codes, predictions
+
+
+def _init_worker():
+    """
+    Process pool initializer: load the pipelines once per worker.
+    """
+    global _worker_provider
+    # Imported here, so the parent does not need the provider to create the pool
+    from src.pipeline.pipeline_provider import PipelineProvider
+
+    _worker_provider = PipelineProvider()
+    _worker_provider.get()
+
+
+def _warm_up():
+    """
+    No-op task, run once the worker's initializer has loaded the pipelines.
+    """
+
+
+def _predict_task(
+    slot_name: str, capacity: int, n_rows: int, vocabularies: tuple, version: str
+) -> dict:
+    """
+    Score the rows of one shared memory slot in a worker process, writing the
+    predictions back into the slot.
+
+    Returns:
+        dict: The seconds spent in each stage of the pipeline.
+    """
+    segment = _worker_segments.get(slot_name)
+    if segment is None:
+        segment = _worker_segments[slot_name] = SharedMemory(name=slot_name)
+    numeric, codes, predictions = _slot_views(segment.buf, capacity)
+
+    columns = dict(zip(NUMERIC_COLUMNS, numeric[:, :n_rows]))
+    for name, vocabulary, column_codes in zip(CATEGORICAL_COLUMNS, vocabularies, codes):
+        columns[name] = np.asarray(vocabulary, dtype=object)[column_codes[:n_rows]]
+
+    timings = {}
+    predictions[:n_rows] = _worker_provider.get(version).predict(
+        {name: columns[name] for name in INPUT_COLUMNS}, timings=timings
+    )
+    return timings
+
+
+class InferencePool:
+    """
+    Scores batches in a pool of worker processes, each holding its own
+    preloaded pipelines, so CPU-bound inference uses every core of a single
+    server process instead of contending for its GIL.
+
+    A batch is split into tasks of at most `task_batch_size` rows. The rows of
+    a task are written into a preallocated shared memory slot (numeric columns
+    as float64, categorical columns as int32 codes) and the worker writes the
+    predictions back into it, so only the slot name and the small per-task
+    category vocabularies are pickled. A caller waits for a free slot when all
+    of them are in flight, which bounds the work queued in the pool.
+
+    Workers are started with `spawn` on the first call in each process, so the
+    pool is safe to use from forked server workers. They hot reload their
+    pipelines from the same artifacts as the server process.
+    """
+
+    def __init__(self, workers: int = None, task_batch_size: int = 256):
+        """
+        Initialize the InferencePool. Worker processes are started on first use.
+
+        Args:
+            workers (int): Number of worker processes (defaults to the CPU count).
+            task_batch_size (int): Maximum number of rows scored per task.
+        """
+        if task_batch_size < 1:
+            raise ValueError("task_batch_size must be at least 1.")
+
+        self.workers = workers or os.cpu_count() or 1
+        self.task_batch_size = task_batch_size
+        self.tasks = 0
+        self.rows = 0
+
+        self._executor = None
+        self._segments = []
+        self._free_slots = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+
+    def predict(self, columns: dict, version: str = None, timings: dict = None):
+        """
+        Score a columnar batch in the worker processes.
+
+        Args:
+            columns (dict): Mapping of input column name to values.
+            version (str): Model version scoring the batch (defaults to the default version).
+            timings (dict): If given, receives the seconds spent in each worker
+                stage, summed over the tasks, and the wall-clock time in the pool.
+
+        Returns:
+            np.ndarray: Predicted values, in input order.
+        """
+        self._ensure_started()
+        start = time.perf_counter()
+        n_rows = len(columns[INPUT_COLUMNS[0]])
+        predictions = np.empty(n_rows, dtype=np.float64)
+        task_timings = timings if timings is not None else {}
+        pending = deque()
+        try:
+            for first in range(0, n_rows, self.task_batch_size):
+                last = min(first + self.task_batch_size, n_rows)
+                segment = self._acquire_slot(pending, predictions, task_timings)
+                try:
+                    vocabularies = self._write_slot(segment, columns, first, last)
+                    future = self._executor.submit(
+                        _predict_task,
+                        segment.name,
+                        self.task_batch_size,
+                        last - first,
+                        vocabularies,
+                        version,
+                    )
+                except BaseException:
+                    self._free_slots.put(segment)
+                    raise
+                pending.append((segment, first, last, future))
+
+            while pending:
+                self._collect(pending.popleft(), predictions, task_timings)
+        except Exception as e:
+            raise CustomException(e, sys) from e
+        finally:
+            # A slot is only reused once its worker is done with it
+            for segment, _, _, future in pending:
+                wait([future])
+                self._free_slots.put(segment)
+
+        self.tasks += -(-n_rows // self.task_batch_size)
+        self.rows += n_rows
+        task_timings["pool"] = time.perf_counter() - start
+        return predictions
+
+    def start(self):
+        """
+        Start the worker processes, if needed, and wait until each has had
+        the chance to load its pipelines, so the first requests do not pay
+        for the start-up.
+        """
+        self._ensure_started()
+        wait([self._executor.submit(_warm_up) for _ in range(self.workers)])
+
+    def close(self):
+        """
+        Stop the worker processes and free the shared memory slots.
+        """
+        if self._pid != os.getpid():
+            return
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        for segment in self._segments:
+            segment.close()
+            segment.unlink()
+        self._segments = []
+        self._pid = None
+
+    def stats(self) -> dict:
+        """
+        Returns a JSON-serializable snapshot of the pool configuration and usage.
+        """
+        return {
+            "workers": self.workers,
+            "task_batch_size": self.task_batch_size,
+            "slots": self.workers * SLOTS_PER_WORKER,
+            "started": self._pid == os.getpid(),
+            "tasks": self.tasks,
+            "rows": self.rows,
+        }
+
+    def _ensure_started(self):
+        if self._pid != os.getpid():
+            with self._start_lock:
+                if self._pid != os.getpid():
+                    self._start()
+
+    def _start(self):
+        """
+        Start the worker processes and allocate the shared memory slots.
+        """
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        )
+        self._segments = [
+            SharedMemory(create=True, size=_slot_size(self.task_batch_size))
+            for _ in range(self.workers * SLOTS_PER_WORKER)
+        ]
+        self._free_slots = queue.Queue()
+        for segment in self._segments:
+            self._free_slots.put(segment)
+        self._pid = os.getpid()
+        atexit.register(self.close)
+        logging.info(
+            f"Inference pool started with {self.workers} workers and "
+            f"{len(self._segments)} slots of {self.task_batch_size} rows."
+        )
+
+    def _acquire_slot(self, pending: deque, predictions, timings: dict):
+        """
+        Take a free slot. While none is free, the caller's own oldest task is
+        collected first, so callers never wait on each other while holding slots.
+        """
+        while True:
+            try:
+                return self._free_slots.get_nowait()
+            except queue.Empty:
+                if not pending:
+                    return self._free_slots.get()
+                self._collect(pending.popleft(), predictions, timings)
+
+    def _collect(self, task: tuple, predictions, timings: dict):
+        """
+        Wait for a task, copy its predictions out of the slot and free the slot.
+        """
+        segment, first, last, future = task
+        try:
+            for stage, seconds in future.result().items():
+                timings[stage] = timings.get(stage, 0.0) + seconds
+            _, _, slot_predictions = _slot_views(segment.buf, self.task_batch_size)
+            predictions[first:last] = slot_predictions[: last - first]
+        finally:
+            wait([future])
+            self._free_slots.put(segment)
+
+    def _write_slot(self, segment, columns: dict, first: int, last: int) -> tuple:
+        """
+        Write rows `first` to `last` of the batch into a slot.
+
+        Returns:
+            tuple: The vocabulary of each categorical column, indexed by the codes.
+        """
+        numeric, codes, _ = _slot_views(segment.buf, self.task_batch_size)
+        for row, name in enumerate(NUMERIC_COLUMNS):
+            numeric[row, : last - first] = columns[name][first:last]
+
+        vocabularies = []
+        for row, name in enumerate(CATEGORICAL_COLUMNS):
+            index = {}
+            codes[row, : last - first] = [
+                index.setdefault(value, len(index)) for value in columns[name][first:last]
+            ]
+            vocabularies.append(tuple(index))
+        return tuple(vocabularies)
@@ -0,0 +1,218 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+from sklearn.compose import ColumnTransformer
+
+from src.logger_manager import LoggerManager
+from src.pipeline.compiled_preprocessor import (
+    CompiledPreprocessor,
+    features_to_columns,
+    is_missing,
+)
+
+logging = LoggerManager.get_logger(__name__)
+
+
+@dataclass
+class FoldedCategorical:
+    """
+    Additive contribution of one categorical column to the prediction.
+    """
+
+    column: str
+    table: Dict[object, float]  # Category -> contribution
+    fill: object  # Imputation value (None if no imputer)
+    unknown: Optional[float]  # Contribution of unseen categories (None raises)
+
+
+class FoldedLinearModel:
+    """
+    A linear model with its preprocessor folded into closed form.
+
+    Scaling and imputation of the numerical columns fold into one weight per
+    column and the intercept, and each one-hot encoded (and scaled)
+    categorical column folds into a table of additive contributions per
+    category. A prediction is the intercept plus a dot product with the
+    numerical columns plus one table lookup per categorical column.
+    """
+
+    def __init__(
+        self,
+        intercept: float,
+        numeric_columns: List[str],
+        numeric_weights: np.ndarray,
+        numeric_fill: Optional[np.ndarray],
+        categoricals: List[FoldedCategorical],
+    ):
+        self.intercept = intercept
+        self.numeric_columns = numeric_columns
+        self.numeric_weights = numeric_weights
+        self.numeric_fill = numeric_fill
+        self.categoricals = categoricals
+        self.input_columns = numeric_columns + [block.column for block in categoricals]
+
+    @staticmethod
+    def is_foldable(model) -> bool:
+        """
+        Returns True for single-output linear models from `sklearn.linear_model`.
+        """
+        return (
+            type(model).__module__.startswith("sklearn.linear_model")
+            and hasattr(model, "coef_")
+            and hasattr(model, "intercept_")
+            and np.ndim(np.squeeze(model.coef_)) == 1
+        )
+
+    @classmethod
+    def fold(cls, preprocessor: ColumnTransformer, model) -> "FoldedLinearModel":
+        """
+        Fold a fitted preprocessor into a fitted linear model.
+
+        Args:
+            preprocessor (ColumnTransformer): The fitted preprocessor.
+            model: The fitted linear model trained on the preprocessor output.
+
+        Returns:
+            FoldedLinearModel: The folded model.
+
+        Raises:
+            ValueError: If the model is not linear or the preprocessor cannot be compiled.
+        """
+        if not cls.is_foldable(model):
+            raise ValueError(f"Unsupported model type: {type(model).__name__}")
+
+        compiled = CompiledPreprocessor.compile(preprocessor)
+        coef = np.asarray(np.squeeze(model.coef_), dtype=np.float64)
+        if coef.shape != (compiled.n_features_out,):
+            raise ValueError(
+                f"Model expects {coef.shape[0]} features, the preprocessor "
+                f"produces {compiled.n_features_out}."
+            )
+        intercept = float(np.squeeze(model.intercept_))
+
+        numeric_columns, numeric_weights, numeric_fill = [], [], []
+        for block in compiled.numeric_blocks:
+            # w * (x - shift) / scale == (w / scale) * x - w * shift / scale
+            weights = coef[block.output_slice] / block.scale
+            intercept -= float(np.dot(weights, block.shift))
+            numeric_columns.extend(block.columns)
+            numeric_weights.append(weights)
+            numeric_fill.append(
+                block.fill
+                if block.fill is not None
+                else np.full(len(block.columns), np.nan)
+            )
+
+        categoricals = []
+        for block in compiled.categorical_blocks:
+            weights = coef[block.output_start : block.output_start + len(block.hot)]
+            # Every output starts at `cold`; the matching one moves to `hot`
+            contributions = weights * (block.hot - block.cold)
+            # Center the table so large, cancelling coefficients (collinear
+            # one-hot columns) are absorbed once into the intercept
+            offset = float(contributions.mean())
+            intercept += float(np.dot(weights, block.cold)) + offset
+            categoricals.append(
+                FoldedCategorical(
+                    column=block.column,
+                    table={
+                        category: float(contributions[i] - offset)
+                        for category, i in block.lookup.items()
+                    },
+                    fill=block.fill,
+                    # Unknown categories leave every output at `cold`
+                    unknown=-offset if block.ignore_unknown else None,
+                )
+            )
+
+        numeric_fill = np.concatenate(numeric_fill) if numeric_fill else np.empty(0)
+        return cls(
+            intercept=intercept,
+            numeric_columns=numeric_columns,
+            numeric_weights=(
+                np.concatenate(numeric_weights) if numeric_weights else np.empty(0)
+            ),
+            numeric_fill=None if np.isnan(numeric_fill).all() else numeric_fill,
+            categoricals=categoricals,
+        )
+
+    def predict(self, features) -> np.ndarray:
+        """
+        Predict outcomes for the input features.
+
+        Args:
+            features: A list of records, a mapping of column name to values, or a DataFrame.
+
+        Returns:
+            np.ndarray: Predicted values.
+        """
+        columns = features_to_columns(features, self.input_columns)
+        n_rows = len(columns[self.input_columns[0]])
+        preds = np.full(n_rows, self.intercept, dtype=np.float64)
+
+        if self.numeric_columns:
+            values = np.column_stack(
+                [
+                    np.asarray(columns[column], dtype=np.float64)
+                    for column in self.numeric_columns
+                ]
+            )
+            if self.numeric_fill is not None:
+                values = np.where(np.isnan(values), self.numeric_fill, values)
+            preds += values @ self.numeric_weights
+
+        for block in self.categoricals:
+            table = block.table
+            contributions = np.empty(n_rows, dtype=np.float64)
+            for row, value in enumerate(columns[block.column]):
+                contribution = table.get(value)
+                if contribution is None:
+                    if block.fill is not None and is_missing(value):
+                        contribution = table.get(block.fill)
+                    if contribution is None:
+                        contribution = block.unknown
+                    if contribution is None:
+                        raise ValueError(
+                            f"Found unknown categories [{value!r}] in column "
+                            f"'{block.column}' during transform"
+                        )
+                contributions[row] = contribution
+            preds += contributions
+
+        return preds
+
+    def verify(self, preprocessor: ColumnTransformer, model, atol: float = 1e-6):
+        """
+        Check that the folded model matches the full preprocessor and model.
+
+        Differences are allowed up to the rounding error of the reference
+        pipeline's own dot product, which dominates for ill-conditioned fits.
+
+        Args:
+            preprocessor (ColumnTransformer): The fitted preprocessor that was folded.
+            model: The fitted linear model that was folded.
+            atol (float): Absolute tolerance on top of the rounding error bound.
+
+        Raises:
+            ValueError: If the predictions differ.
+        """
+        frame = CompiledPreprocessor.compile(preprocessor).probe_frame(preprocessor)
+        transformed = preprocessor.transform(frame)
+        if hasattr(transformed, "toarray"):
+            transformed = transformed.toarray()
+        expected = model.predict(transformed)
+        actual = self.predict(frame)
+
+        coef = np.squeeze(model.coef_)
+        magnitude = np.abs(transformed * coef).sum(axis=1) + abs(
+            float(np.squeeze(model.intercept_))
+        )
+        tolerance = atol + (len(coef) + 1) * np.finfo(np.float64).eps * magnitude
+
+        if expected.shape != actual.shape or np.any(
+            np.abs(expected - actual) > tolerance
+        ):
+            raise ValueError("Folded linear model does not match the full pipeline.")
+        logging.info("Folded linear model verified against the full pipeline.")
+
@@ -0,0 +1,223 @@
+import os
+import queue
+import sys
+import threading
+import time
+from bisect import bisect_left
+from concurrent.futures import Future
+
+from src.exception import CustomException
+from src.logger_manager import LoggerManager
+
+logging = LoggerManager.get_logger(__name__)
+
+# Upper bounds (in milliseconds) of the queue wait time histogram buckets
+QUEUE_WAIT_BUCKETS_MS = [0.1, 0.25, 0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000]
+
+
+class MicroBatchStats:
+    """
+    Thread-safe statistics about the batches formed by the MicroBatcher.
+    Tracks the batch size distribution and the time requests spent queued.
+    """
+
+    def __init__(self, max_batch_size: int):
+        self._lock = threading.Lock()
+        self.max_batch_size = max_batch_size
+        self.batches = 0
+        self.requests = 0
+        self.failed_batches = 0
+        self.batch_size_counts = [0] * (max_batch_size + 1)
+        self.queue_wait_bucket_counts = [0] * (len(QUEUE_WAIT_BUCKETS_MS) + 1)
+        self.queue_wait_sum_ms = 0.0
+        self.queue_wait_max_ms = 0.0
+
+    def record_batch(self, queue_waits_ms: list, failed: bool = False):
+        """
+        Records one processed batch and the queue wait of each of its requests.
+
+        Args:
+            queue_waits_ms (list): Time each request of the batch spent in the queue.
+            failed (bool): Whether the prediction for the batch raised an error.
+        """
+        with self._lock:
+            self.batches += 1
+            self.requests += len(queue_waits_ms)
+            self.failed_batches += int(failed)
+            self.batch_size_counts[len(queue_waits_ms)] += 1
+            for wait_ms in queue_waits_ms:
+                self.queue_wait_bucket_counts[
+                    bisect_left(QUEUE_WAIT_BUCKETS_MS, wait_ms)
+                ] += 1
+                self.queue_wait_sum_ms += wait_ms
+                self.queue_wait_max_ms = max(self.queue_wait_max_ms, wait_ms)
+
+    def to_dict(self) -> dict:
+        """
+        Returns a JSON-serializable snapshot of the statistics.
+        """
+        with self._lock:
+            buckets = [str(bound) for bound in QUEUE_WAIT_BUCKETS_MS] + ["+Inf"]
+            return {
+                "batches": self.batches,
+                "requests": self.requests,
+                "failed_batches": self.failed_batches,
+                "mean_batch_size": (
+                    self.requests / self.batches if self.batches else 0.0
+                ),
+                "batch_size_counts": {
+                    str(size): count
+                    for size, count in enumerate(self.batch_size_counts)
+                    if count
+                },
+                "queue_wait_ms": {
+                    "mean": (
+                        self.queue_wait_sum_ms / self.requests if self.requests else 0.0
+                    ),
+                    "max": self.queue_wait_max_ms,
+                    "buckets": dict(zip(buckets, self.queue_wait_bucket_counts)),
+                },
+            }
+
+
+class MicroBatcher:
+    """
+    Collects single-record prediction requests that arrive close together and
+    scores them with one vectorized predict call.
+
+    Callers block in `submit` until their own result is available. A background
+    worker forms batches of up to `max_batch_size` records. The collection
+    window is adaptive: a lone request under light load is dispatched
+    immediately, and the worker only waits up to `window_ms` for more requests
+    while it observes concurrent traffic.
+
+    The worker is restarted in forked child processes, which do not inherit
+    the parent's threads.
+    """
+
+    def __init__(self, predict_fn, max_batch_size: int = 32, window_ms: float = 2.0):
+        """
+        Initialize the MicroBatcher and start its background worker.
+
+        Args:
+            predict_fn (callable): Scores a list of records and returns one prediction per record.
+            max_batch_size (int): Maximum number of records per batch.
+            window_ms (float): Maximum time to wait for a batch to fill, in milliseconds.
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1.")
+
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.window_ms = window_ms
+        self.stats = MicroBatchStats(max_batch_size)
+
+        self._closed = threading.Event()
+        self._start_lock = threading.Lock()
+        self._start_worker()
+        logging.info(
+            "Micro-batcher started (max_batch_size=%s, window_ms=%s).",
+            max_batch_size,
+            window_ms,
+        )
+
+    def submit(self, record):
+        """
+        Queue a record for prediction and wait for its result.
+
+        Args:
+            record: A single validated input record.
+
+        Returns:
+            The prediction for the record.
+        """
+        if self._closed.is_set():
+            raise CustomException("Micro-batcher is closed.")
+        if self._worker_pid != os.getpid():
+            with self._start_lock:
+                if self._worker_pid != os.getpid():
+                    self._start_worker()
+
+        future = Future()
+        self._queue.put((record, future, time.perf_counter()))
+        return future.result()
+
+    def close(self):
+        """
+        Stop the background worker after the queued requests are processed.
+        """
+        self._closed.set()
+        self._queue.put(None)
+        self._worker.join()
+
+    def _start_worker(self):
+        self._queue = queue.Queue()
+        self._last_batch_size = 1
+        self._worker = threading.Thread(
+            target=self._run, name="micro-batcher", daemon=True
+        )
+        self._worker_pid = os.getpid()
+        self._worker.start()
+
+    def _collect_batch(self, first_item) -> list:
+        """
+        Collect a batch starting with `first_item`, waiting at most `window_ms`
+        for more requests when concurrent traffic was observed.
+        """
+        batch = [first_item]
+        deadline = time.perf_counter() + self.window_ms / 1000.0
+        wait_for_more = self._last_batch_size > 1 or not self._queue.empty()
+
+        while len(batch) < self.max_batch_size:
+            try:
+                if wait_for_more:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    item = self._queue.get(timeout=remaining)
+                else:
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+
+            if item is None:
+                # Re-queue the shutdown sentinel for the worker loop
+                self._queue.put(None)
+                break
+            batch.append(item)
+
+        return batch
+
+    def _run(self):
+        """
+        Background worker loop: form batches and score them.
+        """
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+
+            batch = self._collect_batch(item)
+            self._last_batch_size = len(batch)
+            self._process_batch(batch)
+
+    def _process_batch(self, batch: list):
+        """
+        Score one batch and deliver each caller its own result.
+        """
+        dispatched_at = time.perf_counter()
+        queue_waits_ms = [
+            (dispatched_at - enqueued_at) * 1000.0 for _, _, enqueued_at in batch
+        ]
+
+        try:
+            predictions = self.predict_fn([record for record, _, _ in batch])
+            for (_, future, _), prediction in zip(batch, predictions):
+                future.set_result(prediction)
+            self.stats.record_batch(queue_waits_ms)
+        except Exception as e:
+            logging.error(f"Micro-batch prediction failed: {e}")
+            error = CustomException(e, sys)
+            for _, future, _ in batch:
+                future.set_exception(error)
+            self.stats.record_batch(queue_waits_ms, failed=True)
@@ -0,0 +1,253 @@
+import json
+import os
+import random
+import re
+import shutil
+import sys
+import zlib
+from dataclasses import dataclass, field
+from typing import Dict
+
+from src.config.config import Config
+from src.exception import CustomException
+from src.logger_manager import LoggerManager
+
+logging = LoggerManager.get_logger(__name__)
+
+# Name of the version served from the flat artifact layout (MODEL_FILE_PATH)
+DEFAULT_VERSION = "default"
+
+MODEL_FILE_NAME = "model.pkl"
+PREPROCESSOR_FILE_NAME = "preprocessor.pkl"
+FOLDED_MODEL_FILE_NAME = "folded_model.pkl"
+
+VERSION_NAME_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]*$")
+
+
+@dataclass(frozen=True)
+class ModelVersion:
+    """
+    Artifact paths of one registered model and preprocessor pair.
+    """
+
+    name: str
+    model_path: str
+    preprocessor_path: str
+    folded_model_path: str
+
+
+@dataclass
+class ModelRouting:
+    """
+    Routing of prediction requests between the loaded model versions.
+
+    Requests that name a version are served by it. Otherwise, the weights
+    are percentages of the traffic sent to each version (sticky per routing
+    key when one is given), and the remaining requests go to the default
+    version: `{"v2": 10}` sends 10% of the traffic to v2 and 90% to the
+    default version.
+    """
+
+    default_version: str
+    weights: Dict[str, float] = field(default_factory=dict)
+
+    def resolve(self, version: str = None, routing_key: str = None) -> str:
+        """
+        Picks the version that serves a request.
+
+        Args:
+            version (str): Version explicitly requested by the caller.
+            routing_key (str): Key that keeps a caller on the same version of a split.
+
+        Returns:
+            str: The name of the version to use.
+        """
+        if version:
+            return version
+        if not self.weights:
+            return self.default_version
+
+        if routing_key is not None:
+            point = zlib.crc32(routing_key.encode("utf-8")) / 2**32 * 100
+        else:
+            point = random.random() * 100
+        for name, weight in sorted(self.weights.items()):
+            point -= weight
+            if point < 0:
+                return name
+        return self.default_version
+
+    def to_dict(self) -> dict:
+        return {"default_version": self.default_version, "weights": dict(self.weights)}
+
+
+class ModelRegistry:
+    """
+    Versioned local model registry under the model directory.
+
+    Each version is a subdirectory holding a model and preprocessor pair
+    (and optionally a folded linear model):
+
+        artifacts/models/<version>/model.pkl
+        artifacts/models/<version>/preprocessor.pkl
+        artifacts/models/<version>/folded_model.pkl
+
+    The flat `MODEL_FILE_PATH` and `PREPROCESSOR_FILE_PATH` artifacts, when
+    present, are served as the `default` version. Request routing between
+    versions is configured in `routing.json` next to the versions.
+    """
+
+    def __init__(self, root: str = None):
+        """
+        Initialize the ModelRegistry.
+
+        Args:
+            root (str): Registry directory (defaults to the configured model directory).
+        """
+        self.config = Config()
+        self.root = root or self.config.MODEL_DIR
+        self.routing_path = os.path.join(self.root, "routing.json")
+
+    def versions(self) -> Dict[str, ModelVersion]:
+        """
+        Returns the complete versions found on disk, by name.
+
+        A version directory is complete once its model file exists; the model
+        is written last when a version is registered.
+        """
+        versions = {}
+        if os.path.exists(self.config.MODEL_FILE_PATH) and os.path.exists(
+            self.config.PREPROCESSOR_FILE_PATH
+        ):
+            versions[DEFAULT_VERSION] = ModelVersion(
+                name=DEFAULT_VERSION,
+                model_path=self.config.MODEL_FILE_PATH,
+                preprocessor_path=self.config.PREPROCESSOR_FILE_PATH,
+                folded_model_path=self.config.FOLDED_MODEL_FILE_PATH,
+            )
+
+        if os.path.isdir(self.root):
+            for name in sorted(os.listdir(self.root)):
+                version = self._version(name)
+                if os.path.exists(version.model_path) and os.path.exists(
+                    version.preprocessor_path
+                ):
+                    versions[name] = version
+        return versions
+
+    def create_version(self, name: str, preprocessor_path: str) -> ModelVersion:
+        """
+        Create a version directory and copy the fitted preprocessor into it.
+
+        The caller writes the model to `model_path` last, which makes the
+        version visible to serving processes.
+
+        Args:
+            name (str): Version name (letters, digits, '.', '_' and '-').
+            preprocessor_path (str): Path of the fitted preprocessor.
+
+        Returns:
+            ModelVersion: The paths of the new version.
+
+        Raises:
+            ValueError: If the name is invalid or the version already exists.
+        """
+        if not VERSION_NAME_PATTERN.match(name) or name == DEFAULT_VERSION:
+            raise ValueError(f"Invalid model version name: '{name}'.")
+        version = self._version(name)
+        if os.path.exists(version.model_path):
+            raise ValueError(f"Model version '{name}' already exists.")
+
+        os.makedirs(os.path.dirname(version.model_path), exist_ok=True)
+        shutil.copyfile(preprocessor_path, version.preprocessor_path)
+        return version
+
+    def load_routing(self, versions: Dict[str, ModelVersion] = None) -> ModelRouting:
+        """
+        Load the routing configuration, ignoring versions that do not exist.
+
+        Without a routing file, requests go to the `default` version if it
+        exists and otherwise to the last version in name order.
+
+        Args:
+            versions (dict): The available versions (scanned if not given).
+
+        Returns:
+            ModelRouting: The routing between the available versions.
+        """
+        versions = self.versions() if versions is None else versions
+        fallback = (
+            DEFAULT_VERSION
+            if DEFAULT_VERSION in versions
+            else (sorted(versions)[-1] if versions else None)
+        )
+        if not os.path.exists(self.routing_path):
+            return ModelRouting(default_version=fallback)
+
+        with open(self.routing_path, "r", encoding="utf-8") as f:
+            routing = json.load(f)
+
+        default_version = routing.get("default_version", fallback)
+        if default_version not in versions:
+            logging.warning(
+                f"Routing default version '{default_version}' is not available; "
+                f"using '{fallback}'."
+            )
+            default_version = fallback
+
+        weights = {}
+        for name, weight in routing.get("weights", {}).items():
+            if name not in versions:
+                logging.warning(f"Ignoring routing weight of unknown version '{name}'.")
+            elif weight > 0:
+                weights[name] = float(weight)
+        return ModelRouting(default_version=default_version, weights=weights)
+
+    def set_routing(self, default_version: str, weights: Dict[str, float] = None):
+        """
+        Write the routing configuration atomically. Serving processes pick it
+        up on their next artifact check, without reloading any model.
+
+        Args:
+            default_version (str): Version serving requests outside the weighted split.
+            weights (dict): Optional version name to percentage of the traffic.
+
+        Raises:
+            CustomException: If a version does not exist, a weight is negative,
+                or the weights add up to more than 100.
+        """
+        try:
+            versions = self.versions()
+            weights = weights or {}
+            for name in [default_version, *weights]:
+                if name not in versions:
+                    raise ValueError(f"Unknown model version: '{name}'.")
+            if any(weight < 0 for weight in weights.values()):
+                raise ValueError("Routing weights must not be negative.")
+            if sum(weights.values()) > 100:
+                raise ValueError(
+                    "Routing weights are traffic percentages and must add up to "
+                    "at most 100."
+                )
+
+            temp_path = f"{self.routing_path}.tmp"
+            os.makedirs(self.root, exist_ok=True)
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    ModelRouting(default_version, weights).to_dict(), f, indent=4
+                )
+            os.replace(temp_path, self.routing_path)
+            logging.info(
+                f"Model routing updated: default '{default_version}', weights {weights}."
+            )
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def _version(self, name: str) -> ModelVersion:
+        directory = os.path.join(self.root, name)
+        return ModelVersion(
+            name=name,
+            model_path=os.path.join(directory, MODEL_FILE_NAME),
+            preprocessor_path=os.path.join(directory, PREPROCESSOR_FILE_NAME),
+            folded_model_path=os.path.join(directory, FOLDED_MODEL_FILE_NAME),
+        )
@@ -0,0 +1,378 @@
+import os
+import sys
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Tuple
+
+from src.config.config import Config
+from src.exception import CustomException
+from src.logger_manager import LoggerManager
+from src.models import SingletonMeta
+from src.pipeline.model_registry import ModelRegistry, ModelRouting, ModelVersion
+from src.pipeline.predict_pipeline import PredictPipeline
+from src.utils.file_utils import compute_file_hash, get_file_fingerprint
+
+logging = LoggerManager.get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class _ServingState:
+    """
+    The loaded pipelines and their routing, swapped in as one unit.
+    """
+
+    pipelines: Dict[str, PredictPipeline] = field(default_factory=dict)
+    routing: ModelRouting = None
+    content_hashes: Dict[str, Tuple[str, str]] = field(default_factory=dict)
+
+
+class PipelineProvider(metaclass=SingletonMeta):
+    """
+    Process-wide provider of the shared PredictPipelines.
+
+    Every model version in the ModelRegistry is loaded once and shared by
+    every request, so one process can serve several versions side by side
+    (e.g. for a canary or a rollback). Versions whose preprocessors have
+    the same content hash share one preprocessor instance. Requests are
+    routed to a version by name or by the registry's weighted split.
+
+    A background watcher polls the artifact files and the routing file and,
+    when they change, loads the changed versions off the request path and
+    swaps them in atomically. Unchanged versions are not reloaded. Requests
+    keep using the pipeline they obtained from `get`, so they never wait on
+    a reload. Callbacks registered with `add_reload_listener` are then called
+    with the content versions now served.
+    """
+
+    def __init__(self):
+        """
+        Initialize the PipelineProvider. Artifacts are loaded on the first call to `get`.
+        """
+        self.config = Config()
+        self.registry = ModelRegistry()
+        self.reload_interval = self.config.PIPELINE_RELOAD_INTERVAL
+        self.reloads = 0
+        self.loaded_at = None
+
+        self._state = None
+        self._fingerprint = None
+        self._load_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._watcher = None
+        self._watcher_pid = None
+        self._reload_listeners = []
+
+    @property
+    def artifact_paths(self) -> list:
+        """Paths of the artifacts the pipelines are loaded from."""
+        return [
+            path
+            for version in self.registry.versions().values()
+            for path in (version.model_path, version.preprocessor_path)
+        ]
+
+    @property
+    def version(self) -> str:
+        """Content-hash based identifier of the default version's artifacts."""
+        state = self._state
+        if state is None:
+            return None
+        return self.content_version(state.routing.default_version)
+
+    @property
+    def versions(self) -> list:
+        """Names of the loaded model versions."""
+        state = self._ensure_loaded()
+        return sorted(state.pipelines)
+
+    @property
+    def content_versions(self) -> set:
+        """Content-hash based identifiers of every loaded version's artifacts."""
+        state = self._state
+        if state is None:
+            return set()
+        return {self.content_version(name) for name in state.pipelines}
+
+    def add_reload_listener(self, listener):
+        """
+        Register a callback called with the `content_versions` served after
+        new pipelines are swapped in, e.g. to drop results of replaced versions.
+
+        Args:
+            listener (callable): Called with the set of content versions.
+        """
+        self._reload_listeners.append(listener)
+
+    def content_version(self, name: str) -> str:
+        """
+        Returns the content-hash based identifier of a loaded version's artifacts.
+        """
+        state = self._state
+        if state is None or name not in state.content_hashes:
+            return None
+        return "-".join(content_hash[:12] for content_hash in state.content_hashes[name])
+
+    def resolve_version(self, version: str = None, routing_key: str = None) -> str:
+        """
+        Pick the version that serves a request.
+
+        Args:
+            version (str): Version explicitly requested by the caller.
+            routing_key (str): Key that keeps a caller on the same version of a split.
+
+        Returns:
+            str: The name of a loaded version.
+
+        Raises:
+            ValueError: If the requested version is not loaded.
+        """
+        state = self._ensure_loaded()
+        name = state.routing.resolve(version, routing_key)
+        if name not in state.pipelines:
+            raise ValueError(f"Unknown model version: '{name}'.")
+        return name
+
+    def get(self, version: str = None) -> PredictPipeline:
+        """
+        Return the PredictPipeline of a version, loading the versions on first use.
+
+        Args:
+            version (str): Version name (defaults to the routing's default version).
+
+        Returns:
+            PredictPipeline: The currently active pipeline of the version.
+
+        Raises:
+            ValueError: If the version is not loaded.
+        """
+        state = self._ensure_loaded()
+        name = version or state.routing.default_version
+        pipeline = state.pipelines.get(name)
+        if pipeline is None:
+            raise ValueError(f"Unknown model version: '{name}'.")
+        return pipeline
+
+    def reload_if_changed(self) -> bool:
+        """
+        Reload the versions whose artifacts changed on disk, and the routing.
+
+        Changes are detected through the file modification time and size, and
+        confirmed with a content hash so that touching a file does not trigger
+        a reload. New pipelines only replace the current ones once they are
+        fully loaded.
+
+        Returns:
+            bool: True if new pipelines or routing were swapped in, False otherwise.
+        """
+        with self._load_lock:
+            fingerprint = self._get_fingerprint()
+            if fingerprint == self._fingerprint:
+                return False
+
+            versions = self.registry.versions()
+            if not versions:
+                logging.warning("Artifacts missing; keeping the current pipelines.")
+                return False
+
+            content_hashes = self._hash_versions(versions)
+            routing = self.registry.load_routing(versions)
+            state = self._state or _ServingState()
+            if content_hashes == state.content_hashes:
+                self._fingerprint = fingerprint
+                if routing == state.routing:
+                    return False
+                self._state = _ServingState(
+                    state.pipelines, routing, state.content_hashes
+                )
+                logging.info(f"Model routing is now {routing.to_dict()}.")
+                return True
+
+            logging.info("Artifact change detected; reloading pipelines.")
+            if not self._load(fingerprint, versions, content_hashes):
+                return False
+            self.reloads += 1
+            return True
+
+    def start_watcher(self):
+        """
+        Start the background artifact watcher if hot reload is enabled.
+
+        The watcher is restarted in forked child processes, which do not
+        inherit the parent's threads.
+        """
+        if self.reload_interval <= 0:
+            return
+        if self._watcher is not None and self._watcher_pid == os.getpid():
+            return
+
+        with self._load_lock:
+            if self._watcher is not None and self._watcher_pid == os.getpid():
+                return
+            self._stop_event.clear()
+            self._watcher = threading.Thread(
+                target=self._watch, name="pipeline-watcher", daemon=True
+            )
+            self._watcher_pid = os.getpid()
+            self._watcher.start()
+
+    def stop_watcher(self):
+        """
+        Stop the background artifact watcher.
+        """
+        self._stop_event.set()
+        if self._watcher is not None and self._watcher_pid == os.getpid():
+            self._watcher.join()
+        self._watcher = None
+        self._watcher_pid = None
+
+    def stats(self) -> dict:
+        """
+        Returns a JSON-serializable description of the loaded pipelines.
+        """
+        state = self._state
+        pipelines = state.pipelines if state is not None else {}
+        return {
+            "version": self.version,
+            "versions": {
+                name: {
+                    "content_version": self.content_version(name),
+                    "model": type(pipeline.model).__name__,
+                }
+                for name, pipeline in sorted(pipelines.items())
+            },
+            "routing": state.routing.to_dict() if state is not None else None,
+            "shared_preprocessors": len(
+                {id(pipeline.preprocessor) for pipeline in pipelines.values()}
+            ),
+            "loaded_at": self.loaded_at,
+            "reloads": self.reloads,
+            "reload_interval": self.reload_interval,
+        }
+
+    def _ensure_loaded(self) -> _ServingState:
+        state = self._state
+        if state is None:
+            with self._load_lock:
+                if self._state is None:
+                    self._load()
+                state = self._state
+        self.start_watcher()
+        return state
+
+    def _get_fingerprint(self) -> list:
+        fingerprint = [get_file_fingerprint(self.registry.routing_path)]
+        for name, version in self.registry.versions().items():
+            fingerprint.append(
+                (
+                    name,
+                    get_file_fingerprint(version.model_path),
+                    get_file_fingerprint(version.preprocessor_path),
+                )
+            )
+        return fingerprint
+
+    def _hash_versions(self, versions: Dict[str, ModelVersion]) -> dict:
+        return {
+            name: (
+                compute_file_hash(version.model_path),
+                compute_file_hash(version.preprocessor_path),
+            )
+            for name, version in versions.items()
+        }
+
+    def _load(self, fingerprint=None, versions=None, content_hashes=None):
+        """
+        Load the new or changed versions and swap them in. Must be called with
+        the load lock held.
+
+        A version that fails to load keeps serving its previous pipeline, if any.
+
+        Returns:
+            bool: True if the loaded pipelines match the artifacts currently on disk.
+        """
+        try:
+            fingerprint = fingerprint or self._get_fingerprint()
+            versions = versions or self.registry.versions()
+            if not versions:
+                raise FileNotFoundError(
+                    f"No model found at {self.config.MODEL_FILE_PATH} or in the "
+                    f"registry at {self.registry.root}."
+                )
+            content_hashes = content_hashes or self._hash_versions(versions)
+
+            current = self._state or _ServingState()
+            # Reuse loaded preprocessors with identical content
+            preprocessors = {
+                current.content_hashes[name][1]: pipeline.preprocessor
+                for name, pipeline in current.pipelines.items()
+            }
+            pipelines, loaded_hashes = {}, {}
+            for name, version in versions.items():
+                hashes = content_hashes[name]
+                if current.content_hashes.get(name) == hashes:
+                    pipelines[name] = current.pipelines[name]
+                    loaded_hashes[name] = hashes
+                    continue
+                try:
+                    pipeline = PredictPipeline(
+                        model_path=version.model_path,
+                        preprocessor_path=version.preprocessor_path,
+                        folded_model_path=version.folded_model_path,
+                        preprocessor=preprocessors.get(hashes[1]),
+                    )
+                except Exception as e:
+                    logging.error(f"Model version '{name}' could not be loaded: {e}")
+                    if name in current.pipelines:
+                        pipelines[name] = current.pipelines[name]
+                        loaded_hashes[name] = current.content_hashes[name]
+                    continue
+                preprocessors.setdefault(hashes[1], pipeline.preprocessor)
+                pipelines[name] = pipeline
+                loaded_hashes[name] = hashes
+
+            if not pipelines:
+                raise ValueError("No model version could be loaded.")
+            routing = self.registry.load_routing(
+                {name: versions[name] for name in pipelines}
+            )
+            state = _ServingState(pipelines, routing, loaded_hashes)
+
+            if self._get_fingerprint() != fingerprint:
+                # Artifacts were rewritten while loading; pick them up on the next poll
+                logging.warning("Artifacts changed during load; retrying later.")
+                if self._state is None:
+                    self._state = state
+                return False
+
+            # Reference assignment is atomic: requests see either the old or the new state
+            self._state = state
+            self._fingerprint = fingerprint
+            self.loaded_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            for name in sorted(pipelines):
+                logging.info(
+                    f"Model version '{name}' ({self.content_version(name)}) is active."
+                )
+            self._notify_reload()
+            return True
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def _notify_reload(self):
+        content_versions = self.content_versions
+        for listener in self._reload_listeners:
+            try:
+                listener(content_versions)
+            except Exception as e:
+                logging.error(f"Reload listener failed: {e}")
+
+    def _watch(self):
+        """
+        Background loop polling the artifacts for changes.
+        """
+        while not self._stop_event.wait(self.reload_interval):
+            try:
+                self.reload_if_changed()
+            except Exception as e:
+                # Keep serving the current pipelines if the new artifacts cannot be loaded
+                logging.error(f"Pipeline reload failed: {e}")
@@ -1,41 +1,197 @@
 import os
 import sys
+import time
 
+import numpy as np
 import pandas as pd
 
 from src.config.config import Config
 from src.exception import CustomException
 from src.logger_manager import LoggerManager
+from src.pipeline.compiled_preprocessor import CompiledPreprocessor
+from src.pipeline.linear_folding import FoldedLinearModel
+from src.pipeline.tree_ensemble import TreeEnsemble
 from src.utils.file_utils import load_object
 
 logging = LoggerManager.get_logger(__name__)
 
+# Batch sizes timed to find where the tree engine stops beating the native predict
+TREE_ENGINE_CALIBRATION_SIZES = (1, 4, 16, 64, 256, 1024)
+
 
 class PredictPipeline:
-    def __init__(self):
+    def __init__(
+        self,
+        model_path: str = None,
+        preprocessor_path: str = None,
+        folded_model_path: str = None,
+        preprocessor=None,
+    ):
         """
         Initialize the PredictPipeline by loading the model and preprocessor.
+
+        Args:
+            model_path (str): Model file (defaults to `MODEL_FILE_PATH`).
+            preprocessor_path (str): Preprocessor file (defaults to `PREPROCESSOR_FILE_PATH`).
+            folded_model_path (str): Folded linear model file (defaults to
+                `FOLDED_MODEL_FILE_PATH`, or `folded_model.pkl` next to `model_path`).
+            preprocessor: An already loaded preprocessor to share instead of
+                loading `preprocessor_path`.
         """
         try:
             self.config = Config()
-            model_path = self.config.MODEL_FILE_PATH
-            preprocessor_path = self.config.PREPROCESSOR_FILE_PATH
+            if folded_model_path is None:
+                folded_model_path = (
+                    os.path.join(os.path.dirname(model_path), "folded_model.pkl")
+                    if model_path
+                    else self.config.FOLDED_MODEL_FILE_PATH
+                )
+            model_path = model_path or self.config.MODEL_FILE_PATH
+            preprocessor_path = preprocessor_path or self.config.PREPROCESSOR_FILE_PATH
+            self.folded_model_path = folded_model_path
             logging.info("Loading model and preprocessor.")
 
             # Load the model and preprocessor once during initialization
             self.model = load_object(file_path=model_path)
-            self.preprocessor = load_object(file_path=preprocessor_path)
+            self.preprocessor = (
+                preprocessor
+                if preprocessor is not None
+                else load_object(file_path=preprocessor_path)
+            )
 
             logging.info("Model and preprocessor loaded successfully.")
+
+            self.folded_model = self._load_folded_model()
+            self.compiled_preprocessor = (
+                None if self.folded_model is not None else self._compile_preprocessor()
+            )
+            self.tree_engine = self._load_tree_engine()
         except Exception as e:
             raise CustomException(e, sys) from e
 
-    def predict(self, features):
+    def _compile_preprocessor(self):
+        """
+        Compile the preprocessor into the pandas-free fast path and verify it
+        against the sklearn transformer. Falls back to the sklearn transformer
+        if the preprocessor cannot be compiled or the outputs differ.
+
+        Returns:
+            CompiledPreprocessor: The verified compiled preprocessor, or None.
+        """
+        if not self.config.COMPILED_PREPROCESSOR_ENABLED:
+            return None
+        try:
+            compiled = CompiledPreprocessor.compile(self.preprocessor)
+            compiled.verify(self.preprocessor)
+            logging.info("Using the compiled preprocessor fast path.")
+            return compiled
+        except Exception as e:
+            logging.warning(
+                f"Compiled preprocessor unavailable, using the sklearn transformer: {e}"
+            )
+            return None
+
+    def _load_folded_model(self):
+        """
+        Load the folded linear model exported by the training pipeline and
+        verify it against the loaded model and preprocessor, so that a stale
+        export is never served.
+
+        Returns:
+            FoldedLinearModel: The verified folded model, or None.
+        """
+        folded_path = self.folded_model_path
+        if not self.config.LINEAR_FOLDING_ENABLED or not os.path.exists(folded_path):
+            return None
+        if not FoldedLinearModel.is_foldable(self.model):
+            return None
+        try:
+            folded = load_object(file_path=folded_path)
+            folded.verify(self.preprocessor, self.model)
+            logging.info("Using the folded linear model.")
+            return folded
+        except Exception as e:
+            logging.warning(f"Folded linear model unavailable, using the full pipeline: {e}")
+            return None
+
+    def _load_tree_engine(self):
+        """
+        Convert a tree ensemble model into the array-backed inference engine
+        and verify it against the native `model.predict` on a probe batch.
+
+        Single trees are left to the native predict, which is already a
+        single compiled traversal. The engine wins on small batches; unless
+        `TREE_ENGINE_MAX_ROWS` is set, the largest batch size for which it is
+        faster is measured here.
+
+        Returns:
+            TreeEnsemble: The verified engine, or None.
+        """
+        self.tree_engine_max_rows = 0
+        if not self.config.TREE_ENGINE_ENABLED or not TreeEnsemble.is_supported(
+            self.model
+        ):
+            return None
+        try:
+            engine = TreeEnsemble.from_model(self.model)
+            if engine.n_trees < 2:
+                return None
+            probe = CompiledPreprocessor.compile(self.preprocessor).probe_frame(
+                self.preprocessor, n_rows=256
+            )
+            probe = self.preprocessor.transform(probe)
+            if hasattr(probe, "toarray"):
+                probe = probe.toarray()
+            engine.verify(self.model, probe)
+
+            self.tree_engine_max_rows = self.config.TREE_ENGINE_MAX_ROWS
+            if self.tree_engine_max_rows is None:
+                self.tree_engine_max_rows = self._calibrate_tree_engine(engine, probe)
+            if self.tree_engine_max_rows < 1:
+                logging.info("Tree ensemble engine is slower than the native predict.")
+                return None
+            logging.info(
+                "Using the tree ensemble engine for batches of up to "
+                f"{self.tree_engine_max_rows} rows."
+            )
+            return engine
+        except Exception as e:
+            logging.warning(
+                f"Tree ensemble engine unavailable, using the native predict: {e}"
+            )
+            return None
+
+    def _calibrate_tree_engine(self, engine: TreeEnsemble, probe) -> int:
+        """
+        Returns the largest calibration batch size for which the engine is
+        faster than the native predict (0 if it never is).
+        """
+
+        def best_time(predict, batch) -> float:
+            timings = []
+            for _ in range(3):
+                start = time.perf_counter()
+                predict(batch)
+                timings.append(time.perf_counter() - start)
+            return min(timings)
+
+        max_rows = 0
+        for batch_size in TREE_ENGINE_CALIBRATION_SIZES:
+            batch = np.resize(probe, (batch_size, probe.shape[1]))
+            if best_time(engine.predict, batch) >= best_time(self.model.predict, batch):
+                break
+            max_rows = batch_size
+        return max_rows
+
+    def predict(self, features, timings: dict = None):
         """
         Predict outcomes based on the given features.
 
         Args:
-            features (pd.DataFrame or np.ndarray): The input features for prediction.
+            features (pd.DataFrame, dict or list): The input features for prediction,
+                as a DataFrame, a mapping of column name to values, or a list of records.
+            timings (dict): If given, receives the seconds spent in the "transform"
+                and "predict" stages (only "predict" for a folded linear model).
 
         Returns:
             np.ndarray: Predicted values.
@@ -43,12 +199,35 @@ class PredictPipeline:
         try:
             logging.info("Starting prediction.")
 
+            start = time.perf_counter()
+            if self.folded_model is not None:
+                preds = self.folded_model.predict(features)
+                if timings is not None:
+                    timings["predict"] = time.perf_counter() - start
+                logging.info("Prediction completed successfully.")
+                return preds
+
             # Preprocess the features
-            data_scaled = self.preprocessor.transform(features)
+            if self.compiled_preprocessor is not None:
+                data_scaled = self.compiled_preprocessor.transform(features)
+            else:
+                if not isinstance(features, pd.DataFrame):
+                    features = pd.DataFrame(features)
+                data_scaled = self.preprocessor.transform(features)
             logging.info("Data transformed successfully.")
+            transformed = time.perf_counter()
 
-            # Make predictions
-            preds = self.model.predict(data_scaled)
+            # Make predictions; the tree engine only wins on small batches
+            if (
+                self.tree_engine is not None
+                and data_scaled.shape[0] <= self.tree_engine_max_rows
+            ):
+                preds = self.tree_engine.predict(data_scaled)
+            else:
+                preds = self.model.predict(data_scaled)
+            if timings is not None:
+                timings["transform"] = transformed - start
+                timings["predict"] = time.perf_counter() - transformed
             logging.info("Prediction completed successfully.")
 
             return preds
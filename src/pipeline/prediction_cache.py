@@ -0,0 +1,188 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+# Approximate per-entry bookkeeping overhead of the OrderedDict and entry tuple
+ENTRY_OVERHEAD_BYTES = 200
+
+
+class PredictionCache:
+    """
+    Bounded LRU/TTL cache of prediction results keyed on the validated input.
+
+    Entries are keyed on the version of the model and preprocessor as well
+    as the input, so versions served side by side (e.g. a canary split) keep
+    their own results. When the served versions change, `retain_versions`
+    purges the entries of the versions that were replaced, so they do not
+    hold the cache's budget until they age out. Concurrent requests for the
+    same input and version are coalesced: only the first one computes the
+    prediction and the others wait for its result.
+    """
+
+    def __init__(
+        self, max_entries: int = 10000, ttl_seconds: float = 300.0, max_bytes=None
+    ):
+        """
+        Initialize the PredictionCache.
+
+        Args:
+            max_entries (int): Maximum number of cached results.
+            ttl_seconds (float): Time after which a cached result expires (0 disables expiry).
+            max_bytes (int): Approximate memory bound of the cache in bytes (None for no bound).
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (value, expires_at, size_bytes)
+        self._inflight = {}  # key -> Future of the computation in progress
+        self._bytes = 0
+        self._versions = None  # Versions currently served (None for any)
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.purged = 0
+
+    @staticmethod
+    def make_key(record, version=None) -> tuple:
+        """
+        Build the canonical cache key of a validated input record.
+
+        Args:
+            record (PredictionInputSchema): The validated input.
+            version (str): Version of the model and preprocessor serving it.
+
+        Returns:
+            tuple: The version, then the field values in schema order.
+        """
+        return (version, *record.model_dump().values())
+
+    def get_or_compute(self, record, compute, version=None):
+        """
+        Return the cached prediction for `record`, computing it if needed.
+
+        Args:
+            record (PredictionInputSchema): The validated input.
+            compute (callable): Computes the prediction when it is not cached.
+            version (str): Version of the loaded model and preprocessor.
+
+        Returns:
+            The prediction for the record.
+        """
+        key = self.make_key(record, version)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at, _ = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                self._remove(key)
+                self.expirations += 1
+
+            future = self._inflight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._inflight[key] = future
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not is_leader:
+            # An identical request is already being computed; share its result
+            return future.result()
+
+        try:
+            value = compute()
+        except Exception as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._inflight.pop(key, None)
+            self._insert(key, value)
+        future.set_result(value)
+        return value
+
+    def retain_versions(self, versions):
+        """
+        Purge the entries of every version but the given ones, and stop
+        caching the results of other versions still being computed.
+
+        Args:
+            versions (iterable): Versions of the model and preprocessor still served.
+        """
+        with self._lock:
+            self._versions = set(versions)
+            for key in [key for key in self._entries if key[0] not in self._versions]:
+                self._remove(key)
+                self.purged += 1
+
+    def clear(self):
+        """
+        Remove every cached result.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        """
+        Returns a JSON-serializable snapshot of the cache counters.
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "purged": self.purged,
+            }
+
+    def _insert(self, key, value):
+        if self._versions is not None and key[0] not in self._versions:
+            # Computed by a version replaced in the meantime
+            return
+        size_bytes = (
+            sys.getsizeof(key)
+            + sum(sys.getsizeof(item) for item in key)
+            + sys.getsizeof(value)
+            + ENTRY_OVERHEAD_BYTES
+        )
+        if key in self._entries:
+            self._remove(key)
+
+        expires_at = (
+            time.monotonic() + self.ttl_seconds if self.ttl_seconds > 0 else None
+        )
+        self._entries[key] = (value, expires_at, size_bytes)
+        self._bytes += size_bytes
+
+        while self._entries and (
+            len(self._entries) > self.max_entries
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+
+    def _remove(self, key):
+        _, _, size_bytes = self._entries.pop(key)
+        self._bytes -= size_bytes
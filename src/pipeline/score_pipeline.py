@@ -0,0 +1,248 @@
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import pandas as pd
+
+from src.exception import CustomException
+from src.logger_manager import LoggerManager
+from src.pipeline.predict_pipeline import PredictPipeline
+
+logging = LoggerManager.get_logger(__name__)
+
+PREDICTION_COLUMN = "predicted_math_score"
+
+# Pipeline loaded once per worker process by `_init_worker`
+_worker_pipeline = None
+
+
+def _init_worker():
+    """
+    Process pool initializer: load the model and preprocessor once per worker.
+    """
+    global _worker_pipeline
+    _worker_pipeline = PredictPipeline()
+
+
+def _score_chunk(chunk: pd.DataFrame):
+    """
+    Score one chunk in a worker process.
+    """
+    return _worker_pipeline.predict(chunk)
+
+
+class ScorePipeline:
+    """
+    Offline batch inference for large CSV or Parquet files.
+
+    The input is streamed in chunks that are scored on a process pool, where
+    each worker loads the model and preprocessor once. Predictions are written
+    in input order to a CSV output file. A checkpoint file next to the output
+    records the progress, so an interrupted run can be resumed.
+    """
+
+    def __init__(
+        self,
+        input_path: str,
+        output_path: str,
+        chunk_size: int = 10000,
+        workers: int = None,
+        resume: bool = False,
+    ):
+        """
+        Initialize the ScorePipeline.
+
+        Args:
+            input_path (str): Path to the input CSV or Parquet file.
+            output_path (str): Path to the output CSV file.
+            chunk_size (int): Number of rows per chunk.
+            workers (int): Number of worker processes (0 scores in the main process).
+            resume (bool): Resume an interrupted run from its checkpoint.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1.")
+
+        self.input_path = input_path
+        self.output_path = output_path
+        self.chunk_size = chunk_size
+        self.workers = os.cpu_count() if workers is None else workers
+        self.resume = resume
+        self.checkpoint_path = f"{output_path}.checkpoint.json"
+
+    def _iter_chunks(self, skip_rows: int):
+        """
+        Stream the input file in chunks, skipping the rows already scored.
+        """
+        if self.input_path.endswith(".parquet"):
+            try:
+                import pyarrow.parquet as pq
+            except ImportError as e:
+                raise CustomException(
+                    "Scoring Parquet files requires the 'pyarrow' package."
+                ) from e
+
+            rows_seen = 0
+            for batch in pq.ParquetFile(self.input_path).iter_batches(
+                batch_size=self.chunk_size
+            ):
+                rows_seen += batch.num_rows
+                if rows_seen > skip_rows:
+                    yield batch.to_pandas()
+        else:
+            yield from pd.read_csv(
+                self.input_path,
+                chunksize=self.chunk_size,
+                skiprows=range(1, skip_rows + 1),
+            )
+
+    def _load_checkpoint(self) -> dict:
+        """
+        Load the checkpoint of an interrupted run, or start from scratch.
+
+        A run whose output file is missing or shorter than its checkpoint
+        records is started again from scratch.
+        """
+        if self.resume and os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path, "r", encoding="utf-8") as f:
+                checkpoint = json.load(f)
+
+            if (
+                checkpoint["input_path"] != os.path.abspath(self.input_path)
+                or checkpoint["chunk_size"] != self.chunk_size
+            ):
+                raise ValueError(
+                    "The checkpoint was created for a different input file or chunk size."
+                )
+
+            if (
+                os.path.exists(self.output_path)
+                and os.path.getsize(self.output_path) >= checkpoint["output_bytes"]
+            ):
+                # Drop any partially written chunk after the last checkpoint
+                with open(self.output_path, "r+b") as f:
+                    f.truncate(checkpoint["output_bytes"])
+
+                logging.info(f"Resuming after {checkpoint['rows_done']} scored rows.")
+                return checkpoint
+
+            logging.warning(
+                f"The output file {self.output_path} does not hold the "
+                f"{checkpoint['rows_done']} rows of the checkpoint; starting "
+                "from scratch."
+            )
+
+        if os.path.exists(self.output_path):
+            os.remove(self.output_path)
+        return {
+            "input_path": os.path.abspath(self.input_path),
+            "chunk_size": self.chunk_size,
+            "rows_done": 0,
+            "output_bytes": 0,
+        }
+
+    def _save_checkpoint(self, checkpoint: dict):
+        temp_path = f"{self.checkpoint_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(checkpoint, f)
+        os.replace(temp_path, self.checkpoint_path)
+
+    def run(self) -> dict:
+        """
+        Score the input file and write the predictions in order.
+
+        Returns:
+            dict: The number of rows scored, elapsed seconds and rows per second.
+        """
+        try:
+            if not os.path.exists(self.input_path):
+                raise FileNotFoundError(f"File not found: {self.input_path}")
+
+            checkpoint = self._load_checkpoint()
+            rows_at_start = checkpoint["rows_done"]
+            start_time = time.perf_counter()
+
+            if os.path.dirname(self.output_path):
+                os.makedirs(os.path.dirname(self.output_path), exist_ok=True)
+
+            if self.workers > 0:
+                logging.info(f"Scoring with {self.workers} worker processes.")
+                executor = ProcessPoolExecutor(
+                    max_workers=self.workers, initializer=_init_worker
+                )
+                submit = partial(executor.submit, _score_chunk)
+            else:
+                logging.info("Scoring in the main process.")
+                executor = None
+                pipeline = PredictPipeline()
+
+                def submit(chunk):
+                    return _CompletedResult(pipeline.predict(chunk))
+
+            try:
+                with open(self.output_path, "a", encoding="utf-8", newline="") as output:
+                    # Keep a bounded number of chunks in flight, written back in input order
+                    in_flight = deque()
+                    max_in_flight = max(self.workers, 1) * 2
+
+                    def write_next():
+                        chunk, future = in_flight.popleft()
+                        chunk[PREDICTION_COLUMN] = future.result()
+                        chunk.to_csv(
+                            output, index=False, header=checkpoint["output_bytes"] == 0
+                        )
+                        output.flush()
+                        checkpoint["rows_done"] += len(chunk)
+                        checkpoint["output_bytes"] = output.tell()
+                        self._save_checkpoint(checkpoint)
+
+                        elapsed = time.perf_counter() - start_time
+                        logging.info(
+                            f"Scored {checkpoint['rows_done']} rows "
+                            f"({(checkpoint['rows_done'] - rows_at_start) / elapsed:.0f} rows/s)."
+                        )
+
+                    for chunk in self._iter_chunks(checkpoint["rows_done"]):
+                        in_flight.append((chunk, submit(chunk)))
+                        if len(in_flight) >= max_in_flight:
+                            write_next()
+                    while in_flight:
+                        write_next()
+            finally:
+                if executor is not None:
+                    executor.shutdown(cancel_futures=True)
+
+            if os.path.exists(self.checkpoint_path):
+                os.remove(self.checkpoint_path)
+
+            elapsed = time.perf_counter() - start_time
+            rows_scored = checkpoint["rows_done"] - rows_at_start
+            summary = {
+                "rows": checkpoint["rows_done"],
+                "rows_scored": rows_scored,
+                "seconds": elapsed,
+                "rows_per_second": rows_scored / elapsed if elapsed > 0 else 0.0,
+            }
+            logging.info(
+                f"Scoring completed: {rows_scored} rows in {elapsed:.2f}s "
+                f"({summary['rows_per_second']:.0f} rows/s). Output: {self.output_path}"
+            )
+            return summary
+        except Exception as e:
+            logging.error(f"Error in scoring pipeline: {e}")
+            raise CustomException(e, sys) from e
+
+
+class _CompletedResult:
+    """
+    Future-like wrapper for a result computed in the main process.
+    """
+
+    def __init__(self, value):
+        self.value = value
+
+    def result(self):
+        return self.value
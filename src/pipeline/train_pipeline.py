@@ -1,14 +1,19 @@
 import os
+import shutil
 import sys
 from datetime import datetime
 
 from src.config.config import Config
 from src.exception import CustomException
 from src.logger_manager import LoggerManager
+from src.pipeline.linear_folding import FoldedLinearModel
+from src.pipeline.model_registry import ModelRegistry
+from src.pipeline.training_cache import TrainingCache
+from src.pipeline.training_scheduler import TrainingScheduler
 from src.services.data_ingestion_service import DataIngestionService
 from src.services.data_transformation_service import DataTransformationService
 from src.services.model_training_service import ModelTrainingService
-from src.utils.file_utils import save_json, save_object
+from src.utils.file_utils import load_object, save_json, save_object
 from src.utils.history_utils import append_training_history, update_training_history
 from src.utils.yaml_loader import load_model_config
 
@@ -45,6 +50,7 @@ class TrainPipeline:
             # Initialize an empty model_report to capture scores for all models
             model_report = {}
             model_instances = {}
+            cpu_splits = {}
 
             # Step 3: Model Training and Selection
             logging.info("Starting model training and selection.")
@@ -76,20 +82,39 @@ class TrainPipeline:
                     "You must specify either --model_type or --best_of_all."
                 )
 
+            if self.config.best_of_all and self.config.TRAINING_SCHEDULER_ENABLED:
+                # Train every fold of every candidate on one shared worker pool
+                scheduler = TrainingScheduler()
+                all_results = scheduler.run(models_to_train, train_arr, test_arr)
+            else:
+                all_results = None
+
             # for model_type, model_info in model_configs["models"].items():
             for model_type in models_to_train:
-                train_results = self.model_training_service.train_and_validate(
-                    model_type, train_arr, test_arr
-                )
+                if all_results is not None:
+                    train_results = all_results[model_type]
+                else:
+                    train_results = self.model_training_service.train_and_validate(
+                        model_type, train_arr, test_arr
+                    )
                 model_report[model_type] = {
                     "train_r2": train_results["train_r2"],
                     "test_r2": train_results["test_r2"],
+                    **train_results["search"],
+                    "best_iteration": train_results["best_iteration"],
+                    "cache_key": train_results["cache_key"],
+                    "cached": train_results["cached"],
                 }
                 model_instances[model_type] = {
                     "model": train_results["model"],
                 }
+                cpu_splits[model_type] = train_results["cpu_split"]
                 logging.info(f"Results for {model_type}: {train_results}")
 
+            # Keep the preprocessor with the cached models, so any of them can
+            # be promoted later
+            self.cache_preprocessor(preprocessor_path, model_report)
+
             # Once all models are trained, select the best one based on test_r2
             best_model_name = max(
                 model_report, key=lambda m: model_report[m]["test_r2"]
@@ -104,6 +129,12 @@ class TrainPipeline:
                 "train_r2": best_model_results["train_r2"],
                 "test_r2": best_model_results["test_r2"],
                 "model_report": model_report,
+                "cpu_budget": {
+                    "total_cores": self.config.cpu_budget,
+                    "default_policy": self.config.cpu_policy,
+                    "scheduler": all_results is not None,
+                    "models": cpu_splits,
+                },
             }
 
             # Append to the centralized training history file
@@ -111,10 +142,128 @@ class TrainPipeline:
             logging.info(f"Training history updated: {history_entry}")
 
             if self.config.save_best:
-                save_object(self.config.MODEL_FILE_PATH, best_model)
+                self.save_model(best_model, preprocessor_path)
 
             return model_report
 
         except Exception as e:
             logging.error(f"Error in training pipeline: {e}")
             raise CustomException(e, sys) from e
+
+    def save_model(self, model, preprocessor_path: str):
+        """
+        Save the best model with its folded model, or register them as a new
+        version of the model registry when a model version is set.
+
+        Args:
+            model: The fitted model.
+            preprocessor_path (str): Path of the preprocessor it was trained with.
+        """
+        model_path = self.config.MODEL_FILE_PATH
+        folded_path = self.config.FOLDED_MODEL_FILE_PATH
+        if self.config.model_version:
+            # Register a new version next to the ones being served
+            version = ModelRegistry().create_version(
+                self.config.model_version, preprocessor_path
+            )
+            preprocessor_path = version.preprocessor_path
+            model_path = version.model_path
+            folded_path = version.folded_model_path
+        elif preprocessor_path != self.config.PREPROCESSOR_FILE_PATH:
+            temp_path = f"{self.config.PREPROCESSOR_FILE_PATH}.{os.getpid()}.tmp"
+            shutil.copyfile(preprocessor_path, temp_path)
+            os.replace(temp_path, self.config.PREPROCESSOR_FILE_PATH)
+            preprocessor_path = self.config.PREPROCESSOR_FILE_PATH
+
+        # Export the folded model first so a reload triggered by the new
+        # model file never pairs it with a stale folded model
+        self.export_folded_model(model, preprocessor_path, folded_path)
+        save_object(model_path, model)
+        logging.info(f"Best model saved at: {model_path}")
+
+    def cache_preprocessor(self, preprocessor_path: str, model_report: dict):
+        """
+        Add the preprocessor to the training cache, and record its key on the
+        cached models of the run.
+        """
+        keys = [report["cache_key"] for report in model_report.values()]
+        if not any(keys):
+            return
+        cache = TrainingCache()
+        preprocessor_key = cache.put_preprocessor(preprocessor_path)
+        for key in filter(None, keys):
+            cache.annotate(key, preprocessor=preprocessor_key)
+        cache.flush()
+
+    def promote(self, key: str) -> dict:
+        """
+        Save a cached model as the best model without retraining it, with the
+        preprocessor it was trained with (registered as a new version when a
+        model version is set).
+
+        Args:
+            key (str): The key of a cached model, or a unique prefix of it.
+
+        Returns:
+            dict: The cache entry of the promoted model.
+
+        Raises:
+            CustomException: If no cached model matches the key, or its
+                preprocessor is no longer cached.
+        """
+        try:
+            cache = TrainingCache()
+            key = cache.find(key)
+            entry = cache.index[key]
+            preprocessor_key = entry.get("preprocessor")
+            if preprocessor_key not in cache.index or not os.path.exists(
+                cache.object_path(preprocessor_key)
+            ):
+                raise ValueError(
+                    f"The preprocessor of the cached model {key} is not cached."
+                )
+
+            train_results = cache.get(key)
+            self.save_model(train_results["model"], cache.object_path(preprocessor_key))
+            cache.flush()
+            logging.info(
+                f"Promoted the cached {entry['model_name']} model {key} "
+                f"(test R2 {entry['test_r2']:.4f})."
+            )
+            return entry
+        except Exception as e:
+            logging.error(f"Error promoting a cached model: {e}")
+            raise CustomException(e, sys) from e
+
+    def export_folded_model(
+        self, model, preprocessor_path: str, folded_path: str = None
+    ):
+        """
+        Export the closed-form folded representation of a linear best model.
+
+        Any previously exported folded model is removed when the best model
+        is not linear.
+
+        Args:
+            model: The best model.
+            preprocessor_path (str): Path of the fitted preprocessor.
+            folded_path (str): Output path (defaults to FOLDED_MODEL_FILE_PATH).
+        """
+        folded_path = folded_path or self.config.FOLDED_MODEL_FILE_PATH
+        if not FoldedLinearModel.is_foldable(model):
+            if os.path.exists(folded_path):
+                os.remove(folded_path)
+            return
+
+        try:
+            preprocessor = load_object(preprocessor_path)
+            folded_model = FoldedLinearModel.fold(preprocessor, model)
+            folded_model.verify(preprocessor, model)
+        except ValueError as e:
+            logging.warning(f"Could not fold the linear model: {e}")
+            if os.path.exists(folded_path):
+                os.remove(folded_path)
+            return
+
+        save_object(folded_path, folded_model)
+        logging.info(f"Folded linear model saved at: {folded_path}")
@@ -0,0 +1,329 @@
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+
+import numpy as np
+
+from src.config.config import Config
+from src.exception import CustomException
+from src.logger_manager import LoggerManager
+from src.pipeline.cpu_budget import thread_parameter
+from src.utils.artifact_utils import library_versions
+from src.utils.file_utils import compute_file_hash, load_object, save_object
+
+logging = LoggerManager.get_logger(__name__)
+
+# Kinds of cache entries:
+# - fold_score: validation R2 of one candidate on one cross-validation fold
+# - staged_scores: validation R2 of each ensemble size of a staged fold
+# - search: best parameters and summary of a model's hyperparameter search
+# - model: a fitted model with its train and test R2
+# - preprocessor: the fitted preprocessor the models were trained with
+FOLD_SCORE = "fold_score"
+STAGED_SCORES = "staged_scores"
+SEARCH = "search"
+MODEL = "model"
+PREPROCESSOR = "preprocessor"
+
+INDEX_FILE_NAME = "index.json"
+
+
+def hash_arrays(*arrays) -> str:
+    """
+    Returns the SHA-256 digest of the dtype, shape and content of arrays.
+    """
+    digest = hashlib.sha256()
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(f"{array.dtype.str}{array.shape}".encode("utf-8"))
+        digest.update(array.data)
+    return digest.hexdigest()
+
+
+def hash_folds(folds: list) -> str:
+    """
+    Returns the digest of cross-validation (train, validation) indices.
+    """
+    return hash_arrays(*(indices for fold in folds for indices in fold))
+
+
+def _json_default(value):
+    # NumPy scalars (e.g. a halving search's resource value) as Python numbers
+    if isinstance(value, np.generic):
+        return value.item()
+    return repr(value)
+
+
+class TrainingCache:
+    """
+    Local content-addressed store of cross-validation scores and fitted
+    models, so training runs reuse the work of earlier runs.
+
+    Keys are SHA-256 digests of everything a result depends on: the data,
+    the model class and parameters (except thread counts), the folds or
+    search settings, and the installed library versions. Small values
+    (scores, search results) are kept in `index.json`, and fitted models
+    and preprocessors in files next to it:
+
+        artifacts/training_cache/index.json
+        artifacts/training_cache/objects/<key[:2]>/<key>.pkl
+
+    The least recently used entries are evicted when the cache grows past
+    `max_bytes`. The index is written by `flush`.
+    """
+
+    def __init__(self, root: str = None, max_bytes: int = None):
+        """
+        Initialize the TrainingCache.
+
+        Args:
+            root (str): Cache directory (defaults to TRAINING_CACHE_DIR).
+            max_bytes (int): Size bound of the cache (defaults to TRAINING_CACHE_MAX_BYTES).
+        """
+        config = Config()
+        self.root = root or config.TRAINING_CACHE_DIR
+        self.max_bytes = (
+            config.TRAINING_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        )
+        self.index_path = os.path.join(self.root, INDEX_FILE_NAME)
+        self._index = None
+        self._versions = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def index(self) -> dict:
+        """
+        The cache entries by key, loaded on first use.
+        """
+        if self._index is None:
+            self._index = {}
+            if os.path.exists(self.index_path):
+                try:
+                    with open(self.index_path, encoding="utf-8") as f:
+                        self._index = json.load(f)["entries"]
+                except (OSError, ValueError, KeyError) as e:
+                    logging.warning(f"Ignoring unreadable training cache index: {e}")
+        return self._index
+
+    def make_key(self, kind: str, estimator, params: dict = None, **parts) -> str:
+        """
+        Build the key of a result of an estimator.
+
+        Args:
+            kind (str): The kind of entry (e.g. FOLD_SCORE or MODEL).
+            estimator: The unfitted estimator.
+            params (dict): Parameters set on the estimator for this result.
+            **parts: Everything else the result depends on (data digests,
+                folds, search settings, ...), as JSON-serializable values.
+
+        Returns:
+            str: The hexadecimal SHA-256 key.
+        """
+        model_params = {**estimator.get_params(deep=False), **(params or {})}
+        # Thread counts change how fast a model trains, not the model
+        model_params.pop(thread_parameter(estimator), None)
+        module = type(estimator).__module__.partition(".")[0]
+        if module not in self._versions:
+            self._versions[module] = library_versions({module, "numpy", "sklearn"})
+        payload = {
+            "kind": kind,
+            "model_class": type(estimator).__name__,
+            "params": model_params,
+            "versions": self._versions[module],
+            **parts,
+        }
+        encoded = json.dumps(payload, sort_keys=True, default=_json_default)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def search_key(
+        self,
+        estimator,
+        param_grid: dict,
+        search_config,
+        early_stopping,
+        data: str,
+        cv: int,
+    ) -> str:
+        """
+        Build the key of a model's hyperparameter search on the training data
+        with digest `data`.
+        """
+        return self.make_key(
+            SEARCH,
+            estimator,
+            data=data,
+            grid=param_grid,
+            search=search_config.to_dict(),
+            early_stopping=early_stopping.to_dict() if early_stopping else None,
+            cv=cv,
+        )
+
+    def model_key(self, estimator, params: dict, early_stopping, data: str) -> str:
+        """
+        Build the key of a model fitted and scored on the training and test
+        data with digest `data`.
+        """
+        return self.make_key(
+            MODEL,
+            estimator,
+            params,
+            data=data,
+            early_stopping=early_stopping.to_dict() if early_stopping else None,
+        )
+
+    def object_path(self, key: str) -> str:
+        return os.path.join(self.root, "objects", key[:2], f"{key}.pkl")
+
+    def get(self, key: str):
+        """
+        Returns the cached value of a key, or None.
+        """
+        entry = self.index.get(key)
+        if entry is not None and "value" not in entry:
+            path = self.object_path(key)
+            if os.path.exists(path):
+                value = load_object(path, use_mmap=False)
+            else:
+                self.index.pop(key)
+                entry = None
+        elif entry is not None:
+            value = entry["value"]
+
+        if entry is None:
+            self.misses += 1
+            return None
+        entry["last_used"] = time.time()
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value, kind: str, inline: bool = False, **metadata):
+        """
+        Store a value.
+
+        Args:
+            key (str): The key from `make_key`.
+            value: The value to store.
+            kind (str): The kind of entry.
+            inline (bool): Keep the (JSON-serializable) value in the index
+                instead of a file; for small values such as scores.
+            **metadata: Descriptive fields of the entry, listed by `entries`.
+        """
+        now = time.time()
+        entry = {"kind": kind, "created": now, "last_used": now}
+        entry.update(json.loads(json.dumps(metadata, default=_json_default)))
+        if inline:
+            entry["value"] = json.loads(json.dumps(value, default=_json_default))
+            entry["size"] = len(json.dumps(entry["value"]))
+        else:
+            path = self.object_path(key)
+            save_object(path, value)
+            entry["size"] = os.path.getsize(path)
+        self.index[key] = entry
+        self._evict()
+
+    def put_preprocessor(self, preprocessor_path: str) -> str:
+        """
+        Store a fitted preprocessor file under the digest of its content.
+
+        Returns:
+            str: The preprocessor's key.
+        """
+        key = compute_file_hash(preprocessor_path)
+        if key in self.index and os.path.exists(self.object_path(key)):
+            self.index[key]["last_used"] = time.time()
+            return key
+
+        path = self.object_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        shutil.copyfile(preprocessor_path, temp_path)
+        os.replace(temp_path, path)
+        now = time.time()
+        self.index[key] = {
+            "kind": PREPROCESSOR,
+            "created": now,
+            "last_used": now,
+            "size": os.path.getsize(path),
+        }
+        self._evict()
+        return key
+
+    def annotate(self, key: str, **metadata):
+        """
+        Add descriptive fields to an entry (e.g. the key of a model's preprocessor).
+        """
+        if key in self.index:
+            self.index[key].update(metadata)
+
+    def entries(self, kind: str = None) -> list:
+        """
+        Returns the (key, entry) pairs of a kind, most recently used first.
+        """
+        items = [
+            (key, entry)
+            for key, entry in self.index.items()
+            if kind is None or entry["kind"] == kind
+        ]
+        return sorted(items, key=lambda item: item[1]["last_used"], reverse=True)
+
+    def find(self, prefix: str, kind: str = MODEL) -> str:
+        """
+        Returns the full key of the entry of a kind whose key starts with `prefix`.
+
+        Raises:
+            ValueError: If no entry, or more than one, matches.
+        """
+        matches = [key for key, _ in self.entries(kind) if key.startswith(prefix)]
+        if len(matches) != 1:
+            raise ValueError(
+                f"{'No' if not matches else 'More than one'} cached {kind} "
+                f"matches the key '{prefix}'."
+            )
+        return matches[0]
+
+    def size(self) -> int:
+        return sum(entry["size"] for entry in self.index.values())
+
+    def _evict(self):
+        """
+        Remove the least recently used entries until the cache fits in max_bytes.
+        """
+        total = self.size()
+        for key, entry in reversed(self.entries()):
+            if total <= self.max_bytes:
+                break
+            path = self.object_path(key)
+            if os.path.exists(path):
+                os.remove(path)
+            total -= entry["size"]
+            del self.index[key]
+            self.evictions += 1
+
+    def flush(self):
+        """
+        Write the index, replacing the previous one atomically.
+        """
+        if self._index is None:
+            return
+        try:
+            os.makedirs(self.root, exist_ok=True)
+            temp_path = f"{self.index_path}.{os.getpid()}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump({"entries": self._index}, f)
+            os.replace(temp_path, self.index_path)
+        except OSError as e:
+            raise CustomException(e, sys) from e
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self.index),
+            "bytes": self.size(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
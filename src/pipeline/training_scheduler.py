@@ -0,0 +1,737 @@
+import heapq
+import itertools
+import multiprocessing
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+
+import numpy as np
+from sklearn.base import clone
+from sklearn.metrics import r2_score
+from sklearn.model_selection import KFold, ParameterGrid
+
+from src.exception import CustomException
+from src.logger_manager import LoggerManager
+from src.pipeline.cpu_budget import CpuBudgetManager, limit_threads, set_model_threads
+from src.pipeline.training_cache import (
+    FOLD_SCORE,
+    SEARCH as SEARCH_ENTRY,
+    STAGED_SCORES,
+    hash_arrays,
+    hash_folds,
+)
+from src.services.model_training_service import CV_FOLDS, ModelTrainingService
+from src.utils.early_stopping import split_validation
+from src.utils.search_utils import (
+    build_search,
+    estimate_seconds_saved,
+    sample_candidates,
+    search_staged_parameter,
+    search_summary,
+)
+from src.utils.staged_search import group_candidates, staged_fold_scores
+
+logging = LoggerManager.get_logger(__name__)
+
+# Relative cost of one unit of work (a tree, a boosting round or a fit) per
+# model class, used to start the most expensive tasks first
+MODEL_COST_WEIGHTS = {
+    "LinearRegression": 0.1,
+    "DecisionTreeRegressor": 1.0,
+    "RandomForestRegressor": 1.0,
+    "GradientBoostingRegressor": 1.0,
+    "AdaBoostRegressor": 1.0,
+    "XGBRegressor": 0.5,
+    "CatBoostRegressor": 2.0,
+}
+
+# Parameters that scale the cost of a fit roughly linearly
+COST_PARAMETERS = ("n_estimators", "iterations", "max_depth", "depth")
+
+FOLD = "fold"
+STAGED = "staged"
+REFIT = "refit"
+SEARCH = "search"
+
+# Training data of a worker process, set up by `_init_worker`
+_worker_data = None
+
+
+@dataclass(order=True)
+class _Task:
+    """
+    One node of the task graph: a cross-validation fold of a parameter
+    candidate, a fold of a group of candidates that only differ by their
+    ensemble size (whose `candidate` is then the list of their indices and
+    `stages` the size parameter and the sizes), the refit of a model's
+    winning candidate, or the whole search and refit of a model with a
+    successive halving search or early stopping (whose `params` are then its
+    parameter grid). Tasks are ordered by descending estimated cost.
+    """
+
+    priority: float
+    sequence: int
+    model_name: str = field(compare=False)
+    kind: str = field(compare=False)
+    estimator: object = field(compare=False, repr=False)
+    params: dict = field(compare=False)
+    candidate: int = field(compare=False, default=None)
+    fold: int = field(compare=False, default=None)
+    threads: int = field(compare=False, default=1)
+    search_config: object = field(compare=False, default=None, repr=False)
+    stages: tuple = field(compare=False, default=None)
+    early_stopping: object = field(compare=False, default=None, repr=False)
+    exhaustive_fits: int = field(compare=False, default=0)
+
+
+def _init_worker(train_array, test_array, folds):
+    """
+    Process pool initializer: keep the training data and the folds in the
+    worker, so tasks only carry their estimator and parameters.
+    """
+    global _worker_data
+    _worker_data = (train_array, test_array, folds)
+
+
+def _run_task(task: _Task) -> tuple:
+    """
+    Run one task in a worker process.
+
+    Returns:
+        tuple: The fold's validation R2 (NaN if the fit failed, as in
+            GridSearchCV), the validation R2 of each size of a staged fold,
+            or the refit's training results, and the task's duration in
+            seconds.
+    """
+    start = time.perf_counter()
+    train_array, test_array, folds = _worker_data
+    X_train, y_train = train_array[:, :-1], train_array[:, -1]
+    if task.kind == STAGED:
+        name, sizes = task.stages
+        train_index, validation_index = folds[task.fold]
+        estimator = clone(task.estimator)
+        set_model_threads(estimator, task.threads)
+        with limit_threads(task.threads):
+            scores, _ = staged_fold_scores(
+                estimator,
+                task.params,
+                name,
+                sizes,
+                X_train[train_index],
+                y_train[train_index],
+                X_train[validation_index],
+                y_train[validation_index],
+            )
+        return scores, time.perf_counter() - start
+
+    if task.kind == SEARCH:
+        with limit_threads(task.threads):
+            result = _run_search(task, X_train, y_train, test_array, len(folds))
+        return result, time.perf_counter() - start
+
+    model = clone(task.estimator).set_params(**task.params)
+    if task.kind == REFIT:
+        result = ModelTrainingService.fit_final_model(
+            task.model_name,
+            model,
+            task.threads,
+            X_train,
+            y_train,
+            test_array[:, :-1],
+            test_array[:, -1],
+        )
+        return result, time.perf_counter() - start
+
+    set_model_threads(model, task.threads)
+    train_index, validation_index = folds[task.fold]
+    with limit_threads(task.threads):
+        try:
+            model.fit(X_train[train_index], y_train[train_index])
+            result = r2_score(
+                y_train[validation_index],
+                model.predict(X_train[validation_index]),
+            )
+        except Exception as e:
+            logging.warning(
+                f"{task.model_name} failed to fit with {task.params} "
+                f"on fold {task.fold}: {e}"
+            )
+            result = np.nan
+    return result, time.perf_counter() - start
+
+
+def _run_search(task: _Task, X_train, y_train, test_array, cv: int) -> dict:
+    """
+    Run the search and the refit of a SEARCH task in a single process, as
+    `ModelTrainingService.train_and_validate` does.
+
+    Returns:
+        dict: The refit's training results, with the search summary and the
+            best iteration of an early-stopped model.
+    """
+    start = time.perf_counter()
+    model = clone(task.estimator)
+    X_fit, y_fit, fit_params = X_train, y_train, {}
+    if task.early_stopping:
+        X_fit, y_fit, fit_params = split_validation(
+            model, X_train, y_train, task.early_stopping
+        )
+
+    summary, best_params = ModelTrainingService.empty_search_summary(), {}
+    if task.params:
+        search_model = clone(model)
+        set_model_threads(search_model, task.threads)
+        search = build_search(search_model, task.params, task.search_config, cv, 1)
+        search.fit(X_fit, y_fit, **fit_params)
+        summary = search_summary(
+            search,
+            task.search_config.strategy,
+            task.exhaustive_fits,
+            time.perf_counter() - start,
+        )
+        best_params = search.best_params_
+        model.set_params(**best_params)
+        logging.info(
+            f"Best parameters for {task.model_name}: {search.best_params_} "
+            f"(mean CV R2 {search.best_score_:.4f})."
+        )
+
+    result = ModelTrainingService.fit_final_model(
+        task.model_name,
+        model,
+        task.threads,
+        X_train,
+        y_train,
+        test_array[:, :-1],
+        test_array[:, -1],
+        task.early_stopping,
+    )
+    result["search"] = summary
+    result["best_params"] = best_params
+    return result
+
+
+def estimate_cost(model_class: str, params: dict) -> float:
+    """
+    Estimate the relative cost of fitting a model with the given parameters.
+    """
+    cost = MODEL_COST_WEIGHTS.get(model_class, 1.0)
+    for name in COST_PARAMETERS:
+        value = params.get(name)
+        if isinstance(value, (int, float)) and value > 0:
+            cost *= value
+    return cost
+
+
+class TrainingScheduler:
+    """
+    Trains several models as one task graph on a single shared worker pool.
+
+    Every (model, parameter candidate, cross-validation fold) is one task, so
+    the pool stays busy across model boundaries instead of draining at the
+    end of each model's grid search. Each task runs with the inner threads of
+    its model's CpuSplit, and tasks are only started while the threads in
+    flight fit in the core budget. Ready tasks are started in descending
+    order of estimated cost, so the long fits do not end up at the tail.
+    When the last fold of a model finishes, the refit of its winning
+    candidate on the whole training set becomes ready.
+
+    The candidates, folds and winner selection match the sequential
+    search path (`ModelTrainingService.train_and_validate`), so the results
+    are the same up to the models' own randomness. Grid and random searches
+    are expanded into fold tasks, where the candidates of a staged search
+    (see `StagedSearchCV`) share one task per fold. A successive halving
+    search is one task, as each round depends on the scores of the previous
+    one.
+
+    With the training cache enabled, tasks whose fold scores, search or
+    fitted model are cached are not run: their results come from the cache,
+    and the results of the tasks that do run are added to it.
+    """
+
+    def __init__(self, cpu_budget_manager: CpuBudgetManager = None, cv: int = CV_FOLDS):
+        """
+        Initialize the TrainingScheduler.
+
+        Args:
+            cpu_budget_manager (CpuBudgetManager): The core budget (defaults to
+                the configured one).
+            cv (int): Number of cross-validation folds.
+        """
+        self.model_training_service = ModelTrainingService()
+        self.cpu_budget_manager = (
+            cpu_budget_manager or self.model_training_service.cpu_budget_manager
+        )
+        self.model_training_service.cpu_budget_manager = self.cpu_budget_manager
+        self.cores = self.cpu_budget_manager.total_cores
+        self.cv = cv
+        self.cache = self.model_training_service.training_cache
+        self.cpu_splits = {}
+        self.estimators = {}
+        self.param_grids = {}
+        self.search_configs = {}
+        self.exhaustive_fits = {}
+        self.staged_parameters = {}
+        self.early_stopping = {}
+        self.stats = {}
+        # Digests of the training data, of all the data and of each fold
+        self._digests = None
+
+    def build_tasks(self, model_names: list) -> tuple:
+        """
+        Expand the models into their fold tasks.
+
+        Returns:
+            tuple: The fold tasks, the parameter candidates of each model, and
+                the tasks ready to start: the refits of models without a
+                parameter grid, and the searches of models with a successive
+                halving search or early stopping.
+        """
+        sequence = itertools.count()
+        fold_tasks, grids, refits = [], {}, []
+        for model_name in model_names:
+            estimator, param_grid = self.model_training_service.build_model(
+                model_name
+            )
+            search_config = self.model_training_service.search_config(model_name)
+            self.search_configs[model_name] = search_config
+            self.exhaustive_fits[model_name] = len(ParameterGrid(param_grid)) * self.cv
+            early_stopping, param_grid = self.model_training_service.apply_early_stopping(
+                model_name, estimator, param_grid, search_config
+            )
+            self.early_stopping[model_name] = early_stopping
+            self.estimators[model_name] = estimator
+            self.param_grids[model_name] = param_grid
+            cpu_split = self.model_training_service.plan_cpu(
+                model_name, param_grid, search_config, estimator
+            )
+            self.cpu_splits[model_name] = cpu_split
+            grids[model_name] = []
+            if not param_grid and not early_stopping:
+                refits.append(self._refit_task(next(sequence), model_name, estimator, {}))
+                continue
+
+            # Early-stopped fits need the model's validation split, and halving
+            # rounds depend on each other, so these searches are single tasks
+            if early_stopping or search_config.strategy == "halving":
+                refits.append(
+                    self._search_task(next(sequence), model_name, estimator, param_grid)
+                )
+                continue
+
+            grid = sample_candidates(param_grid, search_config)
+            grids[model_name] = grid
+            model_class = type(estimator).__name__
+            name = search_staged_parameter(estimator, param_grid, search_config)
+            if name:
+                self.staged_parameters[model_name] = name
+                for params, sizes in group_candidates(grid, name):
+                    indices = [index for index, _ in sizes]
+                    stages = (name, [size for _, size in sizes])
+                    cost = estimate_cost(model_class, {**params, name: stages[1][-1]})
+                    for fold in range(self.cv):
+                        fold_tasks.append(
+                            _Task(
+                                -cost,
+                                next(sequence),
+                                model_name,
+                                STAGED,
+                                estimator,
+                                params,
+                                indices,
+                                fold,
+                                cpu_split.inner_threads,
+                                stages=stages,
+                            )
+                        )
+                continue
+            for candidate, params in enumerate(grid):
+                cost = estimate_cost(model_class, params)
+                for fold in range(self.cv):
+                    fold_tasks.append(
+                        _Task(
+                            -cost,
+                            next(sequence),
+                            model_name,
+                            FOLD,
+                            estimator,
+                            params,
+                            candidate,
+                            fold,
+                            cpu_split.inner_threads,
+                        )
+                    )
+        return fold_tasks, grids, refits
+
+    def run(self, model_names: list, train_array, test_array) -> dict:
+        """
+        Train and validate the models.
+
+        Args:
+            model_names (list): Names of the models in the model configuration.
+            train_array (np.ndarray): Training data, with the target in the last column.
+            test_array (np.ndarray): Testing data, with the target in the last column.
+
+        Returns:
+            dict: The training results of each model, as returned by
+                `ModelTrainingService.train_and_validate`.
+        """
+        try:
+            start = time.perf_counter()
+            fold_tasks, grids, ready = self.build_tasks(model_names)
+            folds = list(KFold(n_splits=self.cv).split(train_array[:, :-1]))
+            self._digests = (
+                hash_arrays(train_array[:, :-1], train_array[:, -1]),
+                hash_arrays(
+                    train_array[:, :-1],
+                    train_array[:, -1],
+                    test_array[:, :-1],
+                    test_array[:, -1],
+                ),
+                [hash_folds([fold]) for fold in folds],
+            )
+            sequence = itertools.count(len(ready) + len(fold_tasks))
+
+            # Models whose whole search is cached skip their fold tasks
+            summaries = {}
+            for model_name, grid in grids.items():
+                cached = self._cached_search(model_name) if grid else None
+                if cached is not None:
+                    logging.info(f"Reusing the cached search of {model_name}.")
+                    summaries[model_name] = cached["summary"]
+                    grids[model_name] = []
+                    ready.append(
+                        self._refit_task(
+                            next(sequence),
+                            model_name,
+                            self.estimators[model_name],
+                            cached["best_params"],
+                        )
+                    )
+            fold_tasks = [task for task in fold_tasks if grids[task.model_name]]
+            heapq.heapify(ready)
+            for task in fold_tasks:
+                heapq.heappush(ready, task)
+
+            scores = {
+                model_name: np.full((len(grid), self.cv), np.nan)
+                for model_name, grid in grids.items()
+            }
+            remaining = {
+                model_name: len(grid) * self.cv for model_name, grid in grids.items()
+            }
+            task_count = len(fold_tasks)
+            results, busy_seconds, cached_tasks = {}, 0.0, 0
+            # The best parameters of each model, to describe its cached model
+            chosen = {}
+            fold_seconds = {model_name: [] for model_name in model_names}
+            fit_estimates = {model_name: [] for model_name in model_names}
+            logging.info(
+                f"Scheduling {task_count} fold tasks and {len(model_names)} refits "
+                f"on {self.cores} cores."
+            )
+
+            # A worker per core, for when every task in flight is single-threaded
+            with ProcessPoolExecutor(
+                max_workers=self.cores,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(train_array, test_array, folds),
+            ) as executor:
+                in_flight, free_cores = {}, self.cores
+                while ready or in_flight:
+                    # Start tasks in priority order while their threads fit,
+                    # and finish the cached ones right away
+                    finished = []
+                    while ready and (ready[0].threads <= free_cores or not in_flight):
+                        task = heapq.heappop(ready)
+                        key = self._task_key(task)
+                        value = self.cache.get(key) if key else None
+                        if value is not None:
+                            finished.append((task, key, value, 0.0, True))
+                            continue
+                        in_flight[executor.submit(_run_task, task)] = (task, key)
+                        free_cores -= task.threads
+
+                    if not finished:
+                        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            task, key = in_flight.pop(future)
+                            free_cores += task.threads
+                            result, seconds = future.result()
+                            busy_seconds += seconds * task.threads
+                            finished.append((task, key, result, seconds, False))
+
+                    for task, key, result, seconds, cached in finished:
+                        cached_tasks += cached
+                        if task.kind == SEARCH and task.params and cached:
+                            # Only refit the model with the cached best parameters
+                            summaries[task.model_name] = result["summary"]
+                            chosen[task.model_name] = result["best_params"]
+                            estimator = clone(task.estimator)
+                            estimator.set_params(**result["best_params"])
+                            heapq.heappush(
+                                ready,
+                                self._search_task(
+                                    next(sequence), task.model_name, estimator, {}
+                                ),
+                            )
+                            continue
+                        if task.kind in (REFIT, SEARCH):
+                            results[task.model_name] = self._model_results(
+                                task, key, result, cached, summaries, chosen
+                            )
+                            continue
+
+                        if not cached:
+                            fold_seconds[task.model_name].append(seconds)
+                            if key:
+                                self.cache.put(
+                                    key,
+                                    result,
+                                    STAGED_SCORES if task.kind == STAGED else FOLD_SCORE,
+                                    inline=True,
+                                    model_name=task.model_name,
+                                )
+                        scores[task.model_name][task.candidate, task.fold] = result
+                        if task.kind == STAGED:
+                            # A fresh fit of each size, in proportion to the largest
+                            _, sizes = task.stages
+                            if not cached:
+                                fit_estimates[task.model_name].extend(
+                                    seconds * size / sizes[-1] for size in sizes
+                                )
+                            remaining[task.model_name] -= len(task.candidate)
+                        else:
+                            if not cached:
+                                fit_estimates[task.model_name].append(seconds)
+                            remaining[task.model_name] -= 1
+                        if remaining[task.model_name] == 0:
+                            refit, summary = self._winner_refit(
+                                next(sequence),
+                                task,
+                                grids,
+                                scores,
+                                fold_seconds,
+                                fit_estimates,
+                            )
+                            summaries[task.model_name] = summary
+                            heapq.heappush(ready, refit)
+
+            if self.cache is not None:
+                self.cache.flush()
+            makespan = time.perf_counter() - start
+            self.stats = {
+                "tasks": task_count + len(model_names),
+                "cached_tasks": cached_tasks,
+                "cores": self.cores,
+                "makespan_seconds": makespan,
+                "busy_core_seconds": busy_seconds,
+                "utilization": busy_seconds / (makespan * self.cores),
+            }
+            logging.info(f"Training schedule finished: {self.stats}")
+            return {model_name: results[model_name] for model_name in model_names}
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def _winner_refit(
+        self,
+        sequence: int,
+        task: _Task,
+        grids: dict,
+        scores: dict,
+        fold_seconds: dict,
+        fit_estimates: dict,
+    ) -> tuple:
+        """
+        Pick the candidate with the best mean validation score, as GridSearchCV
+        does (failed candidates rank last, ties go to the first candidate), of
+        a model whose folds are all done, and add its search to the cache.
+
+        Returns:
+            tuple: The refit task of the winner, and the search summary.
+        """
+        model_name = task.model_name
+        mean_scores = scores[model_name].mean(axis=1)
+        best = int(np.argmax(np.nan_to_num(mean_scores, nan=-np.inf)))
+        params = grids[model_name][best]
+        logging.info(
+            f"Best parameters for {model_name}: {params} "
+            f"(mean CV R2 {mean_scores[best]:.4f})."
+        )
+        summary = self._search_summary(model_name, grids, fold_seconds, fit_estimates)
+        if self.cache is not None:
+            self.cache.put(
+                self._search_key(model_name, self.estimators[model_name]),
+                {"best_params": params, "summary": summary},
+                SEARCH_ENTRY,
+                inline=True,
+                model_name=model_name,
+            )
+        refit = self._refit_task(sequence, model_name, task.estimator, params)
+        return refit, summary
+
+    def _model_results(
+        self,
+        task: _Task,
+        key: str,
+        result: dict,
+        cached: bool,
+        summaries: dict,
+        chosen: dict,
+    ) -> dict:
+        """
+        Complete the training results of a refit or search task, as
+        `ModelTrainingService.train_and_validate` returns them, and add a
+        fitted model to the cache.
+        """
+        model_name = task.model_name
+        if task.kind == REFIT:
+            chosen[model_name] = task.params
+        if not cached:
+            if task.kind == SEARCH:
+                summaries.setdefault(model_name, result.pop("search"))
+                best_params = result.pop("best_params")
+                if task.params:
+                    chosen[model_name] = best_params
+            if self.cache is not None:
+                if task.kind == SEARCH and task.params:
+                    self.cache.put(
+                        key,
+                        {"best_params": best_params, "summary": summaries[model_name]},
+                        SEARCH_ENTRY,
+                        inline=True,
+                        model_name=model_name,
+                    )
+                    _, data_digest, _ = self._digests
+                    key = self.cache.model_key(
+                        task.estimator, best_params, task.early_stopping, data_digest
+                    )
+                ModelTrainingService.cache_model(
+                    self.cache, key, result, chosen.get(model_name, {})
+                )
+        result["cpu_split"] = self.cpu_splits[model_name].to_dict()
+        result["search"] = summaries.get(
+            model_name, ModelTrainingService.empty_search_summary()
+        )
+        result["cache_key"] = key
+        result["cached"] = cached
+        return result
+
+    def _search_key(self, model_name: str, estimator) -> str:
+        train_digest, _, _ = self._digests
+        return self.cache.search_key(
+            estimator,
+            self.param_grids[model_name],
+            self.search_configs[model_name],
+            self.early_stopping[model_name],
+            train_digest,
+            self.cv,
+        )
+
+    def _cached_search(self, model_name: str) -> dict:
+        """
+        Returns the cached search of a model, or None.
+        """
+        if self.cache is None:
+            return None
+        return self.cache.get(self._search_key(model_name, self.estimators[model_name]))
+
+    def _task_key(self, task: _Task) -> str:
+        """
+        Returns the cache key of a task's result (None without a cache): the
+        scores of a fold, the search of a search task with a parameter grid,
+        or else the fitted model.
+        """
+        if self.cache is None:
+            return None
+        train_digest, data_digest, fold_digests = self._digests
+        if task.kind == FOLD:
+            return self.cache.make_key(
+                FOLD_SCORE,
+                task.estimator,
+                task.params,
+                data=train_digest,
+                folds=fold_digests[task.fold],
+            )
+        if task.kind == STAGED:
+            return self.cache.make_key(
+                STAGED_SCORES,
+                task.estimator,
+                task.params,
+                data=train_digest,
+                folds=fold_digests[task.fold],
+                stages=task.stages,
+            )
+        if task.kind == SEARCH and task.params:
+            return self._search_key(task.model_name, task.estimator)
+        params = task.params if task.kind == REFIT else {}
+        return self.cache.model_key(
+            task.estimator, params, task.early_stopping, data_digest
+        )
+
+    def _search_summary(
+        self, model_name: str, grids: dict, fold_seconds: dict, fit_estimates: dict
+    ) -> dict:
+        """
+        Summarize the fold tasks of a model's grid or random search, as
+        `search_summary` does for a search run in a single process. The search
+        time is the sum of the fold tasks' durations.
+        """
+        if not grids[model_name]:
+            return ModelTrainingService.empty_search_summary()
+        seconds = fold_seconds[model_name]
+        estimates = fit_estimates[model_name]
+        staged = self.staged_parameters.get(model_name)
+        return {
+            "search_strategy": self.search_configs[model_name].strategy,
+            "staged_parameter": staged,
+            "n_fits": len(seconds),
+            "search_seconds": sum(seconds),
+            "search_seconds_saved": estimate_seconds_saved(
+                self.exhaustive_fits[model_name],
+                len(seconds),
+                # Fits of cached folds were not run, nor saved any time
+                float(np.mean(estimates)) if estimates else 0.0,
+                sum(seconds),
+            ),
+        }
+
+    def _search_task(self, sequence: int, model_name: str, estimator, param_grid: dict):
+        model_class = type(estimator).__name__
+        search_config = self.search_configs[model_name]
+        configured = estimator.get_params(deep=False)
+        costs = [
+            estimate_cost(model_class, {**configured, **params})
+            for params in ParameterGrid(param_grid)
+        ]
+        cost = sum(costs) * self.cv if param_grid else 0.0
+        if search_config.strategy == "halving":
+            # Each halving round keeps 1/factor of the candidates with factor
+            # times the resources, so every round costs about as much as the
+            # full grid with the smallest resources
+            cost /= search_config.factor
+        cost += max(costs)  # The refit
+        threads = self.cpu_splits[model_name].inner_threads
+        return _Task(
+            -cost,
+            sequence,
+            model_name,
+            SEARCH,
+            estimator,
+            param_grid,
+            threads=threads,
+            search_config=search_config,
+            early_stopping=self.early_stopping[model_name],
+            exhaustive_fits=self.exhaustive_fits[model_name],
+        )
+
+    def _refit_task(self, sequence: int, model_name: str, estimator, params: dict):
+        # A refit sees the whole training set: cv / (cv - 1) times a fold's rows
+        cost = estimate_cost(type(estimator).__name__, params)
+        cost *= self.cv / max(self.cv - 1, 1)
+        threads = self.cpu_splits[model_name].inner_threads
+        return _Task(
+            -cost, sequence, model_name, REFIT, estimator, params, threads=threads
+        )
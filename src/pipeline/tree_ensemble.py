@@ -0,0 +1,503 @@
+import json
+import os
+import tempfile
+from typing import List
+
+import numpy as np
+
+from src.logger_manager import LoggerManager
+
+logging = LoggerManager.get_logger(__name__)
+
+# Upper bound of rows x trees traversed at once, to bound the working memory
+MAX_TRAVERSAL_ELEMENTS = 1 << 20
+
+AGGREGATIONS = ("sum", "mean", "weighted_median")
+
+
+class TreeEnsemble:
+    """
+    Array-backed inference engine for fitted tree ensembles.
+
+    Every tree of the ensemble is flattened into one set of contiguous arrays
+    (struct of arrays) indexed by node: split feature, threshold, left and
+    right children, the child taken by missing values, and the leaf value.
+    A sample goes left when `x <= threshold`. Leaves point to themselves, so
+    a batch of samples is traversed through all trees at once with a fixed
+    number of vectorized gather steps, one per tree level.
+
+    Supported models: sklearn DecisionTreeRegressor, RandomForestRegressor,
+    ExtraTreesRegressor, GradientBoostingRegressor and AdaBoostRegressor,
+    XGBoost XGBRegressor (gbtree booster) and CatBoost CatBoostRegressor
+    (oblivious trees with float features).
+    """
+
+    def __init__(
+        self,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        left: np.ndarray,
+        right: np.ndarray,
+        default_left: np.ndarray,
+        value: np.ndarray,
+        roots: np.ndarray,
+        max_depth: int,
+        n_features: int,
+        aggregation: str = "sum",
+        tree_weights: np.ndarray = None,
+        base_score: float = 0.0,
+        dtype=np.float64,
+    ):
+        """
+        Initialize the TreeEnsemble.
+
+        Args:
+            feature (np.ndarray): Split feature per node (0 for leaves).
+            threshold (np.ndarray): Split threshold per node (+inf for leaves).
+            left (np.ndarray): Left child per node (the node itself for leaves).
+            right (np.ndarray): Right child per node (the node itself for leaves).
+            default_left (np.ndarray): Whether missing values go left, per node.
+            value (np.ndarray): Leaf value per node.
+            roots (np.ndarray): Root node of each tree.
+            max_depth (int): Depth of the deepest tree.
+            n_features (int): Number of input features.
+            aggregation (str): How tree outputs are combined: `sum`, `mean` or `weighted_median`.
+            tree_weights (np.ndarray): Per-tree multiplier for `sum`, or median weights.
+            base_score (float): Constant added to the aggregated output.
+            dtype: Floating point type the library accumulates predictions in.
+        """
+        if aggregation not in AGGREGATIONS:
+            raise ValueError(f"Unsupported aggregation: {aggregation}")
+
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.default_left = default_left
+        self.value = value
+        self.roots = roots
+        self.max_depth = max_depth
+        self.n_features = n_features
+        self.aggregation = aggregation
+        self.tree_weights = (
+            np.ones(len(roots)) if tree_weights is None else np.asarray(tree_weights)
+        )
+        self.base_score = base_score
+        self.dtype = dtype
+        # Children as interleaved (left, right) pairs, so one gather moves every
+        # sample down a level
+        self._children = np.stack([left, right], axis=1).ravel()
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.feature)
+
+    @classmethod
+    def from_trees(cls, trees: List[dict], n_features: int, **kwargs) -> "TreeEnsemble":
+        """
+        Concatenate per-tree node arrays into one ensemble.
+
+        Args:
+            trees (list): One dict per tree with the node arrays `feature`,
+                `threshold`, `left`, `right` (-1 for leaves), `default_left`
+                and `value`, and the tree `depth`.
+            n_features (int): Number of input features.
+            **kwargs: Aggregation options passed to the constructor.
+
+        Returns:
+            TreeEnsemble: The flattened ensemble.
+        """
+        arrays = {key: [] for key in ("feature", "threshold", "left", "right")}
+        arrays.update(default_left=[], value=[])
+        roots = []
+        offset = 0
+
+        for tree in trees:
+            n_nodes = len(tree["feature"])
+            nodes = np.arange(offset, offset + n_nodes, dtype=np.intp)
+            left = np.asarray(tree["left"], dtype=np.intp)
+            right = np.asarray(tree["right"], dtype=np.intp)
+            is_leaf = left < 0
+
+            arrays["feature"].append(
+                np.where(is_leaf, 0, np.asarray(tree["feature"], dtype=np.intp))
+            )
+            arrays["threshold"].append(
+                np.where(is_leaf, np.inf, np.asarray(tree["threshold"], dtype=np.float64))
+            )
+            arrays["left"].append(np.where(is_leaf, nodes, left + offset))
+            arrays["right"].append(np.where(is_leaf, nodes, right + offset))
+            arrays["default_left"].append(
+                np.asarray(tree["default_left"], dtype=bool) | is_leaf
+            )
+            arrays["value"].append(np.asarray(tree["value"], dtype=np.float64))
+            roots.append(offset)
+            offset += n_nodes
+
+        return cls(
+            **{key: np.concatenate(values) for key, values in arrays.items()},
+            roots=np.asarray(roots, dtype=np.intp),
+            max_depth=max(tree["depth"] for tree in trees),
+            n_features=n_features,
+            **kwargs,
+        )
+
+    @staticmethod
+    def is_supported(model) -> bool:
+        """
+        Returns True if the model type can be converted.
+        """
+        return type(model).__name__ in _CONVERTERS
+
+    @classmethod
+    def from_model(cls, model) -> "TreeEnsemble":
+        """
+        Convert a fitted tree ensemble model.
+
+        Args:
+            model: The fitted model.
+
+        Returns:
+            TreeEnsemble: The flattened ensemble.
+
+        Raises:
+            ValueError: If the model type or configuration is not supported.
+        """
+        converter = _CONVERTERS.get(type(model).__name__)
+        if converter is None:
+            raise ValueError(f"Unsupported model type: {type(model).__name__}")
+        return converter(model)
+
+    def apply(self, X: np.ndarray) -> np.ndarray:
+        """
+        Return the leaf node reached by every sample in every tree.
+
+        Args:
+            X (np.ndarray): Input matrix of shape (n_samples, n_features).
+
+        Returns:
+            np.ndarray: Leaf node indices of shape (n_samples, n_trees).
+        """
+        n_samples = X.shape[0]
+        nodes = np.broadcast_to(self.roots, (n_samples, self.n_trees)).copy()
+        # Flat gathers (`take`) are much cheaper than 2-D fancy indexing
+        row_offsets = (np.arange(n_samples) * X.shape[1])[:, None]
+        flat_X = np.ascontiguousarray(X).ravel()
+        has_missing = np.isnan(flat_X).any()
+        for _ in range(self.max_depth):
+            values = flat_X.take(row_offsets + self.feature.take(nodes))
+            go_right = ~(values <= self.threshold.take(nodes))
+            if has_missing:
+                go_right &= ~(np.isnan(values) & self.default_left.take(nodes))
+            next_nodes = self._children.take(2 * nodes + go_right)
+            if np.array_equal(next_nodes, nodes):
+                # Every sample has reached a leaf in every tree
+                break
+            nodes = next_nodes
+        return nodes
+
+    def predict(self, X) -> np.ndarray:
+        """
+        Predict outcomes for a batch of samples.
+
+        Args:
+            X (array-like): Input matrix of shape (n_samples, n_features).
+
+        Returns:
+            np.ndarray: Predicted values.
+        """
+        if hasattr(X, "toarray"):
+            X = X.toarray()
+        # Libraries compare features in single precision
+        X = np.asarray(X, dtype=np.float32).astype(np.float64)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(
+                f"Expected input with {self.n_features} features, got shape {X.shape}."
+            )
+
+        chunk_size = max(1, MAX_TRAVERSAL_ELEMENTS // max(self.n_trees, 1))
+        output = np.empty(X.shape[0], dtype=self.dtype)
+        for start in range(0, X.shape[0], chunk_size):
+            chunk = X[start : start + chunk_size]
+            leaf_values = self.value.take(self.apply(chunk)).astype(self.dtype)
+            output[start : start + len(chunk)] = self._aggregate(leaf_values)
+        return output
+
+    def _sequential_sum(self, leaf_values: np.ndarray, start: float) -> np.ndarray:
+        """
+        Sum tree outputs one tree after the other, starting from `start`,
+        in the same order and precision as the libraries accumulate them.
+        """
+        columns = np.empty(
+            (leaf_values.shape[0], leaf_values.shape[1] + 1), dtype=self.dtype
+        )
+        columns[:, 0] = start
+        columns[:, 1:] = leaf_values
+        return np.cumsum(columns, axis=1, dtype=self.dtype)[:, -1]
+
+    def _aggregate(self, leaf_values: np.ndarray) -> np.ndarray:
+        if self.aggregation == "mean":
+            return self._sequential_sum(leaf_values, 0.0) / self.n_trees
+        if self.aggregation == "sum":
+            weights = self.tree_weights.astype(self.dtype)
+            return self._sequential_sum(leaf_values * weights, self.base_score)
+
+        # Weighted median of the tree outputs, as computed by AdaBoostRegressor
+        rows = np.arange(leaf_values.shape[0])
+        sorted_idx = np.argsort(leaf_values, axis=1)
+        weight_cdf = np.cumsum(self.tree_weights[sorted_idx], axis=1)
+        median_or_above = weight_cdf >= 0.5 * weight_cdf[:, -1][:, None]
+        median_idx = median_or_above.argmax(axis=1)
+        return leaf_values[rows, sorted_idx[rows, median_idx]]
+
+    def verify(self, model, X, rtol: float = 1e-6, atol: float = 1e-6):
+        """
+        Check that the engine matches the native `model.predict`.
+
+        Args:
+            model: The fitted model that was converted.
+            X (array-like): Probe input matrix.
+            rtol (float): Relative tolerance.
+            atol (float): Absolute tolerance.
+
+        Raises:
+            ValueError: If the predictions differ.
+        """
+        expected = np.asarray(model.predict(X), dtype=np.float64).ravel()
+        actual = self.predict(X)
+        if not np.allclose(expected, actual, rtol=rtol, atol=atol):
+            raise ValueError(
+                "Tree ensemble engine output does not match the native model: "
+                f"max difference {np.max(np.abs(expected - actual))}."
+            )
+        logging.info(
+            f"Tree ensemble engine verified ({self.n_trees} trees, {self.n_nodes} nodes)."
+        )
+
+
+def _sklearn_tree(estimator) -> dict:
+    tree = estimator.tree_
+    if tree.n_outputs != 1:
+        raise ValueError("Multi-output trees are not supported.")
+    missing_go_to_left = getattr(tree, "missing_go_to_left", None)
+    return {
+        "feature": tree.feature,
+        "threshold": tree.threshold,
+        "left": tree.children_left,
+        "right": tree.children_right,
+        "default_left": (
+            missing_go_to_left.astype(bool)
+            if missing_go_to_left is not None
+            else np.zeros(tree.node_count, dtype=bool)
+        ),
+        "value": tree.value[:, 0, 0],
+        "depth": tree.max_depth,
+    }
+
+
+def _convert_decision_tree(model) -> TreeEnsemble:
+    return TreeEnsemble.from_trees([_sklearn_tree(model)], model.n_features_in_)
+
+
+def _convert_forest(model) -> TreeEnsemble:
+    return TreeEnsemble.from_trees(
+        [_sklearn_tree(estimator) for estimator in model.estimators_],
+        model.n_features_in_,
+        aggregation="mean",
+    )
+
+
+def _convert_gradient_boosting(model) -> TreeEnsemble:
+    if model.init_ != "zero" and type(model.init_).__name__ != "DummyRegressor":
+        raise ValueError("Only the default or zero init estimator is supported.")
+    base_score = float(
+        model._raw_predict_init(np.zeros((1, model.n_features_in_)))[0, 0]
+    )
+    estimators = model.estimators_[:, 0]
+    return TreeEnsemble.from_trees(
+        [_sklearn_tree(estimator) for estimator in estimators],
+        model.n_features_in_,
+        tree_weights=np.full(len(estimators), model.learning_rate),
+        base_score=base_score,
+    )
+
+
+def _convert_adaboost(model) -> TreeEnsemble:
+    estimators = model.estimators_
+    if not all(hasattr(estimator, "tree_") for estimator in estimators):
+        raise ValueError("Only tree base estimators are supported.")
+    return TreeEnsemble.from_trees(
+        [_sklearn_tree(estimator) for estimator in estimators],
+        model.n_features_in_,
+        aggregation="weighted_median",
+        tree_weights=model.estimator_weights_[: len(estimators)],
+    )
+
+
+def _parse_xgboost_float(value) -> float:
+    # XGBoost 2+ stores scalars as bracketed vectors, e.g. "[6.6E1]"
+    return float(str(value).strip("[]").split(",")[0])
+
+
+def _convert_xgboost(model) -> TreeEnsemble:
+    learner = json.loads(model.get_booster().save_raw("json"))["learner"]
+    booster = learner["gradient_booster"]
+    if booster["name"] != "gbtree":
+        raise ValueError(f"Unsupported XGBoost booster: {booster['name']}")
+    if int(learner["learner_model_param"].get("num_target", 1)) > 1:
+        raise ValueError("Multi-target XGBoost models are not supported.")
+    if not learner["objective"]["name"].startswith("reg:squared"):
+        raise ValueError(
+            f"Unsupported XGBoost objective: {learner['objective']['name']}"
+        )
+
+    trees = booster["model"]["trees"]
+    best_iteration = getattr(model, "best_iteration", None)
+    if best_iteration is not None:
+        # predict() only uses the trees up to the best early stopping iteration
+        trees = trees[: booster["model"]["iteration_indptr"][best_iteration + 1]]
+
+    converted = []
+    for tree in trees:
+        if any(tree.get("split_type", [])):
+            raise ValueError("Categorical XGBoost splits are not supported.")
+        left = np.asarray(tree["left_children"])
+        conditions = np.asarray(tree["split_conditions"], dtype=np.float32)
+        converted.append(
+            {
+                "feature": tree["split_indices"],
+                # XGBoost goes left when x < threshold, in single precision
+                "threshold": np.nextafter(conditions, np.float32(-np.inf)),
+                "left": left,
+                "right": tree["right_children"],
+                "default_left": tree["default_left"],
+                "value": np.where(left < 0, conditions, 0.0),
+                "depth": _tree_depth(left, np.asarray(tree["right_children"])),
+            }
+        )
+
+    n_features = int(learner["learner_model_param"]["num_feature"])
+    return TreeEnsemble.from_trees(
+        converted,
+        n_features,
+        base_score=_parse_xgboost_float(
+            learner["learner_model_param"]["base_score"]
+        ),
+        dtype=np.float32,
+    )
+
+
+def _tree_depth(left: np.ndarray, right: np.ndarray) -> int:
+    max_depth = 0
+    stack = [(0, 0)]
+    while stack:
+        node, depth = stack.pop()
+        max_depth = max(max_depth, depth)
+        if left[node] >= 0:
+            stack.extend([(left[node], depth + 1), (right[node], depth + 1)])
+    return max_depth
+
+
+def _convert_catboost(model) -> TreeEnsemble:
+    # The JSON export is the documented way to read the tree structure
+    fd, path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    try:
+        model.save_model(path, format="json")
+        with open(path, "r", encoding="utf-8") as f:
+            exported = json.load(f)
+    finally:
+        os.remove(path)
+
+    if "oblivious_trees" not in exported:
+        raise ValueError("Only CatBoost models with oblivious trees are supported.")
+    float_features = exported["features_info"].get("float_features", [])
+    flat_index = {
+        feature["feature_index"]: feature["flat_feature_index"]
+        for feature in float_features
+    }
+    nan_left = {
+        feature["feature_index"]: feature.get("nan_value_treatment") != "Max"
+        for feature in float_features
+    }
+    n_features = max(flat_index.values()) + 1 if flat_index else 0
+
+    converted = []
+    for tree in exported["oblivious_trees"]:
+        splits = tree["splits"]
+        if any(split["split_type"] != "FloatFeature" for split in splits):
+            raise ValueError("Only float feature splits are supported.")
+        converted.append(_expand_oblivious_tree(splits, tree["leaf_values"], flat_index, nan_left))
+
+    scale, biases = exported["scale_and_bias"]
+    if len(biases) != 1:
+        raise ValueError("Multi-dimensional CatBoost models are not supported.")
+    return TreeEnsemble.from_trees(
+        converted,
+        n_features,
+        tree_weights=np.full(len(converted), scale),
+        base_score=biases[0],
+    )
+
+
+def _expand_oblivious_tree(splits, leaf_values, flat_index, nan_left) -> dict:
+    """
+    Expand an oblivious tree into a full binary tree.
+
+    Split `d` of an oblivious tree is shared by every node at depth `d` and
+    sets bit `d` of the leaf index when `x > border`.
+    """
+    depth = len(splits)
+    n_nodes = 2 ** (depth + 1) - 1
+    feature = np.zeros(n_nodes, dtype=np.intp)
+    threshold = np.zeros(n_nodes)
+    left = np.full(n_nodes, -1, dtype=np.intp)
+    right = np.full(n_nodes, -1, dtype=np.intp)
+    default_left = np.zeros(n_nodes, dtype=bool)
+    value = np.zeros(n_nodes)
+
+    # Nodes are laid out level by level; node i has children 2i+1 and 2i+2
+    for node in range(2**depth - 1):
+        level = int(np.log2(node + 1))
+        split = splits[level]
+        feature[node] = flat_index[split["float_feature_index"]]
+        threshold[node] = split["border"]
+        left[node] = 2 * node + 1
+        right[node] = 2 * node + 2
+        default_left[node] = nan_left[split["float_feature_index"]]
+
+    first_leaf = 2**depth - 1
+    for leaf in range(2**depth):
+        # The path to the node encodes the leaf index bits, root split first
+        path = leaf
+        leaf_index = 0
+        for level in range(depth):
+            bit = (path >> (depth - 1 - level)) & 1
+            leaf_index |= bit << level
+        value[first_leaf + leaf] = leaf_values[leaf_index]
+
+    return {
+        "feature": feature,
+        "threshold": threshold,
+        "left": left,
+        "right": right,
+        "default_left": default_left,
+        "value": value,
+        "depth": depth,
+    }
+
+
+_CONVERTERS = {
+    "DecisionTreeRegressor": _convert_decision_tree,
+    "ExtraTreeRegressor": _convert_decision_tree,
+    "RandomForestRegressor": _convert_forest,
+    "ExtraTreesRegressor": _convert_forest,
+    "GradientBoostingRegressor": _convert_gradient_boosting,
+    "AdaBoostRegressor": _convert_adaboost,
+    "XGBRegressor": _convert_xgboost,
+    "CatBoostRegressor": _convert_catboost,
+}
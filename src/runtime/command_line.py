@@ -1,6 +1,7 @@
 import argparse
 
 from src.models.command_line_args import CommandLineArgs
+from src.pipeline.cpu_budget import CPU_POLICIES
 from src.utils.yaml_loader import load_supported_model_types
 
 from .logging_argument_parser import LoggingArgumentParser
@@ -12,7 +13,7 @@ class CommandLine:
         """
         Parse command-line arguments and return a CommandLineArgs object.
 
-        Supports subcommands like 'ingest' and 'train'.
+        Supports subcommands like 'ingest', 'train', 'promote', 'score' and 'route'.
         """
         parser = LoggingArgumentParser(description="Frostfire Chart Sifter Application")
 
@@ -69,10 +70,148 @@ class CommandLine:
             action="store_true",
             help="If set, saves the best-performing model after training.",
         )
+        train_parser.add_argument(
+            "--model-version",
+            type=str,
+            default=None,
+            help="With --save-best, registers the best model as a new version in the model registry.",
+        )
+        train_parser.add_argument(
+            "--cpu-budget",
+            type=int,
+            default=None,
+            help="Number of cores shared by the search workers and the model libraries' threads (defaults to TRAINING_CPU_BUDGET or the CPU count).",
+        )
+        train_parser.add_argument(
+            "--cpu-policy",
+            type=str,
+            choices=CPU_POLICIES,
+            default=None,
+            help="Default split of the cores for models without a cpu_policy in the model configuration.",
+        )
+
+        # Subcommand: promote
+        promote_parser = subparsers.add_parser(
+            "promote", help="Save a model of the training cache as the best model."
+        )
+        promote_parser.add_argument(
+            "--config",
+            type=str,
+            required=False,
+            help="Path to the configuration file.",
+        )
+        promote_parser.add_argument(
+            "--debug",
+            action="store_true",
+            help="Enable debug mode during promotion.",
+        )
+        promote_parser.add_argument(
+            "--key",
+            type=str,
+            default=None,
+            help="Key of the cached model to promote, or a unique prefix of it.",
+        )
+        promote_parser.add_argument(
+            "--list",
+            action="store_true",
+            help="If set, lists the cached models instead of promoting one.",
+        )
+        promote_parser.add_argument(
+            "--model-version",
+            type=str,
+            default=None,
+            help="Registers the promoted model as a new version in the model registry.",
+        )
+
+        # Subcommand: score
+        score_parser = subparsers.add_parser(
+            "score", help="Score a CSV or Parquet file with the trained model."
+        )
+        score_parser.add_argument(
+            "--config",
+            type=str,
+            required=False,
+            help="Path to the configuration file for scoring.",
+        )
+        score_parser.add_argument(
+            "--debug",
+            action="store_true",
+            help="Enable debug mode during scoring.",
+        )
+        score_parser.add_argument(
+            "--input",
+            type=str,
+            required=True,
+            help="Path to the input CSV or Parquet file.",
+        )
+        score_parser.add_argument(
+            "--output",
+            type=str,
+            required=True,
+            help="Path to the output CSV file with the predictions.",
+        )
+        score_parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=10000,
+            help="Number of rows scored per chunk.",
+        )
+        score_parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Number of worker processes (defaults to the CPU count, 0 scores in-process).",
+        )
+        score_parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="If set, resumes an interrupted run from its checkpoint.",
+        )
+
+        # Subcommand: route
+        route_parser = subparsers.add_parser(
+            "route", help="Route prediction traffic between registered model versions."
+        )
+        route_parser.add_argument(
+            "--config",
+            type=str,
+            required=False,
+            help="Path to the configuration file.",
+        )
+        route_parser.add_argument(
+            "--debug",
+            action="store_true",
+            help="Enable debug mode during routing.",
+        )
+        route_parser.add_argument(
+            "--default-version",
+            type=str,
+            required=True,
+            help="Model version serving all requests outside the weighted split.",
+        )
+        route_parser.add_argument(
+            "--weight",
+            type=str,
+            nargs="+",
+            default=[],
+            help="Traffic percentages as VERSION=PERCENT, the rest going to the default version (e.g., 'v2=10' for a 10%% canary).",
+        )
 
         # Parse the arguments
         args = parser.parse_args()
 
+        routing_weights = {}
+        if args.command == "route":
+            for item in args.weight:
+                name, _, weight = item.partition("=")
+                try:
+                    routing_weights[name] = float(weight)
+                except ValueError:
+                    parser.error(f"Invalid weight '{item}'; expected VERSION=WEIGHT.")
+
+        if args.command == "promote" and not args.key and not args.list:
+            parser.error("You must specify either --key or --list.")
+
         # ✅ Validation - Ensure either --model-type OR --best-of-all is set, but NOT both
         if args.command == "train":
             if args.model_type and args.best_of_all:
@@ -113,4 +252,18 @@ class CommandLine:
             model_type=args.model_type if hasattr(args, "model_type") else None,
             best_of_all=args.best_of_all if hasattr(args, "best_of_all") else False,
             save_best=args.save_best if hasattr(args, "save_best") else False,
+            model_version=args.model_version if hasattr(args, "model_version") else None,
+            cpu_budget=args.cpu_budget if hasattr(args, "cpu_budget") else None,
+            cpu_policy=args.cpu_policy if hasattr(args, "cpu_policy") else None,
+            input_path=args.input if hasattr(args, "input") else None,
+            output_path=args.output if hasattr(args, "output") else None,
+            chunk_size=args.chunk_size if hasattr(args, "chunk_size") else 10000,
+            workers=args.workers if hasattr(args, "workers") else None,
+            resume=args.resume if hasattr(args, "resume") else False,
+            default_version=(
+                args.default_version if hasattr(args, "default_version") else None
+            ),
+            routing_weights=routing_weights,
+            cache_key=args.key if hasattr(args, "key") else None,
+            list_cache=args.list if hasattr(args, "list") else False,
         )
@@ -0,0 +1,206 @@
+import gc
+import importlib
+import os
+import signal
+import socket
+import sys
+import time
+
+import uvicorn
+
+from src.exception import CustomException
+from src.logger_manager import LoggerManager
+
+logging = LoggerManager.get_logger(__name__)
+
+# Workers that exit sooner than this after starting are restarted with a delay
+MIN_WORKER_UPTIME_SECONDS = 1.0
+RESTART_DELAY_SECONDS = 1.0
+
+
+class PreforkServer:
+    """
+    Pre-forking multi-worker launcher for an ASGI application.
+
+    The parent process imports the application once, which loads the model
+    and preprocessor, then freezes the garbage collector and forks the
+    workers. The workers share the loaded model pages copy-on-write instead
+    of each loading its own copy. All workers accept connections on one
+    socket bound by the parent, which supervises them and restarts any
+    worker that exits.
+    """
+
+    def __init__(
+        self,
+        app_path: str = "predict_rest_api:app",
+        workers: int = None,
+        host: str = "0.0.0.0",
+        port: int = 8008,
+        uds: str = None,
+        pin_cpus: bool = False,
+    ):
+        """
+        Initialize the PreforkServer.
+
+        Args:
+            app_path (str): Import path of the ASGI application, as `module:attribute`.
+            workers (int): Number of worker processes (defaults to the CPU count).
+            host (str): Host to bind to when serving over TCP.
+            port (int): Port to bind to when serving over TCP.
+            uds (str): Unix domain socket path to bind to instead of TCP.
+            pin_cpus (bool): Pin each worker to one CPU core.
+        """
+        self.app_path = app_path
+        self.workers = workers or os.cpu_count() or 1
+        self.host = host
+        self.port = port
+        self.uds = uds
+        self.pin_cpus = pin_cpus
+
+        self.app = None
+        self.socket = None
+        self.restarts = 0
+        self._children = {}  # pid -> (slot, started_at)
+        self._stopping = False
+
+    def run(self):
+        """
+        Load the application, fork the workers and supervise them until a
+        SIGINT or SIGTERM is received.
+        """
+        try:
+            self.app = self._load_app()
+            self._prepare_for_fork()
+            self.socket = self._bind()
+
+            signal.signal(signal.SIGTERM, self._handle_stop)
+            signal.signal(signal.SIGINT, self._handle_stop)
+
+            logging.info(
+                f"Starting {self.workers} workers on {self._address()} "
+                f"(parent pid {os.getpid()})."
+            )
+            for slot in range(self.workers):
+                self._spawn(slot)
+
+            self._supervise()
+        except Exception as e:
+            raise CustomException(e, sys) from e
+        finally:
+            self._stop_children()
+            if self.socket is not None:
+                self.socket.close()
+            if self.uds and os.path.exists(self.uds):
+                os.remove(self.uds)
+            logging.info("Prefork server stopped.")
+
+    def _load_app(self):
+        module_name, _, attribute = self.app_path.partition(":")
+        module = importlib.import_module(module_name)
+        return getattr(module, attribute or "app")
+
+    def _prepare_for_fork(self):
+        """
+        Stop parent threads that must not be inherited and freeze the heap so
+        garbage collection in the workers does not touch the shared pages.
+        """
+        from src.pipeline.pipeline_provider import PipelineProvider
+
+        # Workers restart their own artifact watcher on first use
+        PipelineProvider().stop_watcher()
+
+        gc.collect()
+        gc.freeze()
+
+    def _bind(self) -> socket.socket:
+        if self.uds:
+            if os.path.exists(self.uds):
+                os.remove(self.uds)
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.bind(self.uds)
+            os.chmod(self.uds, 0o666)
+        else:
+            family = socket.AF_INET6 if ":" in self.host else socket.AF_INET
+            sock = socket.socket(family, socket.SOCK_STREAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            sock.bind((self.host, self.port))
+        sock.listen(2048)
+        sock.set_inheritable(True)
+        return sock
+
+    def _address(self) -> str:
+        return f"unix:{self.uds}" if self.uds else f"{self.host}:{self.port}"
+
+    def _spawn(self, slot: int):
+        pid = os.fork()
+        if pid:
+            self._children[pid] = (slot, time.monotonic())
+            return
+
+        # Worker process
+        exit_code = 0
+        try:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            if self.pin_cpus:
+                self._pin_to_cpu(slot)
+            server = uvicorn.Server(uvicorn.Config(self.app, lifespan="on"))
+            server.run(sockets=[self.socket])
+        except BaseException as e:
+            logging.error(f"Worker {os.getpid()} failed: {e}")
+            exit_code = 1
+        finally:
+            os._exit(exit_code)
+
+    def _pin_to_cpu(self, slot: int):
+        if not hasattr(os, "sched_setaffinity"):
+            logging.warning("CPU pinning is not supported on this platform.")
+            return
+        cpus = sorted(os.sched_getaffinity(0))
+        cpu = cpus[slot % len(cpus)]
+        os.sched_setaffinity(0, {cpu})
+        logging.info(f"Worker {os.getpid()} pinned to CPU {cpu}.")
+
+    def _supervise(self):
+        """
+        Wait for workers to exit and restart them until the server is stopped.
+        """
+        while self._children:
+            try:
+                pid, status = os.waitpid(-1, 0)
+            except ChildProcessError:
+                break
+
+            slot, started_at = self._children.pop(pid, (None, None))
+            if slot is None or self._stopping:
+                continue
+
+            logging.warning(
+                f"Worker {pid} exited with status {os.waitstatus_to_exitcode(status)}; "
+                "restarting."
+            )
+            if time.monotonic() - started_at < MIN_WORKER_UPTIME_SECONDS:
+                # Avoid a tight restart loop when workers crash on startup
+                time.sleep(RESTART_DELAY_SECONDS)
+            if not self._stopping:
+                self.restarts += 1
+                self._spawn(slot)
+
+    def _handle_stop(self, signum, frame):
+        logging.info(f"Received signal {signum}; stopping workers.")
+        self._stopping = True
+        for pid in list(self._children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def _stop_children(self):
+        self._stopping = True
+        for pid in list(self._children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+                os.waitpid(pid, 0)
+            except (ProcessLookupError, ChildProcessError):
+                pass
+            self._children.pop(pid, None)
@@ -1,11 +1,12 @@
+from typing import Dict, List, Literal
+
 import pandas as pd
 from pydantic import BaseModel, Field
 
 
 class PredictionInputSchema(BaseModel):
-    gender: str = Field(
+    gender: Literal["male", "female"] = Field(
         ...,
-        pattern="^(male|female)$",
         description="Gender should be 'male' or 'female'.",
     )
     race_ethnicity: str = Field(
@@ -14,14 +15,12 @@ class PredictionInputSchema(BaseModel):
     parental_level_of_education: str = Field(
         ..., description="Parental level of education is required."
     )
-    lunch: str = Field(
+    lunch: Literal["standard", "free/reduced"] = Field(
         ...,
-        pattern="^(standard|free/reduced)$",
         description="Lunch must be 'standard' or 'free/reduced'.",
     )
-    test_preparation_course: str = Field(
+    test_preparation_course: Literal["none", "completed"] = Field(
         ...,
-        pattern="^(none|completed)$",
         description="Test preparation course must be 'none' or 'completed'.",
     )
     reading_score: float = Field(
@@ -36,3 +35,13 @@ class PredictionInputSchema(BaseModel):
         Converts the validated input to a pandas DataFrame.
         """
         return pd.DataFrame([self.model_dump()])
+
+    @classmethod
+    def to_columns(cls, records: List["PredictionInputSchema"]) -> Dict[str, list]:
+        """
+        Converts a list of validated inputs to a mapping of column name to values.
+        """
+        return {
+            field: [getattr(record, field) for record in records]
+            for field in cls.model_fields
+        }
@@ -5,6 +5,7 @@ from dataclasses import dataclass
 import pandas as pd
 from sklearn.model_selection import train_test_split
 
+from src.config.config import Config
 from src.exception import CustomException
 from src.logger_manager import LoggerManager
 from src.models.data_ingestion_config import DataIngestionConfig
@@ -55,10 +56,13 @@ class DataIngestionService:
             df = pd.read_csv(self.ingestion_config.input_data_path)
             logging.info("Read the dataset as a pandas DataFrame.")
 
-            # Ensure the directory for saving artifacts exists
+            # Ensure the directories for saving artifacts exist
             os.makedirs(
                 os.path.dirname(self.ingestion_config.train_data_path), exist_ok=True
             )
+            os.makedirs(
+                os.path.dirname(self.ingestion_config.raw_data_path), exist_ok=True
+            )
 
             # Save the raw dataset
             df.to_csv(self.ingestion_config.raw_data_path, index=False, header=True)
@@ -66,7 +70,9 @@ class DataIngestionService:
 
             # Perform train-test split
             logging.info("Initiating train-test split.")
-            train_set, test_set = train_test_split(df, test_size=test_size)
+            train_set, test_set = train_test_split(
+                df, test_size=test_size, random_state=Config().DATA_SPLIT_SEED
+            )
 
             # Save the train and test datasets
             train_set.to_csv(
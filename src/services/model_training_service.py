@@ -1,34 +1,63 @@
 import logging
 import os
+import time
 import uuid
 from datetime import datetime
 
 import numpy as np
-from catboost import CatBoostRegressor
-from sklearn.ensemble import (
-    AdaBoostRegressor,
-    GradientBoostingRegressor,
-    RandomForestRegressor,
-)
-from sklearn.linear_model import LinearRegression
+from sklearn.base import clone
 from sklearn.metrics import r2_score
-from sklearn.model_selection import GridSearchCV
-from sklearn.tree import DecisionTreeRegressor
-from xgboost import XGBRegressor
+from sklearn.model_selection import ParameterGrid
 
 from src.config.config import Config
 from src.exception import CustomException
 from src.models.model_trainer_config import ModelTrainerConfig
+from src.pipeline.cpu_budget import (
+    CpuBudgetManager,
+    CpuSplit,
+    limit_threads,
+    restore_model_threads,
+    set_model_threads,
+)
+from src.pipeline.training_cache import MODEL, SEARCH, TrainingCache, hash_arrays
+from src.utils.early_stopping import (
+    EarlyStoppingConfig,
+    best_iteration,
+    prepare_early_stopping,
+    refit_estimator,
+    rounds_parameter,
+    split_validation,
+)
 from src.utils.file_utils import save_training_artifacts
-from src.utils.ml_utils import evaluate_models
+from src.utils.ml_utils import evaluate_models, get_model_class
+from src.utils.search_utils import (
+    SearchConfig,
+    build_search,
+    count_candidates,
+    search_summary,
+)
 from src.utils.yaml_loader import load_model_config
 
+# Cross-validation folds of the hyperparameter search
+CV_FOLDS = 3
+
+# Keys of a model configuration entry that are not estimator parameters. The
+# other keys (e.g. CatBoost's `verbose` and `train_dir`) are passed to the
+# estimator's constructor
+MODEL_CONFIG_KEYS = ("type", "params", "search", "early_stopping", "cpu_policy")
+
 
 class ModelTrainingService:
     def __init__(self):
         self.config = Config()
         self.logger = logging.getLogger(__name__)
         self.model_trainer_config = ModelTrainerConfig()
+        self.cpu_budget_manager = CpuBudgetManager(
+            self.config.cpu_budget, self.config.cpu_policy
+        )
+        self.training_cache = (
+            TrainingCache() if self.config.TRAINING_CACHE_ENABLED else None
+        )
         os.makedirs(self.model_trainer_config.catboost_training_dir, exist_ok=True)
 
     def train_and_validate(
@@ -45,28 +74,19 @@ class ModelTrainingService:
                 test_array[:, -1],  # Target for testing
             )
 
-            model_configs = load_model_config()
-            # Initialize models and their parameters
-            models = {}
-            params = {}
-
-            for model_type, model_info in model_configs["models"].items():
-                try:
-                    model_class = model_info[
-                        "type"
-                    ]  # Extract class name (e.g., 'RandomForestRegressor')
-                    model_params = model_info.get("params", {})  # Extract parameters
-
-                    # Dynamically instantiate the model using `eval`
-                    models[model_type] = eval(model_class)(**model_params)
-                    params[model_type] = model_params
-
-                    logging.info(
-                        f"Loaded model: {model_name} with params: {model_params}"
-                    )
-                except Exception as e:
-                    logging.error(f"Failed to initialize model {model_type}: {e}")
-                    raise CustomException(e)
+            model, hyper_params = self.build_model(model_name)
+            search_config = self.search_config(model_name)
+            exhaustive_fits = len(ParameterGrid(hyper_params)) * CV_FOLDS
+            early_stopping, hyper_params = self.apply_early_stopping(
+                model_name, model, hyper_params, search_config
+            )
+            X_fit, y_fit, fit_params = X_train, y_train, {}
+            if early_stopping:
+                X_fit, y_fit, fit_params = split_validation(
+                    model, X_train, y_train, early_stopping
+                )
+            cpu_split = self.plan_cpu(model_name, hyper_params, search_config, model)
+            logging.info(f"CPU split for {model_name}: {cpu_split}")
 
             # Evaluate all models
             logging.info(
@@ -74,45 +94,94 @@ class ModelTrainingService:
             )
             # Log the start of evaluation for the current model
             logging.info(f"Evaluating model: {model_name}")
-            model = models.get(model_name, {})
-            hyper_params = params.get(model_name, {})
-
-            # Perform GridSearchCV if hyperparameters are provided
-            if hyper_params:
-                gs = GridSearchCV(
-                    estimator=model,
-                    param_grid=hyper_params,
-                    cv=3,
-                    scoring="r2",
-                    n_jobs=-1,
-                    verbose=1,
-                )
-                gs.fit(X_train, y_train)
 
-                # Update the model with the best parameters
-                model.set_params(**gs.best_params_)
-
-            # Train the model
-            model.fit(X_train, y_train)
+            cache = self.training_cache
+            if cache is not None:
+                train_digest = hash_arrays(X_train, y_train)
+                data_digest = hash_arrays(X_train, y_train, X_test, y_test)
 
-            # Predictions and scoring
-            y_train_pred = model.predict(X_train)
-            y_test_pred = model.predict(X_test)
+            # Search the hyperparameters if a grid is provided
+            summary, best_params = self.empty_search_summary(), {}
+            if hyper_params:
+                cached_search, search_key = None, None
+                if cache is not None:
+                    search_key = cache.search_key(
+                        model,
+                        hyper_params,
+                        search_config,
+                        early_stopping,
+                        train_digest,
+                        CV_FOLDS,
+                    )
+                    cached_search = cache.get(search_key)
 
-            train_model_score = r2_score(y_train, y_train_pred)
-            test_model_score = r2_score(y_test, y_test_pred)
+                if cached_search is not None:
+                    logging.info(f"Reusing the cached search of {model_name}.")
+                    best_params = cached_search["best_params"]
+                    summary = cached_search["summary"]
+                else:
+                    # The search fits copies of a single-use estimator limited
+                    # to each fit's share of the threads
+                    search_model = clone(model)
+                    set_model_threads(search_model, cpu_split.inner_threads)
+                    gs = build_search(
+                        search_model,
+                        hyper_params,
+                        search_config,
+                        CV_FOLDS,
+                        cpu_split.outer_jobs,
+                    )
+                    start = time.perf_counter()
+                    with limit_threads(cpu_split.inner_threads):
+                        gs.fit(X_fit, y_fit, **fit_params)
+                    summary = search_summary(
+                        gs,
+                        search_config.strategy,
+                        exhaustive_fits,
+                        time.perf_counter() - start,
+                        cpu_split.outer_jobs,
+                    )
+                    best_params = gs.best_params_
+                    if cache is not None:
+                        cache.put(
+                            search_key,
+                            {"best_params": best_params, "summary": summary},
+                            SEARCH,
+                            inline=True,
+                            model_name=model_name,
+                        )
+                logging.info(f"Search summary for {model_name}: {summary}")
 
-            # Log scores for the model
-            logging.info(
-                f"Model: {model_name} | Train R2: {train_model_score:.4f} | Test R2: {test_model_score:.4f}"
-            )
+                # Update the model with the best parameters
+                model.set_params(**best_params)
 
-            train_results = {
-                "model": model,
-                "model_name": model_name,
-                "train_r2": train_model_score,
-                "test_r2": test_model_score,
-            }
+            train_results, model_key = None, None
+            if cache is not None:
+                model_key = cache.model_key(model, {}, early_stopping, data_digest)
+                train_results = cache.get(model_key)
+            cached = train_results is not None
+            if cached:
+                logging.info(f"Reusing the cached {model_name} model {model_key}.")
+            else:
+                # The final fit runs alone, so it may use the whole budget
+                train_results = self.fit_final_model(
+                    model_name,
+                    model,
+                    self.cpu_budget_manager.total_cores,
+                    X_train,
+                    y_train,
+                    X_test,
+                    y_test,
+                    early_stopping,
+                )
+                if cache is not None:
+                    self.cache_model(cache, model_key, train_results, best_params)
+            train_results["cpu_split"] = cpu_split.to_dict()
+            train_results["search"] = summary
+            train_results["cache_key"] = model_key
+            train_results["cached"] = cached
+            if cache is not None:
+                cache.flush()
 
             self.logger.info("Model training completed successfully.")
 
@@ -120,3 +189,255 @@ class ModelTrainingService:
         except Exception as e:
             self.logger.error(f"Error during model training: {e}")
             raise
+
+    def build_model(self, model_name: str) -> tuple:
+        """
+        Create a configured model and return it with its hyperparameter grid.
+        The entry's keys besides `MODEL_CONFIG_KEYS` are fixed constructor
+        parameters.
+
+        Args:
+            model_name (str): Name of the model in the model configuration.
+
+        Returns:
+            tuple: The unfitted model and its parameter grid (empty if there is none).
+        """
+        model_info = load_model_config()["models"][model_name]
+        try:
+            model_class = model_info[
+                "type"
+            ]  # Extract class name (e.g., 'RandomForestRegressor')
+            model_params = model_info.get("params", {})  # Extract parameters
+
+            # Import the model's library only now that the model is needed. The
+            # grid values are set by the search, not passed to the constructor
+            # (e.g. CatBoost cannot be cloned with lists as parameters)
+            fixed_params = {
+                name: value
+                for name, value in model_info.items()
+                if name not in MODEL_CONFIG_KEYS
+            }
+            model = get_model_class(model_class)(**fixed_params)
+
+            logging.info(f"Loaded model: {model_name} with params: {model_params}")
+            return model, model_params
+        except Exception as e:
+            logging.error(f"Failed to initialize model {model_name}: {e}")
+            raise CustomException(e)
+
+    @staticmethod
+    def search_config(model_name: str) -> SearchConfig:
+        """
+        Returns the hyperparameter search of a model, from the `search:` block
+        of its model configuration (the exhaustive grid search if it has none).
+        """
+        search = load_model_config()["models"][model_name].get("search")
+        return SearchConfig.from_dict(search)
+
+    @staticmethod
+    def apply_early_stopping(
+        model_name: str, model, param_grid: dict, search_config: SearchConfig
+    ) -> tuple:
+        """
+        Set up the native early stopping of a model with an `early_stopping:`
+        block in its model configuration. The boosting rounds are then found
+        by each fit instead of being searched.
+
+        Returns:
+            tuple: The EarlyStoppingConfig (None without a block) and the
+                parameter grid left to search.
+
+        Raises:
+            ValueError: If the model has no native early stopping, or its
+                halving search uses the boosting rounds as resource.
+        """
+        values = load_model_config()["models"][model_name].get("early_stopping")
+        early_stopping = EarlyStoppingConfig.from_dict(values)
+        if early_stopping is None:
+            return None, param_grid
+        if (
+            search_config.strategy == "halving"
+            and search_config.resource == rounds_parameter(model)
+        ):
+            raise ValueError(
+                f"{model_name} cannot both stop early and halve over "
+                f"{search_config.resource}."
+            )
+        param_grid = prepare_early_stopping(model, param_grid, early_stopping)
+        logging.info(f"Early stopping for {model_name}: {early_stopping}")
+        return early_stopping, param_grid
+
+    @staticmethod
+    def cache_model(cache: TrainingCache, key: str, train_results: dict, params: dict):
+        """
+        Store a fitted model and its scores in the training cache.
+        """
+        cache.put(
+            key,
+            train_results,
+            MODEL,
+            model_name=train_results["model_name"],
+            model_class=type(train_results["model"]).__name__,
+            params=params,
+            train_r2=train_results["train_r2"],
+            test_r2=train_results["test_r2"],
+        )
+
+    @staticmethod
+    def empty_search_summary() -> dict:
+        """
+        Returns the search summary of a model without a parameter grid.
+        """
+        return {
+            "search_strategy": None,
+            "staged_parameter": None,
+            "n_fits": 0,
+            "search_seconds": 0.0,
+            "search_seconds_saved": 0.0,
+        }
+
+    def plan_cpu(
+        self,
+        model_name: str,
+        param_grid: dict,
+        search_config: SearchConfig = None,
+        estimator=None,
+    ) -> CpuSplit:
+        """
+        Split the core budget for a model, using the `cpu_policy` of its model
+        configuration (a policy name, or explicit `outer_jobs` and
+        `inner_threads`) or the default policy.
+
+        Args:
+            model_name (str): Name of the model in the model configuration.
+            param_grid (dict): The model's parameter grid.
+            search_config (SearchConfig): The model's search (defaults to the grid
+                search), whose first round sets the number of independent fits.
+            estimator: The unfitted model, whose staged search candidates share
+                their fits.
+
+        Returns:
+            CpuSplit: The outer search jobs and the threads per fit.
+        """
+        n_fits = 1
+        if param_grid:
+            search_config = search_config or SearchConfig()
+            n_fits = count_candidates(param_grid, search_config, estimator) * CV_FOLDS
+        policy = load_model_config()["models"][model_name].get("cpu_policy")
+        return self.cpu_budget_manager.split(policy, n_fits)
+
+    @staticmethod
+    def fit_final_model(
+        model_name,
+        model,
+        threads: int,
+        X_train,
+        y_train,
+        X_test,
+        y_test,
+        early_stopping: EarlyStoppingConfig = None,
+    ) -> dict:
+        """
+        Fit and score a copy of the configured model with the given threads,
+        so the model itself is left unchanged, even if the fit fails. The
+        fitted copy then gets its configured thread parameter back (see
+        `restore_model_threads`).
+
+        Returns:
+            dict: The training results, with the early-stopped `best_iteration`
+                (None without early stopping) and the `model_threads` parameter
+                the fitted model keeps.
+        """
+        final_model = clone(model)
+        configured_threads = set_model_threads(final_model, threads)
+        try:
+            with limit_threads(threads):
+                if early_stopping:
+                    train_results = ModelTrainingService.fit_and_score_early_stopped(
+                        model_name,
+                        final_model,
+                        X_train,
+                        y_train,
+                        X_test,
+                        y_test,
+                        early_stopping,
+                    )
+                else:
+                    train_results = ModelTrainingService.fit_and_score(
+                        model_name, final_model, X_train, y_train, X_test, y_test
+                    )
+                    train_results["best_iteration"] = None
+        finally:
+            restore_model_threads(final_model, configured_threads)
+        # An early-stopped model is refit on a copy of its own
+        train_results["model_threads"] = restore_model_threads(
+            train_results["model"], configured_threads
+        )
+        return train_results
+
+    @staticmethod
+    def fit_and_score(model_name, model, X_train, y_train, X_test, y_test) -> dict:
+        """
+        Fit a model on the whole training set and score it on both sets.
+
+        Returns:
+            dict: The fitted model, its name and its train and test R2 scores.
+        """
+        # Train the model
+        model.fit(X_train, y_train)
+
+        # Predictions and scoring
+        y_train_pred = model.predict(X_train)
+        y_test_pred = model.predict(X_test)
+
+        train_model_score = r2_score(y_train, y_train_pred)
+        test_model_score = r2_score(y_test, y_test_pred)
+
+        # Log scores for the model
+        logging.info(
+            f"Model: {model_name} | Train R2: {train_model_score:.4f} | Test R2: {test_model_score:.4f}"
+        )
+
+        return {
+            "model": model,
+            "model_name": model_name,
+            "train_r2": train_model_score,
+            "test_r2": test_model_score,
+        }
+
+    @staticmethod
+    def fit_and_score_early_stopped(
+        model_name,
+        model,
+        X_train,
+        y_train,
+        X_test,
+        y_test,
+        early_stopping: EarlyStoppingConfig,
+    ) -> dict:
+        """
+        Find a model's boosting rounds by early stopping on a validation split
+        of the training set, then refit it on the whole training set for those
+        rounds and score it as `fit_and_score` does.
+
+        Returns:
+            dict: The training results of the refit model, with the rounds it
+                kept as `best_iteration`.
+        """
+        X_fit, y_fit, fit_params = split_validation(
+            model, X_train, y_train, early_stopping
+        )
+        model.fit(X_fit, y_fit, **fit_params)
+        rounds = best_iteration(model)
+        logging.info(f"{model_name} stopped early after {rounds} rounds.")
+
+        train_results = ModelTrainingService.fit_and_score(
+            model_name,
+            refit_estimator(model, rounds),
+            X_train,
+            y_train,
+            X_test,
+            y_test,
+        )
+        train_results["best_iteration"] = rounds
+        return train_results
@@ -0,0 +1,133 @@
+import asyncio
+
+import httpx
+from pydantic import ValidationError
+
+from src.config.config import Config
+from src.logger_manager import LoggerManager
+from src.models.prediction_request import PredictionRequest
+from src.schemas.prediction_input_schema import PredictionInputSchema
+from src.utils.validation_utils import format_validation_errors
+
+logging = LoggerManager.get_logger(__name__)
+
+TRANSPORT_MODES = ("http", "uds", "inprocess")
+
+
+class PredictionTransportService:
+    """
+    Sends prediction requests from the front end to the prediction service.
+
+    Three transport modes are supported:
+    - `http`: a shared keep-alive `httpx.AsyncClient` with timeouts and bounded retries.
+    - `uds`: the same client over a Unix domain socket, for co-located deployments.
+    - `inprocess`: calls the shared PredictPipeline directly, skipping the HTTP hop.
+
+    The client is created once by `start` (from the application lifespan) and
+    reused for every request.
+    """
+
+    def __init__(self, mode: str = None):
+        """
+        Initialize the PredictionTransportService from the configuration.
+
+        Args:
+            mode (str): Transport mode; defaults to `Config().PREDICTION_TRANSPORT`.
+        """
+        self.config = Config()
+        self.mode = mode or self.config.PREDICTION_TRANSPORT
+        if self.mode not in TRANSPORT_MODES:
+            raise ValueError(
+                f"Unsupported prediction transport '{self.mode}'. "
+                f"Supported transports are: {', '.join(TRANSPORT_MODES)}."
+            )
+        self.client = None
+        self.pipeline_provider = None
+
+    async def start(self):
+        """
+        Create the shared HTTP client, or load the pipeline for in-process mode.
+        """
+        if self.mode == "inprocess":
+            # Imported here so that HTTP deployments do not load the model artifacts
+            from src.pipeline.pipeline_provider import PipelineProvider
+
+            self.pipeline_provider = PipelineProvider()
+            await asyncio.to_thread(self.pipeline_provider.get)
+            logging.info("Prediction transport: in-process pipeline.")
+            return
+
+        transport = httpx.AsyncHTTPTransport(
+            retries=self.config.PREDICTION_SERVICE_RETRIES,
+            uds=self.config.PREDICTION_SERVICE_UDS if self.mode == "uds" else None,
+        )
+        self.client = httpx.AsyncClient(
+            transport=transport,
+            timeout=httpx.Timeout(
+                self.config.PREDICTION_SERVICE_TIMEOUT,
+                connect=self.config.PREDICTION_SERVICE_CONNECT_TIMEOUT,
+            ),
+            limits=httpx.Limits(
+                max_connections=self.config.PREDICTION_SERVICE_MAX_CONNECTIONS,
+                max_keepalive_connections=self.config.PREDICTION_SERVICE_MAX_CONNECTIONS,
+            ),
+        )
+        logging.info(
+            f"Prediction transport: {self.mode} to {self.config.PREDICTION_SERVICE_URL}."
+        )
+
+    async def close(self):
+        """
+        Close the shared HTTP client.
+        """
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+    async def predict(self, payload: dict) -> tuple:
+        """
+        Request a prediction for a `{"payload": {"data": {...}}}` request body.
+
+        Args:
+            payload (dict): The prediction request body.
+
+        Returns:
+            tuple: The HTTP status code and the response body. Error details
+            returned by the REST API under `detail` are unwrapped.
+        """
+        if self.mode == "inprocess":
+            return await asyncio.to_thread(self._predict_in_process, payload)
+
+        if self.client is None:
+            raise RuntimeError("Prediction transport has not been started.")
+
+        response = await self.client.post(
+            self.config.PREDICTION_SERVICE_URL, json=payload
+        )
+        response_data = response.json()
+        if isinstance(response_data.get("detail"), dict):
+            response_data = response_data["detail"]
+        return response.status_code, response_data
+
+    def _predict_in_process(self, payload: dict) -> tuple:
+        try:
+            validated_data = PredictionRequest.model_validate(payload).payload.data
+        except ValidationError as e:
+            return 400, {
+                "code": -1,
+                "code_text": "error",
+                "message": "Validation error occurred.",
+                "errors": format_validation_errors(e, loc_prefix=("payload", "data")),
+            }
+
+        # Follow the model routing, like requests without a version header
+        version = self.pipeline_provider.resolve_version()
+        prediction = self.pipeline_provider.get(version).predict(
+            PredictionInputSchema.to_columns([validated_data])
+        )
+        return 200, {
+            "code": 0,
+            "code_text": "ok",
+            "message": "Processed successfully.",
+            "data": {"math_score": float(prediction[0])},
+        }
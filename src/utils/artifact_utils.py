@@ -0,0 +1,241 @@
+import hashlib
+import io
+import json
+import mmap
+import pickle
+import platform
+import struct
+from importlib import metadata
+
+import dill
+
+from src.logger_manager import LoggerManager
+
+logging = LoggerManager.get_logger(__name__)
+
+# File layout:
+#   magic | manifest length (uint64, little endian) | manifest (JSON) | padding
+#   | pickle stream | padding | buffer 0 | padding | buffer 1 | ...
+# Offsets in the manifest are relative to the start of the data section (the
+# pickle stream), which starts on an ALIGNMENT boundary like every buffer.
+ARTIFACT_MAGIC = b"\x93MLARTIFACT\x00"
+ARTIFACT_FORMAT = "ml-artifact"
+SCHEMA_VERSION = 1
+ALIGNMENT = 64
+
+# Buffers smaller than this are kept inside the pickle stream
+OUT_OF_BAND_MIN_BYTES = 64 * 1024
+
+_LENGTH = struct.Struct("<Q")
+
+
+class _RecordingPickler(pickle.Pickler):
+    """
+    Protocol 5 pickler that records the top-level modules of pickled objects,
+    so their library versions can be written to the manifest.
+    """
+
+    def __init__(self, file, buffer_callback):
+        super().__init__(file, protocol=5, buffer_callback=buffer_callback)
+        self.modules = set()
+
+    def reducer_override(self, obj):
+        self.modules.add(type(obj).__module__.partition(".")[0])
+        return NotImplemented
+
+
+def _align(offset: int) -> int:
+    return -offset % ALIGNMENT
+
+
+def _sha256(data) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def library_versions(modules: set) -> dict:
+    """
+    Returns the installed distribution versions of the given top-level modules.
+    """
+    distributions = metadata.packages_distributions()
+    versions = {"python": platform.python_version()}
+    for module in sorted(modules):
+        for distribution in distributions.get(module, []):
+            try:
+                versions[distribution] = metadata.version(distribution)
+            except metadata.PackageNotFoundError:
+                continue
+    return versions
+
+
+def _installed_version(library: str) -> str:
+    if library == "python":
+        return platform.python_version()
+    try:
+        return metadata.version(library)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def is_artifact(file_path: str) -> bool:
+    """
+    Returns True if the file is in the artifact format (rather than a dill pickle).
+    """
+    with open(file_path, "rb") as file_obj:
+        return file_obj.read(len(ARTIFACT_MAGIC)) == ARTIFACT_MAGIC
+
+
+def dump_artifact(obj: object, file_obj) -> dict:
+    """
+    Write an object to a binary file in the artifact format.
+
+    The object is pickled with protocol 5, and contiguous buffers of at least
+    `OUT_OF_BAND_MIN_BYTES` (e.g. large NumPy arrays) are written out of
+    line, aligned, so they can be memory-mapped on load. Objects the standard
+    pickler cannot serialize are pickled in-band with dill.
+
+    Args:
+        obj (object): The object to save.
+        file_obj: A binary file object opened for writing.
+
+    Returns:
+        dict: The manifest written to the file.
+    """
+    buffers = []
+
+    def buffer_callback(buffer):
+        if buffer.raw().nbytes < OUT_OF_BAND_MIN_BYTES:
+            return True
+        buffers.append(buffer)
+        return False
+
+    stream = io.BytesIO()
+    pickler = _RecordingPickler(stream, buffer_callback)
+    try:
+        pickler.dump(obj)
+        pickler_name, payload = "pickle", stream.getbuffer()
+        modules = pickler.modules
+    except Exception:
+        # e.g. lambdas or locally defined classes
+        buffers.clear()
+        pickler_name, payload = "dill", dill.dumps(obj, protocol=5)
+        modules = {type(obj).__module__.partition(".")[0], "dill"}
+
+    offset = len(payload)
+    buffer_entries = []
+    for buffer in buffers:
+        raw = buffer.raw()
+        offset += _align(offset)
+        buffer_entries.append(
+            {"offset": offset, "length": raw.nbytes, "sha256": _sha256(raw)}
+        )
+        offset += raw.nbytes
+
+    manifest = {
+        "format": ARTIFACT_FORMAT,
+        "schema_version": SCHEMA_VERSION,
+        "object_type": f"{type(obj).__module__}.{type(obj).__qualname__}",
+        "pickler": pickler_name,
+        "protocol": 5,
+        "libraries": library_versions(modules),
+        "pickle": {"offset": 0, "length": len(payload), "sha256": _sha256(payload)},
+        "buffers": buffer_entries,
+    }
+
+    header = json.dumps(manifest, separators=(",", ":")).encode("utf-8")
+    file_obj.write(ARTIFACT_MAGIC + _LENGTH.pack(len(header)) + header)
+    position = len(ARTIFACT_MAGIC) + _LENGTH.size + len(header)
+    file_obj.write(b"\0" * _align(position))
+    file_obj.write(payload)
+    written = len(payload)
+    for buffer, entry in zip(buffers, buffer_entries):
+        file_obj.write(b"\0" * (entry["offset"] - written))
+        file_obj.write(buffer.raw())
+        written = entry["offset"] + entry["length"]
+    return manifest
+
+
+def read_manifest(file_path: str) -> dict:
+    """
+    Read the manifest of an artifact without loading the object.
+
+    Raises:
+        ValueError: If the file is not in the artifact format.
+    """
+    with open(file_path, "rb") as file_obj:
+        manifest, _ = _read_header(file_obj.read)
+    return manifest
+
+
+def _read_header(read) -> tuple:
+    if read(len(ARTIFACT_MAGIC)) != ARTIFACT_MAGIC:
+        raise ValueError("Not an artifact file.")
+    (length,) = _LENGTH.unpack(read(_LENGTH.size))
+    manifest = json.loads(read(length))
+    if manifest.get("format") != ARTIFACT_FORMAT:
+        raise ValueError(f"Unknown artifact format: {manifest.get('format')!r}.")
+    if manifest.get("schema_version", 0) > SCHEMA_VERSION:
+        raise ValueError(
+            f"Artifact schema version {manifest['schema_version']} is newer than "
+            f"the supported version {SCHEMA_VERSION}."
+        )
+    position = len(ARTIFACT_MAGIC) + _LENGTH.size + length
+    return manifest, position + _align(position)
+
+
+def load_artifact(file_path: str, use_mmap: bool = True, verify: bool = False):
+    """
+    Load an object saved with `dump_artifact`.
+
+    With `use_mmap`, the file is memory-mapped read-only and the out-of-band
+    buffers are handed to the unpickler without copying: NumPy arrays are
+    backed by the mapping, so they are read-only, loaded lazily and shared
+    with every process that maps the same file. Libraries that copy arrays
+    into their own structures on unpickling (e.g. sklearn trees) still do.
+
+    The checksum of the pickle stream is always verified; the checksums of
+    the buffers only with `verify`, as it reads every page of the file.
+
+    Args:
+        file_path (str): Path of the artifact.
+        use_mmap (bool): Memory-map the buffers instead of reading them.
+        verify (bool): Verify the checksums of the out-of-band buffers.
+
+    Returns:
+        The loaded object.
+
+    Raises:
+        ValueError: If the file is not a valid artifact or a checksum does not match.
+    """
+    with open(file_path, "rb") as file_obj:
+        manifest, data_offset = _read_header(file_obj.read)
+        if use_mmap:
+            data = memoryview(
+                mmap.mmap(file_obj.fileno(), 0, access=mmap.ACCESS_READ)
+            )[data_offset:]
+        else:
+            file_obj.seek(data_offset)
+            data = memoryview(file_obj.read())
+
+    for library, version in manifest["libraries"].items():
+        installed_version = _installed_version(library)
+        if installed_version != version:
+            logging.warning(
+                f"{file_path} was saved with {library} {version}, "
+                f"but {installed_version} is installed."
+            )
+
+    entry = manifest["pickle"]
+    payload = data[entry["offset"] : entry["offset"] + entry["length"]]
+    if _sha256(payload) != entry["sha256"]:
+        raise ValueError(f"Checksum mismatch in the pickle stream of {file_path}.")
+
+    buffers = []
+    for index, entry in enumerate(manifest["buffers"]):
+        buffer = data[entry["offset"] : entry["offset"] + entry["length"]]
+        if verify and _sha256(buffer) != entry["sha256"]:
+            raise ValueError(f"Checksum mismatch in buffer {index} of {file_path}.")
+        buffers.append(buffer)
+
+    if manifest["pickler"] == "dill":
+        return dill.loads(payload)
+    return pickle.loads(payload, buffers=buffers)
@@ -0,0 +1,172 @@
+from dataclasses import asdict, dataclass, fields
+
+from sklearn.model_selection import train_test_split
+
+# Boosting rounds parameter of the estimators with native early stopping:
+# - XGBRegressor: early_stopping_rounds, on an eval_set
+# - CatBoostRegressor: od_type/od_wait, on an eval_set
+# - GradientBoostingRegressor: n_iter_no_change, on its own validation_fraction
+EARLY_STOPPING_PARAMETERS = {
+    "XGBRegressor": "n_estimators",
+    "CatBoostRegressor": "iterations",
+    "GradientBoostingRegressor": "n_estimators",
+}
+
+# Upper bound of the boosting rounds, when the grid does not sweep them
+DEFAULT_MAX_ROUNDS = 1000
+
+
+@dataclass(frozen=True)
+class EarlyStoppingConfig:
+    """
+    The `early_stopping:` block of a model configuration.
+
+    Each fit boosts up to `max_rounds` rounds (defaults to the largest
+    value of the rounds parameter in the grid) and stops when the score on
+    a validation split has not improved for `rounds` rounds. The split is
+    `validation_fraction` of the rows the model is fit on.
+    """
+
+    rounds: int = 10
+    validation_fraction: float = 0.1
+    max_rounds: int = None
+    random_state: int = 0
+
+    @classmethod
+    def from_dict(cls, values: dict = None) -> "EarlyStoppingConfig":
+        """
+        Create an EarlyStoppingConfig from an `early_stopping:` block.
+
+        Returns:
+            EarlyStoppingConfig: The configuration, or None without a block.
+
+        Raises:
+            ValueError: If a key or value is invalid.
+        """
+        if values is None:
+            return None
+        values = dict(values)
+        unknown = set(values) - {field.name for field in fields(cls)}
+        if unknown:
+            raise ValueError(
+                f"Unknown early stopping option(s): {', '.join(sorted(unknown))}."
+            )
+        config = cls(**values)
+        if config.rounds < 1 or not 0 < config.validation_fraction < 1:
+            raise ValueError(
+                "Early stopping needs rounds >= 1 and 0 < validation_fraction < 1."
+            )
+        return config
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def rounds_parameter(estimator) -> str:
+    """
+    Returns the boosting rounds parameter of an estimator.
+
+    Raises:
+        ValueError: If the estimator has no native early stopping.
+    """
+    model_class = type(estimator).__name__
+    if model_class not in EARLY_STOPPING_PARAMETERS:
+        raise ValueError(
+            f"{model_class} does not support early stopping. Supported models "
+            f"are: {', '.join(EARLY_STOPPING_PARAMETERS)}."
+        )
+    return EARLY_STOPPING_PARAMETERS[model_class]
+
+
+def prepare_early_stopping(
+    estimator, param_grid: dict, early_stopping: EarlyStoppingConfig
+) -> dict:
+    """
+    Set an estimator's native early stopping, and remove the boosting
+    rounds from its parameter grid, as the fits now find them.
+
+    Returns:
+        dict: The parameter grid without the boosting rounds.
+    """
+    name = rounds_parameter(estimator)
+    param_grid = dict(param_grid)
+    swept = param_grid.pop(name, None)
+    max_rounds = early_stopping.max_rounds or (max(swept) if swept else DEFAULT_MAX_ROUNDS)
+
+    model_class = type(estimator).__name__
+    if model_class == "XGBRegressor":
+        estimator.set_params(
+            n_estimators=max_rounds, early_stopping_rounds=early_stopping.rounds
+        )
+    elif model_class == "CatBoostRegressor":
+        estimator.set_params(
+            iterations=max_rounds,
+            od_type="Iter",
+            od_wait=early_stopping.rounds,
+            use_best_model=True,
+        )
+    else:
+        estimator.set_params(
+            n_estimators=max_rounds,
+            n_iter_no_change=early_stopping.rounds,
+            validation_fraction=early_stopping.validation_fraction,
+        )
+    return param_grid
+
+
+def split_validation(estimator, X, y, early_stopping: EarlyStoppingConfig) -> tuple:
+    """
+    Carve the validation split of an estimator's early stopping.
+
+    Returns:
+        tuple: The rows to fit on, their targets, and the fit parameters
+            passing the validation split to the library. GradientBoosting
+            carves its own split, so it is fit on all the rows.
+    """
+    if type(estimator).__name__ == "GradientBoostingRegressor":
+        return X, y, {}
+
+    X_fit, X_val, y_fit, y_val = train_test_split(
+        X,
+        y,
+        test_size=early_stopping.validation_fraction,
+        random_state=early_stopping.random_state,
+    )
+    if type(estimator).__name__ == "XGBRegressor":
+        return X_fit, y_fit, {"eval_set": [(X_val, y_val)], "verbose": False}
+    return X_fit, y_fit, {"eval_set": (X_val, y_val)}
+
+
+def refit_estimator(estimator, rounds: int):
+    """
+    Create an unfitted copy of an early-stopped estimator that boosts for the
+    given rounds without early stopping, to refit it on all its rows.
+
+    Returns:
+        The estimator copy.
+    """
+    model_class = type(estimator).__name__
+    if model_class == "XGBRegressor":
+        changes = {"n_estimators": rounds, "early_stopping_rounds": None}
+    elif model_class == "CatBoostRegressor":
+        changes = {"iterations": rounds, "od_type": None, "od_wait": None}
+        changes["use_best_model"] = None
+    else:
+        changes = {"n_estimators": rounds, "n_iter_no_change": None}
+    params = {**estimator.get_params(deep=False), **changes}
+    # Unset parameters are left out, as CatBoost rejects explicit None values
+    return type(estimator)(
+        **{name: value for name, value in params.items() if value is not None}
+    )
+
+
+def best_iteration(model) -> int:
+    """
+    Returns the number of boosting rounds an early-stopped model kept.
+    """
+    model_class = type(model).__name__
+    if model_class == "XGBRegressor":
+        return int(model.best_iteration) + 1
+    if model_class == "CatBoostRegressor":
+        return int(model.get_best_iteration()) + 1
+    return int(model.n_estimators_)
@@ -1,3 +1,4 @@
+import hashlib
 import json
 import os
 import sys
@@ -9,6 +10,7 @@ import pandas as pd
 from src.config.config import Config
 from src.exception import CustomException
 from src.logger_manager import LoggerManager
+from src.utils.artifact_utils import dump_artifact, is_artifact, load_artifact
 
 # Initialize logger
 logging = LoggerManager.get_logger(__name__)
@@ -16,7 +18,13 @@ logging = LoggerManager.get_logger(__name__)
 
 def save_object(file_path: str, obj: object) -> None:
     """
-    Save a Python object to the specified file path using the `dill` library.
+    Save a Python object to the specified file path.
+
+    Objects are written in the memory-mappable artifact format (see
+    `src/utils/artifact_utils.py`), or as dill pickles when
+    `ARTIFACT_SERIALIZATION` is `dill`. The file is replaced atomically, so
+    processes that memory-mapped or are reading the previous file are not
+    affected.
 
     Args:
         file_path (str): The file path where the object will be saved. If directories in the path do not exist, they will be created.
@@ -36,17 +44,44 @@ def save_object(file_path: str, obj: object) -> None:
         # Ensure the directory exists; create it if it doesn't
         os.makedirs(dir_path, exist_ok=True)
 
-        # Open the file in binary write mode and serialize the object using dill
-        with open(file_path, "wb") as file_obj:
-            dill.dump(obj, file_obj)
+        # Serialize the object to a temporary file, then swap it in
+        temp_path = f"{file_path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "wb") as file_obj:
+                if Config().ARTIFACT_SERIALIZATION == "dill":
+                    dill.dump(obj, file_obj)
+                else:
+                    dump_artifact(obj, file_obj)
+            os.replace(temp_path, file_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
 
     except Exception as e:
         # If an error occurs, raise a CustomException with the error details and system information
         raise CustomException(e, sys) from e
 
 
-def load_object(file_path):
+def load_object(file_path: str, use_mmap: bool = True):
+    """
+    Load a Python object saved with `save_object`.
+
+    Artifact-format files are memory-mapped (unless `use_mmap` is False), and
+    legacy dill pickles are still loaded with dill.
+
+    Args:
+        file_path (str): The file path of the saved object.
+        use_mmap (bool): Memory-map the large arrays of artifact-format files.
+
+    Returns:
+        The loaded object.
+
+    Raises:
+        CustomException: If the file cannot be loaded.
+    """
     try:
+        if is_artifact(file_path):
+            return load_artifact(file_path, use_mmap=use_mmap)
         with open(file_path, "rb") as file_obj:
             return dill.load(file_obj)
 
@@ -54,6 +89,47 @@ def load_object(file_path):
         raise CustomException(e, sys) from e
 
 
+def get_file_fingerprint(file_path: str) -> tuple:
+    """
+    Returns a cheap fingerprint of a file based on its modification time and size.
+
+    Args:
+        file_path (str): The path of the file to fingerprint.
+
+    Returns:
+        tuple: `(mtime_ns, size)` of the file, or `None` if the file does not exist.
+    """
+    try:
+        stat = os.stat(file_path)
+        return (stat.st_mtime_ns, stat.st_size)
+    except FileNotFoundError:
+        return None
+
+
+def compute_file_hash(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """
+    Computes the SHA-256 content hash of a file.
+
+    Args:
+        file_path (str): The path of the file to hash.
+        chunk_size (int): Number of bytes read at a time.
+
+    Returns:
+        str: The hexadecimal SHA-256 digest of the file content.
+
+    Raises:
+        CustomException: If the file cannot be read.
+    """
+    try:
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as file_obj:
+            for chunk in iter(lambda: file_obj.read(chunk_size), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+    except Exception as e:
+        raise CustomException(e, sys) from e
+
+
 def save_json(file_path: str, obj: object) -> None:
     """
     Saves a Python object as a JSON file.
@@ -0,0 +1,313 @@
+import threading
+import time
+from bisect import bisect_left
+
+# Upper bounds (in seconds) of the latency histogram buckets
+LATENCY_BUCKETS_SECONDS = [
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+]
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _format_labels(labelnames, labelvalues, extra: str = "") -> str:
+    pairs = [
+        '{}="{}"'.format(
+            name,
+            str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"'),
+        )
+        for name, value in zip(labelnames, labelvalues)
+    ]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    """
+    Base class for a metric family with a fixed set of label names. Each
+    distinct tuple of label values is one series.
+    """
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._series = {}
+
+    def _check_labels(self, labelvalues: tuple):
+        if len(labelvalues) != len(self.labelnames):
+            raise ValueError(
+                f"Metric '{self.name}' expects labels {self.labelnames}, "
+                f"got {len(labelvalues)} values."
+            )
+
+    def render(self) -> str:
+        """
+        Returns the metric family in the Prometheus text exposition format.
+        """
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        with self._lock:
+            series = sorted(self._series.items())
+            lines.extend(self._render_series(series))
+        return "\n".join(lines) + "\n"
+
+    def _render_series(self, series: list) -> list:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labelvalues)} "
+            f"{_format_value(value)}"
+            for labelvalues, value in series
+        ]
+
+
+class Counter(_Metric):
+    """
+    A monotonically increasing count, e.g. requests served.
+    """
+
+    type_name = "counter"
+
+    def inc(self, *labelvalues, amount: float = 1):
+        """
+        Increments the series for the given label values.
+        """
+        self._check_labels(labelvalues)
+        with self._lock:
+            self._series[labelvalues] = self._series.get(labelvalues, 0) + amount
+
+    def value(self, *labelvalues) -> float:
+        with self._lock:
+            return self._series.get(labelvalues, 0)
+
+
+class Gauge(Counter):
+    """
+    A value that goes up and down, e.g. requests in flight.
+    """
+
+    type_name = "gauge"
+
+    def dec(self, *labelvalues, amount: float = 1):
+        """
+        Decrements the series for the given label values.
+        """
+        self.inc(*labelvalues, amount=-amount)
+
+
+class Histogram(_Metric):
+    """
+    A distribution of observed values over fixed buckets, e.g. latencies.
+
+    Observing a value is one bisection and a few additions under a lock, so
+    it is cheap enough for every request.
+    """
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames=(),
+        buckets: list = LATENCY_BUCKETS_SECONDS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = sorted(buckets)
+
+    def observe(self, value: float, *labelvalues):
+        """
+        Records one observation for the given label values.
+        """
+        self._check_labels(labelvalues)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                # [bucket counts..., +Inf count, sum]
+                series = [0] * (len(self.buckets) + 1) + [0.0]
+                self._series[labelvalues] = series
+            series[index] += 1
+            series[-1] += value
+
+    def time(self, *labelvalues) -> "_Timer":
+        """
+        Context manager observing the elapsed time of its block, in seconds.
+        """
+        return _Timer(self, labelvalues)
+
+    def snapshot(self, *labelvalues) -> dict:
+        """
+        Returns the cumulative bucket counts, count and sum of one series.
+        """
+        with self._lock:
+            series = list(self._series.get(labelvalues, []))
+        if not series:
+            return {"buckets": {}, "count": 0, "sum": 0.0}
+        cumulative, total = [], 0
+        for count in series[:-1]:
+            total += count
+            cumulative.append(total)
+        bounds = [_format_value(bound) for bound in self.buckets] + ["+Inf"]
+        return {
+            "buckets": dict(zip(bounds, cumulative)),
+            "count": total,
+            "sum": series[-1],
+        }
+
+    def _render_series(self, series: list) -> list:
+        lines = []
+        bounds = [_format_value(bound) for bound in self.buckets] + ["+Inf"]
+        for labelvalues, counts in series:
+            total = 0
+            for bound, count in zip(bounds, counts[:-1]):
+                total += count
+                labels = _format_labels(self.labelnames, labelvalues, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{labels} {total}")
+            labels = _format_labels(self.labelnames, labelvalues)
+            lines.append(f"{self.name}_sum{labels} {_format_value(counts[-1])}")
+            lines.append(f"{self.name}_count{labels} {total}")
+        return lines
+
+
+class _Timer:
+    """
+    Times a block for `Histogram.time`; lighter than a generator-based
+    context manager on the request path.
+    """
+
+    __slots__ = ("histogram", "labelvalues", "start")
+
+    def __init__(self, histogram: Histogram, labelvalues: tuple):
+        self.histogram = histogram
+        self.labelvalues = labelvalues
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.histogram.observe(time.perf_counter() - self.start, *self.labelvalues)
+
+
+class MetricsRegistry:
+    """
+    A collection of metrics rendered together on a Prometheus `/metrics` endpoint.
+
+    Metrics live in process memory, so each worker process of a multi-worker
+    server exports its own values.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric '{metric.name}' is already registered.")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames=()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames=()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames=(),
+        buckets: list = LATENCY_BUCKETS_SECONDS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """
+        Returns all metrics in the Prometheus text exposition format.
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "".join(metric.render() for metric in metrics)
+
+
+class RequestMetricsMiddleware:
+    """
+    ASGI middleware counting HTTP requests by route and status, tracking the
+    requests in flight and the end-to-end request duration.
+
+    The arrival time is stored as `request.state.received_at`, so endpoints
+    can measure the time spent reading and parsing the request before they
+    were called. Requests answered before routing (e.g. shed by admission
+    control) are reported under `state["endpoint"]`, and requests that match
+    no route as "other" to bound the number of series.
+    """
+
+    def __init__(
+        self,
+        app,
+        requests_total: Counter,
+        requests_in_flight: Gauge,
+        request_duration: Histogram,
+    ):
+        self.app = app
+        self.requests_total = requests_total
+        self.requests_in_flight = requests_in_flight
+        self.request_duration = request_duration
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        scope.setdefault("state", {})["received_at"] = start
+        status = 500
+        self.requests_in_flight.inc()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.requests_in_flight.dec()
+            route = scope.get("route")
+            endpoint = (
+                getattr(route, "path", None)
+                or scope["state"].get("endpoint")
+                or "other"
+            )
+            self.requests_total.inc(endpoint, str(status))
+            self.request_duration.observe(time.perf_counter() - start, endpoint)
@@ -1,3 +1,4 @@
+import importlib
 import sys
 
 from sklearn.metrics import r2_score
@@ -8,6 +9,40 @@ from src.logger_manager import LoggerManager
 
 logging = LoggerManager.get_logger(__name__)
 
+# Model classes that can be named in the model configuration, by module.
+# Their libraries are only imported when a model of that type is created.
+MODEL_CLASSES = {
+    "RandomForestRegressor": "sklearn.ensemble",
+    "GradientBoostingRegressor": "sklearn.ensemble",
+    "AdaBoostRegressor": "sklearn.ensemble",
+    "DecisionTreeRegressor": "sklearn.tree",
+    "LinearRegression": "sklearn.linear_model",
+    "XGBRegressor": "xgboost",
+    "CatBoostRegressor": "catboost",
+}
+
+
+def get_model_class(class_name: str) -> type:
+    """
+    Imports and returns a model class named in the model configuration.
+
+    Args:
+        class_name (str): The class name (e.g., 'RandomForestRegressor').
+
+    Returns:
+        type: The model class.
+
+    Raises:
+        ValueError: If the class is not a supported model class.
+    """
+    module_name = MODEL_CLASSES.get(class_name)
+    if module_name is None:
+        raise ValueError(
+            f"Unsupported model class '{class_name}'. "
+            f"Supported classes are: {', '.join(MODEL_CLASSES)}."
+        )
+    return getattr(importlib.import_module(module_name), class_name)
+
 
 def evaluate_models(X_train, y_train, X_test, y_test, models, param):
     """
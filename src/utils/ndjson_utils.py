@@ -0,0 +1,62 @@
+from typing import AsyncIterator
+
+from starlette.responses import StreamingResponse
+
+
+async def iter_ndjson_lines(
+    byte_stream: AsyncIterator[bytes], max_line_bytes: int = 1024 * 1024
+) -> AsyncIterator[bytes]:
+    """
+    Incrementally split an asynchronous byte stream into NDJSON lines.
+
+    Only the current partial line is buffered, so memory stays flat no
+    matter how large the stream is. Blank lines are skipped.
+
+    Args:
+        byte_stream (AsyncIterator[bytes]): The incoming byte chunks.
+        max_line_bytes (int): Maximum size of a single line.
+
+    Yields:
+        bytes: One non-empty line at a time, without the trailing newline.
+
+    Raises:
+        ValueError: If a line exceeds `max_line_bytes`.
+    """
+    buffer = bytearray()
+    async for chunk in byte_stream:
+        buffer.extend(chunk)
+        start = 0
+        while True:
+            end = buffer.find(b"\n", start)
+            if end < 0:
+                break
+            line = bytes(buffer[start:end]).strip()
+            if line:
+                yield line
+            start = end + 1
+        del buffer[:start]
+
+        if len(buffer) > max_line_bytes:
+            raise ValueError(f"NDJSON line exceeds {max_line_bytes} bytes.")
+
+    line = bytes(buffer).strip()
+    if line:
+        yield line
+
+
+class NDJSONStreamingResponse(StreamingResponse):
+    """
+    Streaming NDJSON response that may consume the request body while streaming.
+
+    Starlette's StreamingResponse listens for client disconnects by reading
+    from the ASGI receive channel, which races with a generator that is still
+    reading the request body. This response only sends, leaving the receive
+    channel to the body reader; a disconnect surfaces as a send error instead.
+    """
+
+    media_type = "application/x-ndjson"
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
@@ -0,0 +1,244 @@
+from dataclasses import asdict, dataclass, fields
+
+import numpy as np
+
+# Successive halving is still experimental in scikit-learn
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import (
+    GridSearchCV,
+    HalvingGridSearchCV,
+    HalvingRandomSearchCV,
+    ParameterGrid,
+    ParameterSampler,
+    RandomizedSearchCV,
+)
+
+from src.utils.staged_search import StagedSearchCV, group_candidates, staged_parameter
+
+# Hyperparameter search strategies of the `search:` block of a model configuration
+SEARCH_STRATEGIES = ("grid", "random", "halving")
+
+# Halving resource meaning the number of training samples (any other resource
+# is an estimator parameter, e.g. n_estimators)
+N_SAMPLES = "n_samples"
+
+
+@dataclass(frozen=True)
+class SearchConfig:
+    """
+    The `search:` block of a model configuration.
+
+    - grid: every candidate of the parameter grid (GridSearchCV).
+    - random: `n_iter` candidates sampled from the grid (RandomizedSearchCV).
+
+    With `staged`, grid and random candidates that only differ by their
+    ensemble size share one fit per fold (StagedSearchCV), when the
+    estimator supports it.
+    - halving: successive halving (HalvingGridSearchCV, or HalvingRandomSearchCV
+      when `n_candidates` is set), where the candidates get `factor` times
+      more of `resource` each round and only the best 1/`factor` go on.
+      When the resource is a parameter of the grid, it is removed from the
+      grid and its largest value is the maximum resource.
+    """
+
+    strategy: str = "grid"
+    n_iter: int = 10
+    staged: bool = True
+    n_candidates: int = None
+    resource: str = N_SAMPLES
+    factor: float = 3
+    min_resources: object = None
+    max_resources: object = None
+    random_state: int = 0
+
+    @classmethod
+    def from_dict(cls, values: dict = None) -> "SearchConfig":
+        """
+        Create a SearchConfig from a `search:` block (None selects the grid search).
+
+        Raises:
+            ValueError: If the strategy or a key is unknown.
+        """
+        values = dict(values or {})
+        unknown = set(values) - {field.name for field in fields(cls)}
+        if unknown:
+            raise ValueError(
+                f"Unknown search option(s): {', '.join(sorted(unknown))}."
+            )
+        config = cls(**values)
+        if config.strategy not in SEARCH_STRATEGIES:
+            raise ValueError(
+                f"Unknown search strategy '{config.strategy}'. "
+                f"Supported strategies are: {', '.join(SEARCH_STRATEGIES)}."
+            )
+        return config
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def sample_candidates(param_grid: dict, search_config: SearchConfig) -> list:
+    """
+    Returns the parameter candidates a grid or random search evaluates, in
+    the order GridSearchCV and RandomizedSearchCV evaluate them.
+    """
+    if search_config.strategy == "random":
+        return list(
+            ParameterSampler(
+                param_grid,
+                n_iter=search_config.n_iter,
+                random_state=search_config.random_state,
+            )
+        )
+    return list(ParameterGrid(param_grid))
+
+
+def search_staged_parameter(estimator, param_grid: dict, search_config: SearchConfig) -> str:
+    """
+    Returns the ensemble size parameter by which the search is staged, or None.
+    """
+    if not search_config.staged or search_config.strategy == "halving":
+        return None
+    return staged_parameter(estimator, sample_candidates(param_grid, search_config))
+
+
+def count_candidates(
+    param_grid: dict, search_config: SearchConfig, estimator=None
+) -> int:
+    """
+    Returns the number of candidates evaluated by the search's first round.
+    Given the estimator, candidates sharing a staged fit count once, so this
+    is the number of independent fits per fold.
+    """
+    if estimator is not None:
+        name = search_staged_parameter(estimator, param_grid, search_config)
+        if name:
+            return len(
+                group_candidates(sample_candidates(param_grid, search_config), name)
+            )
+    if search_config.strategy == "halving":
+        param_grid = {
+            name: values
+            for name, values in param_grid.items()
+            if name != search_config.resource
+        }
+    grid_size = len(ParameterGrid(param_grid))
+    if search_config.strategy == "random":
+        return min(search_config.n_iter, grid_size)
+    if search_config.strategy == "halving" and search_config.n_candidates:
+        return min(search_config.n_candidates, grid_size)
+    return grid_size
+
+
+def build_search(
+    estimator, param_grid: dict, search_config: SearchConfig, cv: int, n_jobs: int
+):
+    """
+    Create the scikit-learn search object selected by a SearchConfig.
+
+    Returns:
+        BaseSearchCV: An unfitted search scored on R2.
+    """
+    name = search_staged_parameter(estimator, param_grid, search_config)
+    if name:
+        candidates = sample_candidates(param_grid, search_config)
+        return StagedSearchCV(estimator, candidates, name, cv, n_jobs)
+
+    common = {"cv": cv, "scoring": "r2", "n_jobs": n_jobs, "verbose": 1}
+    if search_config.strategy == "grid":
+        return GridSearchCV(estimator, param_grid, **common)
+    if search_config.strategy == "random":
+        return RandomizedSearchCV(
+            estimator,
+            param_grid,
+            n_iter=search_config.n_iter,
+            random_state=search_config.random_state,
+            **common,
+        )
+
+    param_grid = dict(param_grid)
+    max_resources = search_config.max_resources
+    resource = search_config.resource
+    if resource != N_SAMPLES and resource in param_grid:
+        # The search sets the resource itself
+        max_resources = max_resources or max(param_grid.pop(resource))
+    halving = {
+        "factor": search_config.factor,
+        "resource": resource,
+        "max_resources": max_resources or "auto",
+        "random_state": search_config.random_state,
+        **common,
+    }
+    if search_config.n_candidates:
+        return HalvingRandomSearchCV(
+            estimator,
+            param_grid,
+            n_candidates=search_config.n_candidates,
+            min_resources=search_config.min_resources or "smallest",
+            **halving,
+        )
+    return HalvingGridSearchCV(
+        estimator,
+        param_grid,
+        min_resources=search_config.min_resources or "exhaust",
+        **halving,
+    )
+
+
+def estimate_seconds_saved(
+    exhaustive_fits: int, n_fits: int, seconds_per_fit: float, search_seconds: float
+) -> float:
+    """
+    Estimate the time saved against an exhaustive grid search, from the mean
+    time of a full fit. A search running every fit saves nothing.
+    """
+    if n_fits >= exhaustive_fits:
+        return 0.0
+    return max(0.0, exhaustive_fits * seconds_per_fit - search_seconds)
+
+
+def search_summary(
+    search,
+    strategy: str,
+    exhaustive_fits: int,
+    search_seconds: float,
+    parallel_jobs: int = 1,
+) -> dict:
+    """
+    Summarize a fitted search for the model report.
+
+    Args:
+        search (BaseSearchCV): The fitted search.
+        strategy (str): The search strategy.
+        exhaustive_fits (int): Fits of the exhaustive grid search.
+        search_seconds (float): Wall-clock duration of the search.
+        parallel_jobs (int): Fits the search ran in parallel.
+
+    Returns:
+        dict: The strategy, the staged parameter, the number of fits, the
+            search time and the estimated time saved against the exhaustive
+            grid search.
+    """
+    results = search.cv_results_
+    if isinstance(search, StagedSearchCV):
+        n_fits, staged = search.n_fits_, search.name
+    else:
+        n_fits, staged = len(results["params"]) * search.n_splits_, None
+    fit_seconds = np.asarray(results["mean_fit_time"]) + np.asarray(
+        results["mean_score_time"]
+    )
+    if "iter" in results:
+        # The last halving round uses the most resources, closest to a full fit
+        fit_seconds = fit_seconds[results["iter"] == np.max(results["iter"])]
+    return {
+        "search_strategy": strategy,
+        "staged_parameter": staged,
+        "n_fits": n_fits,
+        "search_seconds": search_seconds,
+        "search_seconds_saved": estimate_seconds_saved(
+            exhaustive_fits,
+            n_fits,
+            float(np.mean(fit_seconds)) / max(parallel_jobs, 1),
+            search_seconds,
+        ),
+    }
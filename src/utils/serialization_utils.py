@@ -0,0 +1,243 @@
+import json
+import time
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.routing import APIRoute
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+# Alternative names clients use for the same formats
+MEDIA_TYPE_ALIASES = {
+    "application/x-msgpack": MSGPACK_MEDIA_TYPE,
+    "application/vnd.msgpack": MSGPACK_MEDIA_TYPE,
+}
+
+
+def _normalize(media_type: str) -> str:
+    media_type = media_type.split(";", 1)[0].strip().lower()
+    return MEDIA_TYPE_ALIASES.get(media_type, media_type)
+
+
+def is_available(media_type: str) -> bool:
+    """
+    Returns True if the package needed for the media type is installed.
+    """
+    if media_type == MSGPACK_MEDIA_TYPE:
+        return msgpack is not None
+    if media_type == ARROW_MEDIA_TYPE:
+        return pa is not None
+    return media_type == JSON_MEDIA_TYPE
+
+
+def negotiate_media_type(accept: Optional[str], supported: tuple) -> str:
+    """
+    Picks the response media type from an Accept header.
+
+    The supported type with the highest quality wins; ties keep the client's
+    order. Clients that send no Accept header, or accept none of the supported
+    types, get JSON, so existing JSON clients are unaffected.
+
+    Args:
+        accept (str): The Accept header value, or None.
+        supported (tuple): Media types the endpoint can produce, JSON first.
+
+    Returns:
+        str: The chosen media type.
+    """
+    if not accept:
+        return JSON_MEDIA_TYPE
+
+    candidates = []
+    for position, media_range in enumerate(accept.split(",")):
+        media_type, *params = media_range.split(";")
+        quality = 1.0
+        for param in params:
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        media_type = _normalize(media_type)
+        if media_type in ("*/*", "application/*"):
+            media_type = JSON_MEDIA_TYPE
+        if quality > 0 and media_type in supported and is_available(media_type):
+            candidates.append((-quality, position, media_type))
+
+    return min(candidates)[2] if candidates else JSON_MEDIA_TYPE
+
+
+def dumps_json(content) -> bytes:
+    """
+    Serializes plain Python content to compact JSON bytes, with orjson when installed.
+    """
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, separators=(",", ":")).encode("utf-8")
+
+
+def loads_json(body: bytes):
+    """
+    Parses JSON bytes, with orjson when installed.
+    """
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+def encode_content(content, media_type: str) -> bytes:
+    """
+    Serializes plain Python content (dicts, lists, strings and numbers) as
+    JSON or msgpack.
+    """
+    if media_type == MSGPACK_MEDIA_TYPE:
+        return msgpack.packb(content)
+    return dumps_json(content)
+
+
+def encode_arrow_table(columns: Dict[str, list], metadata: dict = None) -> bytes:
+    """
+    Serializes a mapping of column name to values as an Arrow IPC stream.
+
+    Args:
+        columns (dict): Column name to values; types are inferred by Arrow.
+        metadata (dict): Optional string metadata attached to the schema.
+
+    Returns:
+        bytes: The Arrow IPC stream.
+    """
+    table = pa.table(columns)
+    if metadata:
+        table = table.replace_schema_metadata(
+            {key: str(value) for key, value in metadata.items()}
+        )
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def decode_arrow_records(body: bytes) -> List[dict]:
+    """
+    Reads an Arrow IPC stream into a list of records (one dictionary per row).
+    """
+    return pa.ipc.open_stream(body).read_all().to_pylist()
+
+
+def decode_request_body(body: bytes, media_type: str):
+    """
+    Decodes a request body into the content a JSON body would carry.
+
+    An Arrow IPC body is a table of input records, one per row, and decodes
+    to the `{"payload": {"data": [...]}}` envelope of the batch endpoints.
+
+    Args:
+        body (bytes): The raw request body.
+        media_type (str): The normalized media type of the body.
+
+    Returns:
+        The decoded content.
+    """
+    if media_type == MSGPACK_MEDIA_TYPE:
+        return msgpack.unpackb(body)
+    if media_type == ARROW_MEDIA_TYPE:
+        return {"payload": {"data": decode_arrow_records(body)}}
+    return loads_json(body)
+
+
+class _DecodedRequest(Request):
+    """
+    A request whose body has already been read and decoded.
+    """
+
+    def __init__(self, scope, receive, body: bytes, content):
+        super().__init__(scope, receive)
+        self._decoded_body = body
+        self._decoded_content = content
+
+    async def body(self) -> bytes:
+        return self._decoded_body
+
+    async def json(self):
+        return self._decoded_content
+
+
+class NegotiatedRoute(APIRoute):
+    """
+    Route class decoding JSON (with orjson), msgpack and Arrow IPC request
+    bodies before FastAPI validates them against the endpoint's body model.
+
+    Decoded non-JSON bodies are presented to FastAPI as JSON, so the endpoint
+    model validates every format the same way. The time the body was decoded
+    is stamped on `request.state.decoded_at`, separating parsing from model
+    validation in the latency metrics. Bodies of other media types, and routes
+    without a body model, are left untouched.
+    """
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        if self.body_field is None:
+            return handler
+
+        async def negotiated_handler(request: Request):
+            media_type = _normalize(request.headers.get("content-type", ""))
+            if media_type not in (JSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE, ARROW_MEDIA_TYPE):
+                return await handler(request)
+            if not is_available(media_type):
+                raise HTTPException(
+                    status_code=415,
+                    detail=f"Media type '{media_type}' is not supported by this server.",
+                )
+
+            body = await request.body()
+            if not body:
+                return await handler(request)
+            try:
+                content = decode_request_body(body, media_type)
+            except Exception:
+                if media_type == JSON_MEDIA_TYPE:
+                    # Let FastAPI report invalid JSON in its standard format
+                    return await handler(request)
+                raise RequestValidationError(
+                    [
+                        {
+                            "type": "value_error",
+                            "loc": ("body",),
+                            "msg": f"Invalid {media_type} body.",
+                            "input": None,
+                        }
+                    ]
+                )
+
+            scope = request.scope
+            if media_type != JSON_MEDIA_TYPE:
+                headers = [
+                    (name, value)
+                    for name, value in scope["headers"]
+                    if name != b"content-type"
+                ]
+                headers.append((b"content-type", JSON_MEDIA_TYPE.encode("latin-1")))
+                scope = {**scope, "headers": headers}
+            request.state.decoded_at = time.perf_counter()
+            return await handler(_DecodedRequest(scope, request.receive, body, content))
+
+        return negotiated_handler
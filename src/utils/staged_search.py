@@ -0,0 +1,198 @@
+import time
+
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.metrics import r2_score
+from sklearn.model_selection import check_cv
+
+from src.logger_manager import LoggerManager
+
+logging = LoggerManager.get_logger(__name__)
+
+# Ensemble size parameter of the estimators whose smaller ensembles can be
+# scored from a single fit at the largest size:
+# - GradientBoostingRegressor, AdaBoostRegressor: staged_predict
+# - RandomForestRegressor: warm_start, growing the forest size by size
+# - XGBRegressor: predict(iteration_range=...)
+# - CatBoostRegressor: predict(ntree_end=...)
+STAGED_PARAMETERS = {
+    "GradientBoostingRegressor": "n_estimators",
+    "AdaBoostRegressor": "n_estimators",
+    "RandomForestRegressor": "n_estimators",
+    "XGBRegressor": "n_estimators",
+    "CatBoostRegressor": "iterations",
+}
+
+# Parameters that make a smaller ensemble differ from the first trees of a
+# larger one, by class: early stopping, and CatBoost's learning rate, which
+# defaults to a value derived from the number of iterations
+_STAGING_REQUIRES = {
+    "GradientBoostingRegressor": ("n_iter_no_change", None),
+    "XGBRegressor": ("early_stopping_rounds", None),
+}
+
+
+def staged_parameter(estimator, candidates: list) -> str:
+    """
+    Returns the ensemble size parameter by which the candidates can be
+    scored from staged fits, or None if staging does not apply: the estimator
+    has no staged predictions, or the candidates do not sweep its size.
+    """
+    model_class = type(estimator).__name__
+    name = STAGED_PARAMETERS.get(model_class)
+    if name is None or not candidates:
+        return None
+    if any(not isinstance(params.get(name), int) for params in candidates):
+        return None
+    if len({params[name] for params in candidates}) < 2:
+        return None
+
+    for params in candidates:
+        values = {**estimator.get_params(deep=False), **params}
+        if model_class in _STAGING_REQUIRES:
+            parameter, required = _STAGING_REQUIRES[model_class]
+            if values.get(parameter) is not required:
+                return None
+        if model_class == "CatBoostRegressor" and values.get("learning_rate") is None:
+            return None
+    return name
+
+
+def group_candidates(candidates: list, name: str) -> list:
+    """
+    Group the candidates that only differ by their ensemble size.
+
+    Returns:
+        list: (parameters without the size, [(candidate index, size), ...]
+            by increasing size) tuples, in order of first appearance.
+    """
+    groups = {}
+    for index, params in enumerate(candidates):
+        base = {key: value for key, value in params.items() if key != name}
+        key = repr(sorted(base.items()))
+        groups.setdefault(key, (base, []))[1].append((index, params[name]))
+    return [(base, sorted(sizes, key=lambda s: s[1])) for base, sizes in groups.values()]
+
+
+def staged_fold_scores(
+    estimator, params: dict, name: str, sizes: list, X_train, y_train, X_val, y_val
+) -> tuple:
+    """
+    Score every ensemble size of one parameter group on one fold, with a
+    single fit at the largest size.
+
+    Args:
+        estimator: The unfitted estimator.
+        params (dict): The group's parameters, without the ensemble size.
+        name (str): The ensemble size parameter.
+        sizes (list): The ensemble sizes, in increasing order.
+
+    Returns:
+        tuple: The validation R2 of each size (NaN if the fit failed, as in
+            GridSearchCV) and the fit's duration in seconds.
+    """
+    start = time.perf_counter()
+    model = clone(estimator).set_params(**params)
+    model_class = type(model).__name__
+    try:
+        if model_class == "RandomForestRegressor":
+            # Each warm-started fit adds the trees a fresh fit would have grown
+            model.set_params(warm_start=True)
+            predictions = []
+            for size in sizes:
+                model.set_params(n_estimators=size).fit(X_train, y_train)
+                predictions.append(model.predict(X_val))
+        else:
+            model.set_params(**{name: sizes[-1]}).fit(X_train, y_train)
+            if model_class == "XGBRegressor":
+                predictions = [
+                    model.predict(X_val, iteration_range=(0, size)) for size in sizes
+                ]
+            elif model_class == "CatBoostRegressor":
+                predictions = [model.predict(X_val, ntree_end=size) for size in sizes]
+            else:
+                # A fit that stops early (e.g. a perfect AdaBoost fit) has
+                # fewer stages, and larger sizes use every one of them
+                stages = list(model.staged_predict(X_val))
+                predictions = [stages[min(size, len(stages)) - 1] for size in sizes]
+        scores = [r2_score(y_val, prediction) for prediction in predictions]
+    except Exception as e:
+        logging.warning(f"{model_class} failed to fit with {params}: {e}")
+        scores = [np.nan] * len(sizes)
+    return scores, time.perf_counter() - start
+
+
+class StagedSearchCV:
+    """
+    Cross-validated search over candidates that sweep an ensemble size.
+
+    Candidates that only differ by their size share one fit per fold at the
+    largest size, and the smaller sizes are scored from its staged
+    predictions. The scores, the best candidate and the `cv_results_` keys
+    used by the search summary match those of GridSearchCV (or
+    RandomizedSearchCV) over the same candidates. Fit times of the smaller
+    sizes are estimated in proportion to their size.
+    """
+
+    def __init__(self, estimator, candidates: list, name: str, cv=3, n_jobs: int = 1):
+        """
+        Initialize the StagedSearchCV.
+
+        Args:
+            estimator: The unfitted estimator.
+            candidates (list): The parameter candidates, e.g. from `sample_candidates`.
+            name (str): The ensemble size parameter (see `staged_parameter`).
+            cv: Number of folds, or an iterable of (train, validation) indices.
+            n_jobs (int): Number of fold fits run in parallel.
+        """
+        self.estimator = estimator
+        self.candidates = candidates
+        self.name = name
+        self.cv = cv
+        self.n_jobs = n_jobs
+
+    def fit(self, X, y):
+        cv = check_cv(self.cv, y, classifier=False)
+        folds = list(cv.split(X, y))
+        groups = group_candidates(self.candidates, self.name)
+        fold_results = Parallel(n_jobs=self.n_jobs)(
+            delayed(staged_fold_scores)(
+                self.estimator,
+                params,
+                self.name,
+                [size for _, size in sizes],
+                X[train_index],
+                y[train_index],
+                X[validation_index],
+                y[validation_index],
+            )
+            for params, sizes in groups
+            for train_index, validation_index in folds
+        )
+
+        scores = np.full((len(self.candidates), len(folds)), np.nan)
+        fit_times = np.zeros_like(scores)
+        results = iter(fold_results)
+        for _, sizes in groups:
+            largest = sizes[-1][1]
+            for fold in range(len(folds)):
+                fold_scores, seconds = next(results)
+                for (index, size), score in zip(sizes, fold_scores):
+                    scores[index, fold] = score
+                    fit_times[index, fold] = seconds * size / largest
+
+        mean_scores = scores.mean(axis=1)
+        self.n_splits_ = len(folds)
+        self.n_fits_ = len(fold_results)
+        self.best_index_ = int(np.argmax(np.nan_to_num(mean_scores, nan=-np.inf)))
+        self.best_params_ = self.candidates[self.best_index_]
+        self.best_score_ = mean_scores[self.best_index_]
+        self.cv_results_ = {
+            "params": self.candidates,
+            "mean_fit_time": fit_times.mean(axis=1),
+            "mean_score_time": np.zeros(len(self.candidates)),
+            "mean_test_score": mean_scores,
+            **{f"split{fold}_test_score": scores[:, fold] for fold in range(len(folds))},
+        }
+        return self
@@ -0,0 +1,89 @@
+from typing import Annotated, Dict, List, Tuple
+
+from pydantic import TypeAdapter, ValidationError, WrapValidator
+
+from src.schemas.prediction_input_schema import PredictionInputSchema
+
+
+def _capture_errors(value, handler):
+    # Return an invalid record's error in its place, so the others still validate
+    try:
+        return handler(value)
+    except ValidationError as e:
+        return e
+
+
+# Validates a whole list of records in one call, each record exactly once
+_records_adapter = TypeAdapter(
+    List[Annotated[PredictionInputSchema, WrapValidator(_capture_errors)]]
+)
+
+
+def format_validation_errors(
+    error: ValidationError, loc_prefix: tuple = ()
+) -> List[Dict[str, str]]:
+    """
+    Converts a pydantic ValidationError into the `{field, error}` list returned by the API.
+
+    Args:
+        error (ValidationError): The validation error raised by pydantic (or FastAPI's
+            RequestValidationError).
+        loc_prefix (tuple): Leading location of the record inside the validated
+            object, stripped so fields are reported relative to the record. An error
+            on the record itself is reported under the last element of the prefix.
+
+    Returns:
+        list: A list of dictionaries with the failing field and its error message.
+    """
+    formatted = []
+    for err in error.errors():
+        loc = tuple(err["loc"])
+        if loc_prefix and loc[: len(loc_prefix)] == loc_prefix:
+            loc = loc[len(loc_prefix) :] or loc_prefix[-1:]
+        formatted.append({"field": ".".join(map(str, loc)), "error": err["msg"]})
+    return formatted
+
+
+def validate_records(
+    records: list,
+) -> Tuple[List[PredictionInputSchema], List[int], Dict[int, List[Dict[str, str]]]]:
+    """
+    Validates a list of raw records against the PredictionInputSchema.
+
+    The whole list is validated with a single TypeAdapter call, which
+    validates each record once. Invalid records do not stop the validation
+    of the remaining ones; their errors are collected per record index
+    instead.
+
+    Args:
+        records (list): Raw input records (dictionaries).
+
+    Returns:
+        tuple: The validated records, their original indices, and a mapping of
+        record index to its list of validation errors.
+    """
+    validated, valid_indices, errors = [], [], {}
+    for index, result in enumerate(_records_adapter.validate_python(records)):
+        if isinstance(result, ValidationError):
+            errors[index] = format_validation_errors(result)
+        else:
+            validated.append(result)
+            valid_indices.append(index)
+    return validated, valid_indices, errors
+
+
+def validate_columns(
+    records: list,
+) -> Tuple[Dict[str, list], List[int], Dict[int, List[Dict[str, str]]]]:
+    """
+    Validates a list of raw records in bulk and returns the valid ones as columns.
+
+    Args:
+        records (list): Raw input records (dictionaries).
+
+    Returns:
+        tuple: A mapping of column name to the values of the valid records, their
+        original indices, and a mapping of record index to its list of validation errors.
+    """
+    validated, valid_indices, errors = validate_records(records)
+    return PredictionInputSchema.to_columns(validated), valid_indices, errors
@@ -0,0 +1,13 @@
+import pytest
+
+from src.config.config import Config
+
+
+@pytest.fixture(autouse=True)
+def no_training_cache(monkeypatch):
+    """
+    Train without the training cache, so tests do not reuse the results of
+    earlier runs (tests/test_training_cache.py enables it in a temporary
+    directory).
+    """
+    monkeypatch.setattr(Config(), "TRAINING_CACHE_ENABLED", False)
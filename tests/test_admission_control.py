@@ -0,0 +1,125 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.pipeline.admission_control import (
+    AdmissionController,
+    AdmissionMiddleware,
+    AdmissionRejected,
+)
+
+
+def test_admission_queues_and_hands_over_slots():
+    async def run():
+        controller = AdmissionController(max_concurrency=1, max_queue=1)
+        await controller.acquire("/predict")
+        waiting = asyncio.create_task(controller.acquire("/predict"))
+        await asyncio.sleep(0)
+        assert controller.queued == 1
+
+        # The queue is full: the next request is shed immediately
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.acquire("/predict")
+        assert rejected.value.reason == "queue_full"
+
+        controller.release("/predict", 0.01)
+        await waiting
+        assert controller.active == 1
+        assert controller.queued == 0
+        controller.release("/predict", 0.01)
+        return controller
+
+    controller = asyncio.run(run())
+
+    assert controller.active == 0
+    assert controller.admitted == 2
+    assert controller.shed["queue_full"] == 1
+
+
+def test_admission_times_out_in_queue():
+    async def run():
+        controller = AdmissionController(max_concurrency=1, queue_timeout_ms=10)
+        await controller.acquire("/predict")
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.acquire("/predict")
+        assert rejected.value.reason == "queue_timeout"
+        assert controller.queued == 0
+
+    asyncio.run(run())
+
+
+def test_admission_sheds_requests_that_would_miss_their_deadline():
+    async def run():
+        controller = AdmissionController(max_concurrency=4)
+        await controller.acquire("/predict")
+        controller.release("/predict", service_time=0.5)
+
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.acquire("/predict", deadline=time.perf_counter() + 0.1)
+        assert rejected.value.reason == "deadline"
+        await controller.acquire("/predict", deadline=time.perf_counter() + 5)
+
+    asyncio.run(run())
+
+
+def test_admission_middleware_returns_503_with_retry_after():
+    app = FastAPI()
+
+    @app.get("/predict")
+    def predict():
+        return {"ok": True}
+
+    controller = AdmissionController(max_concurrency=1, max_queue=0)
+    app.add_middleware(AdmissionMiddleware, controller=controller, paths=("/predict",))
+    client = TestClient(app)
+
+    assert client.get("/predict").status_code == 200
+
+    # Hold the only slot, as a request in progress would
+    controller.active = 1
+    response = client.get("/predict")
+
+    assert response.status_code == 503
+    assert int(response.headers["retry-after"]) >= 1
+    assert response.json()["detail"]["code_text"] == "error"
+    assert controller.shed["queue_full"] == 1
+
+
+def test_admission_middleware_times_the_queue_wait_apart():
+    observed, seen = [], {}
+
+    class Histogram:
+        def observe(self, seconds, *labels):
+            observed.append((labels, seconds))
+
+    async def app(scope, receive, send):
+        seen.update(scope["state"])
+
+    async def run():
+        controller = AdmissionController(max_concurrency=1)
+        middleware = AdmissionMiddleware(
+            app, controller, ("/predict",), stage_duration=Histogram()
+        )
+        # Arrived while the only slot was taken, which is released 50 ms later
+        controller.active = 1
+        scope = {
+            "type": "http",
+            "path": "/predict",
+            "headers": [],
+            "state": {"received_at": time.perf_counter()},
+        }
+        request = asyncio.ensure_future(middleware(scope, None, None))
+        await asyncio.sleep(0.05)
+        controller.release("/predict", 0.01)
+        await request
+
+    asyncio.run(run())
+
+    # Endpoint stages are timed from the admission, after the queue wait
+    (labels, seconds), = observed
+    assert labels == ("/predict", "queue")
+    assert seconds >= 0.04
+    assert seen["admitted_at"] - seen["received_at"] == pytest.approx(seconds)
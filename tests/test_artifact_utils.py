@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from src.config.config import Config
+from src.exception import CustomException
+from src.utils.artifact_utils import (
+    ALIGNMENT,
+    dump_artifact,
+    is_artifact,
+    load_artifact,
+    read_manifest,
+)
+from src.utils.file_utils import load_object, save_object
+
+
+def test_artifact_round_trip_memory_maps_large_arrays(tmp_path):
+    path = str(tmp_path / "object.pkl")
+    table = np.arange(100_000, dtype=np.float64)
+    model = LinearRegression().fit(np.eye(3), [1.0, 2.0, 3.0])
+    save_object(path, {"table": table, "model": model})
+
+    manifest = read_manifest(path)
+    loaded = load_object(path)
+
+    assert is_artifact(path)
+    assert manifest["schema_version"] == 1
+    assert {"python", "numpy", "scikit-learn"} <= set(manifest["libraries"])
+    assert len(manifest["buffers"]) == 1
+    assert manifest["buffers"][0]["offset"] % ALIGNMENT == 0
+    np.testing.assert_array_equal(loaded["table"], table)
+    # The large array is backed by the read-only mapping, not a private copy
+    assert not loaded["table"].flags.writeable
+    assert loaded["model"].predict(np.eye(3)) == pytest.approx([1.0, 2.0, 3.0])
+
+
+def test_artifact_detects_corruption(tmp_path):
+    path = tmp_path / "object.pkl"
+    with open(path, "wb") as f:
+        dump_artifact({"table": np.ones(100_000)}, f)
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xFF
+    path.write_bytes(bytes(data))
+
+    load_artifact(str(path))
+    with pytest.raises(ValueError):
+        load_artifact(str(path), verify=True)
+
+
+def test_artifact_falls_back_to_dill(tmp_path):
+    path = str(tmp_path / "object.pkl")
+    save_object(path, {"square": lambda x: x * x})
+
+    assert read_manifest(path)["pickler"] == "dill"
+    assert load_object(path)["square"](3) == 9
+
+
+def test_load_object_reads_legacy_dill_pickles(tmp_path, monkeypatch):
+    path = str(tmp_path / "object.pkl")
+    monkeypatch.setattr(Config(), "ARTIFACT_SERIALIZATION", "dill")
+    save_object(path, {"value": 1})
+
+    assert not is_artifact(path)
+    assert load_object(path) == {"value": 1}
+    with pytest.raises(CustomException):
+        load_object(str(tmp_path / "missing.pkl"))
@@ -81,3 +81,54 @@ def test_parse_arguments_no_command(monkeypatch):
 
     with pytest.raises(SystemExit):  # Should exit with error
         CommandLine.parse_arguments()
+
+
+def test_parse_arguments_score(monkeypatch):
+    test_args = [
+        "script_name",
+        "score",
+        "--input",
+        "data.csv",
+        "--output",
+        "predictions.csv",
+        "--chunk-size",
+        "500",
+        "--workers",
+        "2",
+        "--resume",
+    ]
+    monkeypatch.setattr(sys, "argv", test_args)
+
+    args = CommandLine.parse_arguments()
+    assert args.command == "score"
+    assert args.input_path == "data.csv"
+    assert args.output_path == "predictions.csv"
+    assert args.chunk_size == 500
+    assert args.workers == 2
+    assert args.resume is True
+
+
+def test_parse_arguments_score_requires_input(monkeypatch):
+    test_args = ["script_name", "score", "--output", "predictions.csv"]
+    monkeypatch.setattr(sys, "argv", test_args)
+
+    with pytest.raises(SystemExit):
+        CommandLine.parse_arguments()
+
+
+def test_parse_arguments_promote(monkeypatch):
+    test_args = ["script_name", "promote", "--key", "0210c921", "--model-version", "v2"]
+    monkeypatch.setattr(sys, "argv", test_args)
+
+    args = CommandLine.parse_arguments()
+    assert args.command == "promote"
+    assert args.cache_key == "0210c921"
+    assert args.model_version == "v2"
+    assert args.list_cache is False
+
+
+def test_parse_arguments_promote_requires_key_or_list(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["script_name", "promote"])
+
+    with pytest.raises(SystemExit):
+        CommandLine.parse_arguments()
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.compose import ColumnTransformer
+from sklearn.preprocessing import MinMaxScaler
+
+from src.pipeline.compiled_preprocessor import CompiledPreprocessor
+from src.services.data_transformation_service import DataTransformationService
+
+
+@pytest.fixture
+def student_features():
+    df = pd.read_csv("notebook/data/stud.csv")
+    return df.drop(columns=["math_score"])
+
+
+@pytest.fixture
+def fitted_preprocessor(student_features):
+    preprocessor = DataTransformationService().get_data_transformer_object()
+    preprocessor.fit(student_features)
+    return preprocessor
+
+
+def test_compiled_matches_sklearn_on_dataframe(fitted_preprocessor, student_features):
+    compiled = CompiledPreprocessor.compile(fitted_preprocessor)
+    compiled.verify(fitted_preprocessor)
+
+    expected = fitted_preprocessor.transform(student_features)
+    np.testing.assert_array_equal(compiled.transform(student_features), expected)
+
+
+def test_compiled_matches_sklearn_on_records(fitted_preprocessor, student_features):
+    compiled = CompiledPreprocessor.compile(fitted_preprocessor)
+    records = student_features.head(5).to_dict("records")
+
+    expected = fitted_preprocessor.transform(student_features.head(5))
+    np.testing.assert_array_equal(compiled.transform(records), expected)
+
+
+def test_compiled_imputes_missing_values(fitted_preprocessor, student_features):
+    compiled = CompiledPreprocessor.compile(fitted_preprocessor)
+    sample = student_features.head(3).copy()
+    sample.loc[0, "reading_score"] = np.nan
+    sample["gender"] = sample["gender"].astype(object)
+    sample.loc[1, "gender"] = np.nan
+
+    expected = fitted_preprocessor.transform(sample)
+    np.testing.assert_array_equal(compiled.transform(sample), expected)
+
+
+def test_compiled_rejects_unknown_category(fitted_preprocessor, student_features):
+    compiled = CompiledPreprocessor.compile(fitted_preprocessor)
+    records = student_features.head(1).to_dict("records")
+    records[0]["lunch"] = "unknown"
+
+    with pytest.raises(ValueError, match="unknown categories"):
+        compiled.transform(records)
+
+
+def test_compile_rejects_unsupported_steps(student_features):
+    preprocessor = ColumnTransformer(
+        transformers=[("num", MinMaxScaler(), ["reading_score", "writing_score"])]
+    )
+    preprocessor.fit(student_features)
+
+    with pytest.raises(ValueError, match="Unsupported"):
+        CompiledPreprocessor.compile(preprocessor)
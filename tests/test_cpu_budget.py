@@ -0,0 +1,130 @@
+import numpy as np
+import pytest
+from catboost import CatBoostRegressor
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.tree import DecisionTreeRegressor
+from threadpoolctl import threadpool_info
+from xgboost import XGBRegressor
+
+from src.pipeline.cpu_budget import (
+    CpuBudgetManager,
+    limit_threads,
+    restore_model_threads,
+    set_model_threads,
+)
+from src.services import model_training_service
+from src.services.model_training_service import ModelTrainingService
+
+
+@pytest.mark.parametrize(
+    "policy, n_fits, expected",
+    [
+        ("outer", 30, (8, 1)),
+        ("outer", 3, (3, 2)),
+        ("inner", 30, (1, 8)),
+        ("balanced", 30, (3, 2)),
+        ("auto", 30, (8, 1)),
+        ("auto", 1, (1, 8)),
+        ({"outer_jobs": 2, "inner_threads": 16}, 30, (2, 4)),
+    ],
+)
+def test_cpu_split_never_exceeds_the_budget(policy, n_fits, expected):
+    split = CpuBudgetManager(8).split(policy, n_fits)
+
+    assert (split.outer_jobs, split.inner_threads) == expected
+    assert split.outer_jobs * split.inner_threads <= 8
+
+
+def test_cpu_budget_rejects_unknown_policies():
+    with pytest.raises(ValueError, match="Unknown CPU policy"):
+        CpuBudgetManager(8, "greedy")
+    with pytest.raises(ValueError, match="Unknown CPU policy"):
+        CpuBudgetManager(8).split("greedy")
+
+
+@pytest.mark.parametrize(
+    "model, parameter",
+    [
+        (RandomForestRegressor(), "n_jobs"),
+        (XGBRegressor(), "n_jobs"),
+        (CatBoostRegressor(verbose=False, allow_writing_files=False), "thread_count"),
+    ],
+)
+def test_model_threads_are_set_and_restored(model, parameter):
+    configured = model.get_params(deep=False).get(parameter)
+
+    previous = set_model_threads(model, 2)
+    assert model.get_params(deep=False)[parameter] == 2
+
+    assert restore_model_threads(model, previous) == {parameter: configured}
+    assert model.get_params(deep=False).get(parameter) == configured
+    assert set_model_threads(DecisionTreeRegressor(), 2) == {}
+
+    # Restoring the threads of a fitted model must not fail
+    previous = set_model_threads(model, 1)
+    model.fit(np.arange(20.0).reshape(10, 2), np.arange(10.0))
+    kept = 1 if isinstance(model, CatBoostRegressor) else configured
+    assert restore_model_threads(model, previous) == {parameter: kept}
+
+
+def test_final_fit_leaves_the_configured_model_unchanged():
+    X, y = np.arange(40.0).reshape(20, 2), np.arange(20.0)
+    model = RandomForestRegressor(n_estimators=4, n_jobs=3)
+    results = ModelTrainingService.fit_final_model(
+        "Random Forest", model, 2, X, y, X, y
+    )
+    assert results["model"] is not model and results["model_threads"] == {"n_jobs": 3}
+    assert model.n_jobs == 3 and not hasattr(model, "estimators_")
+
+    catboost = CatBoostRegressor(iterations=5, verbose=False, allow_writing_files=False)
+    results = ModelTrainingService.fit_final_model("CatBoost", catboost, 2, X, y, X, y)
+    # A fitted CatBoost model keeps the thread count it was fit with
+    assert results["model_threads"] == {"thread_count": 2}
+    assert "thread_count" not in catboost.get_params()
+
+    # A failed fit leaves the configured model unchanged too
+    with pytest.raises(ValueError):
+        ModelTrainingService.fit_final_model(
+            "Random Forest", model, 2, X, y[:5], X, y
+        )
+    assert model.n_jobs == 3
+
+
+def test_limit_threads_caps_native_thread_pools():
+    np.dot(np.ones((64, 64)), np.ones((64, 64)))  # Load the BLAS thread pool
+
+    with limit_threads(1):
+        assert all(pool["num_threads"] == 1 for pool in threadpool_info())
+
+
+def test_model_cpu_policy_is_read_from_the_model_config(monkeypatch):
+    config = {
+        "models": {
+            "Random Forest": {
+                "type": "RandomForestRegressor",
+                "params": {"n_estimators": [8, 16]},
+                "cpu_policy": "inner",
+            },
+            "Decision Tree": {
+                "type": "DecisionTreeRegressor",
+                "params": {"max_depth": [2, 4]},
+            },
+        }
+    }
+    monkeypatch.setattr(model_training_service, "load_model_config", lambda: config)
+    service = ModelTrainingService()
+    service.cpu_budget_manager = CpuBudgetManager(4)
+
+    assert service.plan_cpu("Random Forest", {"n_estimators": [8, 16]}).to_dict() == {
+        "policy": "inner",
+        "outer_jobs": 1,
+        "inner_threads": 4,
+    }
+    # Default policy: one single-threaded fit per core for the 2 x 3 search fits
+    assert service.plan_cpu("Decision Tree", {"max_depth": [2, 4]}).outer_jobs == 4
+
+    X = np.random.default_rng(0).random((60, 3))
+    data = np.c_[X, X.sum(axis=1)]
+    results = service.train_and_validate("Random Forest", data[:45], data[45:])
+    assert results["cpu_split"]["policy"] == "inner"
+    assert results["model"].n_jobs is None  # The configured value is kept
@@ -0,0 +1,133 @@
+import numpy as np
+import pytest
+from catboost import CatBoostRegressor
+from sklearn.datasets import make_regression
+from sklearn.ensemble import GradientBoostingRegressor
+from sklearn.metrics import r2_score
+from sklearn.tree import DecisionTreeRegressor
+from xgboost import XGBRegressor
+
+from src.pipeline.cpu_budget import CpuBudgetManager
+from src.pipeline.training_scheduler import SEARCH, TrainingScheduler
+from src.services import model_training_service
+from src.services.model_training_service import ModelTrainingService
+from src.utils.early_stopping import (
+    EarlyStoppingConfig,
+    prepare_early_stopping,
+    split_validation,
+)
+from src.utils.search_utils import SearchConfig
+
+MODEL_CONFIG = {
+    "models": {
+        "XGBRegressor": {
+            "type": "XGBRegressor",
+            "params": {"n_estimators": [50, 400], "max_depth": [2, 3]},
+            "early_stopping": {"rounds": 5},
+        },
+        "Gradient Boosting": {
+            "type": "GradientBoostingRegressor",
+            "params": {"learning_rate": [0.3], "random_state": [0]},
+            "early_stopping": {"rounds": 5, "max_rounds": 400},
+        },
+        "CatBoosting Regressor": {
+            "type": "CatBoostRegressor",
+            "params": {"learning_rate": [0.3]},
+            "early_stopping": {"rounds": 5, "max_rounds": 400},
+            "verbose": False,
+            "allow_writing_files": False,
+        },
+    }
+}
+
+
+@pytest.fixture
+def arrays(monkeypatch):
+    monkeypatch.setattr(
+        model_training_service, "load_model_config", lambda: MODEL_CONFIG
+    )
+    X, y = make_regression(n_samples=300, n_features=5, noise=20.0, random_state=0)
+    data = np.c_[X, y]
+    return data[:240], data[240:]
+
+
+def test_early_stopping_config_is_validated():
+    assert EarlyStoppingConfig.from_dict(None) is None
+    assert EarlyStoppingConfig.from_dict({}).rounds == 10
+    with pytest.raises(ValueError, match="Unknown early stopping option"):
+        EarlyStoppingConfig.from_dict({"patience": 5})
+    with pytest.raises(ValueError, match="validation_fraction"):
+        EarlyStoppingConfig.from_dict({"validation_fraction": 1.5})
+
+
+def test_native_early_stopping_is_configured():
+    config = EarlyStoppingConfig(rounds=7)
+    grid = {"n_estimators": [8, 256], "max_depth": [2, 3]}
+
+    xgb = XGBRegressor()
+    assert prepare_early_stopping(xgb, grid, config) == {"max_depth": [2, 3]}
+    assert (xgb.n_estimators, xgb.early_stopping_rounds) == (256, 7)
+
+    catboost = CatBoostRegressor()
+    prepare_early_stopping(catboost, {"depth": [4]}, config)
+    assert catboost.get_params()["iterations"] == 1000
+    assert catboost.get_params()["od_wait"] == 7
+
+    gradient_boosting = GradientBoostingRegressor()
+    prepare_early_stopping(gradient_boosting, grid, config)
+    assert gradient_boosting.n_iter_no_change == 7
+
+    # Only the libraries passed an eval_set give up training rows for it
+    X, y = np.ones((100, 2)), np.ones(100)
+    X_fit, _, fit_params = split_validation(xgb, X, y, config)
+    assert len(X_fit) == 90 and len(fit_params["eval_set"][0][0]) == 10
+    assert split_validation(gradient_boosting, X, y, config)[2] == {}
+
+    with pytest.raises(ValueError, match="does not support early stopping"):
+        prepare_early_stopping(DecisionTreeRegressor(), {}, config)
+
+
+def test_early_stopping_finds_the_rounds_in_one_run(arrays):
+    train_array, test_array = arrays
+    model_names = list(MODEL_CONFIG["models"])
+
+    service = ModelTrainingService()
+    sequential = {
+        model_name: service.train_and_validate(model_name, train_array, test_array)
+        for model_name in model_names
+    }
+    for model_name, results in sequential.items():
+        assert 0 < results["best_iteration"] < 400, model_name
+    # The rounds are no longer searched: 2 max_depth candidates x 3 folds
+    assert sequential["XGBRegressor"]["search"]["n_fits"] == 6
+
+    # The final model is refit on every training row for the rounds it kept
+    X_train, y_train = train_array[:, :-1], train_array[:, -1]
+    xgb = sequential["XGBRegressor"]
+    assert xgb["model"].n_estimators == xgb["best_iteration"]
+    assert xgb["model"].early_stopping_rounds is None
+    assert xgb["train_r2"] == r2_score(y_train, xgb["model"].predict(X_train))
+    catboost = sequential["CatBoosting Regressor"]
+    assert catboost["model"].tree_count_ == catboost["best_iteration"]
+
+    scheduler = TrainingScheduler(CpuBudgetManager(2))
+    _, _, ready = scheduler.build_tasks(model_names)
+    assert [task.kind for task in ready] == [SEARCH] * 3
+    scheduled = scheduler.run(model_names, train_array, test_array)
+    for model_name in model_names:
+        assert scheduled[model_name]["best_iteration"] == (
+            sequential[model_name]["best_iteration"]
+        )
+        assert scheduled[model_name]["test_r2"] == pytest.approx(
+            sequential[model_name]["test_r2"]
+        )
+
+
+def test_early_stopping_cannot_halve_over_the_rounds(arrays):
+    with pytest.raises(ValueError, match="cannot both stop early"):
+        ModelTrainingService.apply_early_stopping(
+            "XGBRegressor",
+            XGBRegressor(),
+            {"n_estimators": [8, 16]},
+            SearchConfig(strategy="halving", resource="n_estimators"),
+        )
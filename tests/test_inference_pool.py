@@ -0,0 +1,79 @@
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.pipeline.inference_pool import (
+    CATEGORICAL_COLUMNS,
+    NUMERIC_COLUMNS,
+    InferencePool,
+    _slot_size,
+    _slot_views,
+)
+from src.pipeline.predict_pipeline import PredictPipeline
+
+INPUT_PATH = "notebook/data/stud.csv"
+
+
+@pytest.fixture(scope="module")
+def columns():
+    data = pd.read_csv(INPUT_PATH)
+    return {
+        column: data[column].tolist()
+        for column in NUMERIC_COLUMNS + CATEGORICAL_COLUMNS
+    }
+
+
+@pytest.fixture(scope="module")
+def pool():
+    # A single worker with two slots, so concurrent callers contend for slots
+    pool = InferencePool(workers=1, task_batch_size=64)
+    pool.start()
+    yield pool
+    pool.close()
+
+
+def test_inference_pool_matches_in_process_predictions(pool, columns):
+    expected = PredictPipeline().predict(columns)
+
+    timings = {}
+    predictions = pool.predict(columns, timings=timings)
+
+    np.testing.assert_allclose(predictions, expected)
+    assert {"predict", "pool"} <= set(timings)
+    stats = pool.stats()
+    assert stats["started"] and stats["slots"] == 2
+    assert stats["rows"] >= len(expected)
+
+
+def test_inference_pool_serves_concurrent_callers(pool, columns):
+    expected = PredictPipeline().predict(columns)
+
+    # Each caller needs more tasks than there are slots
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(pool.predict, columns) for _ in range(4)]
+        results = [future.result(timeout=60) for future in futures]
+
+    for predictions in results:
+        np.testing.assert_allclose(predictions, expected)
+
+
+def test_inference_pool_slot_round_trip(columns):
+    pool = InferencePool(workers=1, task_batch_size=16)
+    segment = SharedMemory(create=True, size=_slot_size(16))
+    try:
+        vocabularies = pool._write_slot(segment, columns, 10, 20)
+        numeric, codes, _ = _slot_views(segment.buf, 16)
+
+        for row, name in enumerate(NUMERIC_COLUMNS):
+            assert numeric[row, :10].tolist() == columns[name][10:20]
+        for row, name in enumerate(CATEGORICAL_COLUMNS):
+            decoded = [vocabularies[row][code] for code in codes[row, :10]]
+            assert decoded == columns[name][10:20]
+            assert len(vocabularies[row]) == len(set(columns[name][10:20]))
+        assert not pool.stats()["started"]
+    finally:
+        segment.close()
+        segment.unlink()
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import LinearRegression, Ridge
+
+from src.pipeline.linear_folding import FoldedLinearModel
+from src.services.data_transformation_service import DataTransformationService
+
+
+@pytest.fixture
+def student_data():
+    df = pd.read_csv("notebook/data/stud.csv")
+    return df.drop(columns=["math_score"]), df["math_score"]
+
+
+@pytest.fixture
+def fitted_preprocessor(student_data):
+    features, _ = student_data
+    preprocessor = DataTransformationService().get_data_transformer_object()
+    preprocessor.fit(features)
+    return preprocessor
+
+
+def fit(model, preprocessor, student_data):
+    features, target = student_data
+    return model.fit(preprocessor.transform(features), target)
+
+
+def test_folded_ridge_matches_full_pipeline(fitted_preprocessor, student_data):
+    model = fit(Ridge(alpha=1.0), fitted_preprocessor, student_data)
+    folded = FoldedLinearModel.fold(fitted_preprocessor, model)
+    folded.verify(fitted_preprocessor, model)
+
+    features, _ = student_data
+    expected = model.predict(fitted_preprocessor.transform(features))
+    np.testing.assert_allclose(folded.predict(features), expected, rtol=0, atol=1e-9)
+
+
+def test_folded_linear_regression_matches_full_pipeline(
+    fitted_preprocessor, student_data
+):
+    # Unregularized fit on collinear one-hot columns: huge, cancelling coefficients
+    model = fit(LinearRegression(), fitted_preprocessor, student_data)
+    folded = FoldedLinearModel.fold(fitted_preprocessor, model)
+    folded.verify(fitted_preprocessor, model)
+
+    features, _ = student_data
+    expected = model.predict(fitted_preprocessor.transform(features))
+    np.testing.assert_allclose(folded.predict(features), expected, rtol=0, atol=0.5)
+
+
+def test_folded_predicts_records(fitted_preprocessor, student_data):
+    model = fit(Ridge(alpha=1.0), fitted_preprocessor, student_data)
+    folded = FoldedLinearModel.fold(fitted_preprocessor, model)
+
+    features, _ = student_data
+    records = features.head(5).to_dict(orient="records")
+    np.testing.assert_allclose(
+        folded.predict(records), folded.predict(features.head(5)), rtol=0, atol=1e-12
+    )
+
+
+def test_folded_imputes_missing_values(fitted_preprocessor, student_data):
+    model = fit(Ridge(alpha=1.0), fitted_preprocessor, student_data)
+    folded = FoldedLinearModel.fold(fitted_preprocessor, model)
+
+    features, _ = student_data
+    sample = features.head(3).copy()
+    sample.loc[0, "reading_score"] = np.nan
+    sample.loc[1, "gender"] = np.nan
+
+    expected = model.predict(fitted_preprocessor.transform(sample))
+    np.testing.assert_allclose(folded.predict(sample), expected, rtol=0, atol=1e-9)
+
+
+def test_fold_rejects_non_linear_model(fitted_preprocessor, student_data):
+    model = fit(
+        RandomForestRegressor(n_estimators=2), fitted_preprocessor, student_data
+    )
+
+    assert not FoldedLinearModel.is_foldable(model)
+    with pytest.raises(ValueError, match="Unsupported model type"):
+        FoldedLinearModel.fold(fitted_preprocessor, model)
@@ -0,0 +1,68 @@
+import pytest
+
+from src.utils.metrics_utils import Counter, Gauge, Histogram, MetricsRegistry
+
+
+def test_histogram_cumulative_buckets():
+    histogram = Histogram("latency_seconds", "Latency.", ("stage",), buckets=[0.1, 1.0])
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value, "predict")
+
+    snapshot = histogram.snapshot("predict")
+
+    assert snapshot["buckets"] == {"0.1": 2, "1.0": 3, "+Inf": 4}
+    assert snapshot["count"] == 4
+    assert snapshot["sum"] == pytest.approx(2.65)
+
+
+def test_histogram_time_observes_block():
+    histogram = Histogram("latency_seconds", "Latency.")
+
+    with histogram.time():
+        pass
+
+    assert histogram.snapshot()["count"] == 1
+
+
+def test_metric_rejects_wrong_label_count():
+    counter = Counter("requests_total", "Requests.", ("endpoint", "status"))
+
+    with pytest.raises(ValueError):
+        counter.inc("/predict")
+
+
+def test_gauge_inc_dec():
+    gauge = Gauge("in_flight", "In flight.")
+    gauge.inc()
+    gauge.inc()
+    gauge.dec()
+
+    assert gauge.value() == 1
+
+
+def test_registry_renders_prometheus_text():
+    registry = MetricsRegistry()
+    counter = registry.counter("requests_total", "Requests.", ("endpoint",))
+    histogram = registry.histogram(
+        "latency_seconds", "Latency.", ("endpoint",), buckets=[0.5]
+    )
+    counter.inc('/a"b', amount=2)
+    histogram.observe(0.25, "/predict")
+
+    text = registry.render()
+
+    assert "# TYPE requests_total counter" in text
+    assert 'requests_total{endpoint="/a\\"b"} 2' in text
+    assert "# TYPE latency_seconds histogram" in text
+    assert 'latency_seconds_bucket{endpoint="/predict",le="0.5"} 1' in text
+    assert 'latency_seconds_bucket{endpoint="/predict",le="+Inf"} 1' in text
+    assert 'latency_seconds_sum{endpoint="/predict"} 0.25' in text
+    assert 'latency_seconds_count{endpoint="/predict"} 1' in text
+
+
+def test_registry_rejects_duplicate_names():
+    registry = MetricsRegistry()
+    registry.counter("requests_total", "Requests.")
+
+    with pytest.raises(ValueError):
+        registry.gauge("requests_total", "Requests.")
@@ -0,0 +1,47 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.exception import CustomException
+from src.pipeline.micro_batcher import MicroBatcher
+
+
+def test_micro_batcher_routes_results_to_callers():
+    batch_sizes = []
+    release = threading.Event()
+
+    def predict_fn(records):
+        # Hold the first batch so that the remaining requests queue up together
+        release.wait(timeout=5)
+        batch_sizes.append(len(records))
+        return [record * 10 for record in records]
+
+    batcher = MicroBatcher(predict_fn, max_batch_size=8, window_ms=50)
+    with ThreadPoolExecutor(max_workers=9) as executor:
+        futures = [executor.submit(batcher.submit, i) for i in range(9)]
+        release.set()
+        results = [future.result(timeout=5) for future in futures]
+    batcher.close()
+
+    assert results == [i * 10 for i in range(9)]
+    assert sum(batch_sizes) == 9
+    assert max(batch_sizes) > 1  # Concurrent requests were grouped
+
+    stats = batcher.stats.to_dict()
+    assert stats["requests"] == 9
+    assert stats["batches"] == len(batch_sizes)
+    assert sum(stats["queue_wait_ms"]["buckets"].values()) == 9
+
+
+def test_micro_batcher_propagates_errors():
+    def predict_fn(records):
+        raise ValueError("model failure")
+
+    batcher = MicroBatcher(predict_fn, max_batch_size=4, window_ms=1)
+    with pytest.raises(CustomException) as exc_info:
+        batcher.submit(1)
+    batcher.close()
+
+    assert "model failure" in str(exc_info.value)
+    assert batcher.stats.to_dict()["failed_batches"] == 1
@@ -0,0 +1,81 @@
+import os
+
+import pytest
+
+from src.config.config import Config
+from src.exception import CustomException
+from src.pipeline.model_registry import DEFAULT_VERSION, ModelRegistry, ModelRouting
+from src.utils.file_utils import save_object
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    config = Config()
+    monkeypatch.setattr(config, "MODEL_DIR", str(tmp_path / "models"))
+    monkeypatch.setattr(config, "MODEL_FILE_PATH", str(tmp_path / "model.pkl"))
+    monkeypatch.setattr(
+        config, "PREPROCESSOR_FILE_PATH", str(tmp_path / "preprocessor.pkl")
+    )
+    save_object(config.MODEL_FILE_PATH, "model")
+    save_object(config.PREPROCESSOR_FILE_PATH, "preprocessor")
+    return ModelRegistry()
+
+
+def register(registry, name):
+    version = registry.create_version(name, Config().PREPROCESSOR_FILE_PATH)
+    save_object(version.model_path, f"model-{name}")
+    return version
+
+
+def test_registry_lists_flat_and_versioned_models(registry):
+    register(registry, "v2")
+    # A version without its model file is still being written
+    registry.create_version("v3", Config().PREPROCESSOR_FILE_PATH)
+
+    versions = registry.versions()
+
+    assert sorted(versions) == [DEFAULT_VERSION, "v2"]
+    assert os.path.exists(versions["v2"].preprocessor_path)
+
+
+def test_registry_rejects_invalid_versions(registry):
+    register(registry, "v2")
+
+    for name in ("v2", DEFAULT_VERSION, "../v4"):
+        with pytest.raises(ValueError):
+            registry.create_version(name, Config().PREPROCESSOR_FILE_PATH)
+
+
+def test_registry_routing_round_trip(registry):
+    register(registry, "v2")
+    assert registry.load_routing().default_version == DEFAULT_VERSION
+
+    registry.set_routing("v2", {DEFAULT_VERSION: 10})
+
+    routing = registry.load_routing()
+    assert routing == ModelRouting("v2", {DEFAULT_VERSION: 10.0})
+    with pytest.raises(CustomException):
+        registry.set_routing("v9")
+
+
+def test_routing_resolves_explicit_weighted_and_sticky_versions():
+    routing = ModelRouting("v1", {"v2": 100.0})
+    assert routing.resolve("v1") == "v1"
+    assert routing.resolve() == "v2"
+
+    split = ModelRouting("v1", {"v2": 50.0})
+    assert split.resolve(routing_key="user-1") == split.resolve(routing_key="user-1")
+    resolved = {split.resolve(routing_key=f"user-{i}") for i in range(100)}
+    assert resolved == {"v1", "v2"}
+    assert ModelRouting("v1").resolve() == "v1"
+
+
+def test_routing_weights_are_percentages_of_the_traffic(registry):
+    # A 10% canary: the rest of the traffic stays on the default version
+    canary = ModelRouting("v1", {"v2": 10.0})
+    resolved = [canary.resolve(routing_key=f"user-{i}") for i in range(2000)]
+    assert 0.07 < resolved.count("v2") / len(resolved) < 0.13
+
+    register(registry, "v2")
+    with pytest.raises(CustomException):
+        registry.set_routing(DEFAULT_VERSION, {"v2": 80.0, DEFAULT_VERSION: 30.0})
@@ -0,0 +1,107 @@
+import os
+
+import pytest
+
+from src.config.config import Config
+from src.pipeline import pipeline_provider as provider_module
+from src.pipeline.pipeline_provider import PipelineProvider
+from src.utils.file_utils import save_object
+
+
+class FakePipeline:
+    """Stand-in for PredictPipeline that records the artifacts it was loaded from."""
+
+    def __init__(self, model_path, preprocessor_path, preprocessor=None, **kwargs):
+        with open(model_path, "rb") as f:
+            self.model_bytes = f.read()
+        self.model = self.model_bytes
+        self.preprocessor = preprocessor or object()
+
+
+@pytest.fixture
+def provider(tmp_path, monkeypatch):
+    config = Config()
+    monkeypatch.setattr(config, "MODEL_DIR", str(tmp_path / "models"))
+    monkeypatch.setattr(config, "MODEL_FILE_PATH", str(tmp_path / "model.pkl"))
+    monkeypatch.setattr(
+        config, "PREPROCESSOR_FILE_PATH", str(tmp_path / "preprocessor.pkl")
+    )
+    monkeypatch.setattr(config, "PIPELINE_RELOAD_INTERVAL", 0)
+    monkeypatch.setattr(provider_module, "PredictPipeline", FakePipeline)
+    save_object(config.MODEL_FILE_PATH, "model-v1")
+    save_object(config.PREPROCESSOR_FILE_PATH, "preprocessor")
+
+    # Bypass the singleton so every test gets a fresh provider
+    instance = PipelineProvider.__new__(PipelineProvider)
+    instance.__init__()
+    return instance
+
+
+def test_provider_loads_once(provider):
+    first = provider.get()
+    assert provider.get() is first
+    assert provider.version is not None
+    assert provider.reloads == 0
+
+
+def test_provider_reloads_changed_artifacts(provider):
+    first = provider.get()
+    version = provider.version
+
+    save_object(Config().MODEL_FILE_PATH, "model-v2")
+    assert provider.reload_if_changed()
+
+    second = provider.get()
+    assert second is not first
+    assert provider.version != version
+    assert provider.reloads == 1
+
+
+def test_provider_notifies_reload_listeners(provider):
+    provider.get()
+    notified = []
+    provider.add_reload_listener(notified.append)
+
+    save_object(Config().MODEL_FILE_PATH, "model-v2")
+    assert provider.reload_if_changed()
+
+    assert notified == [{provider.version}]
+
+
+def test_provider_ignores_touched_artifacts(provider):
+    first = provider.get()
+    stat = os.stat(Config().MODEL_FILE_PATH)
+    os.utime(Config().MODEL_FILE_PATH, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert not provider.reload_if_changed()
+    assert provider.get() is first
+
+
+def register_version(name, model):
+    version = provider_module.ModelRegistry().create_version(
+        name, Config().PREPROCESSOR_FILE_PATH
+    )
+    save_object(version.model_path, model)
+
+
+def test_provider_serves_versions_with_shared_preprocessor(provider):
+    register_version("v2", "model-v2")
+
+    assert provider.versions == ["default", "v2"]
+    assert provider.get("v2") is not provider.get()
+    assert provider.get("v2").preprocessor is provider.get().preprocessor
+    assert provider.stats()["shared_preprocessors"] == 1
+    with pytest.raises(ValueError):
+        provider.resolve_version("v9")
+
+
+def test_provider_swaps_routing_without_reloading(provider):
+    register_version("v2", "model-v2")
+    pipelines = {name: provider.get(name) for name in provider.versions}
+
+    provider.registry.set_routing("v2")
+    assert provider.reload_if_changed()
+
+    assert provider.resolve_version() == "v2"
+    assert {name: provider.get(name) for name in provider.versions} == pipelines
+    assert provider.reloads == 0
@@ -0,0 +1,159 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.pipeline.prediction_cache import PredictionCache
+from src.schemas.prediction_input_schema import PredictionInputSchema
+
+
+def make_record(reading_score=72.0):
+    return PredictionInputSchema(
+        gender="male",
+        race_ethnicity="group A",
+        parental_level_of_education="high school",
+        lunch="standard",
+        test_preparation_course="none",
+        reading_score=reading_score,
+        writing_score=74.0,
+    )
+
+
+def test_cache_hits_and_misses():
+    cache = PredictionCache(max_entries=10)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return 42.0
+
+    assert cache.get_or_compute(make_record(), compute, version="v1") == 42.0
+    assert cache.get_or_compute(make_record(), compute, version="v1") == 42.0
+
+    stats = cache.stats()
+    assert len(calls) == 1
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_cache_keeps_each_version_apart():
+    cache = PredictionCache(max_entries=10)
+    cache.get_or_compute(make_record(), lambda: 1.0, version="v1")
+
+    # Alternating versions, as a canary split does, hit their own entries
+    for _ in range(5):
+        assert cache.get_or_compute(make_record(), lambda: 2.0, version="v2") == 2.0
+        assert cache.get_or_compute(make_record(), lambda: 3.0, version="v1") == 1.0
+
+    stats = cache.stats()
+    assert stats["misses"] == 2
+    assert stats["hits"] == 9
+    assert stats["entries"] == 2
+
+
+def test_cache_purges_replaced_versions():
+    cache = PredictionCache(max_entries=10)
+    cache.get_or_compute(make_record(), lambda: 1.0, version="v1")
+    cache.get_or_compute(make_record(), lambda: 2.0, version="v2")
+
+    cache.retain_versions({"v2", "v3"})
+
+    stats = cache.stats()
+    assert stats["entries"] == 1
+    assert stats["purged"] == 1
+    assert cache.get_or_compute(make_record(), lambda: 3.0, version="v2") == 2.0
+    # Results of a replaced version still being computed are not cached
+    cache.get_or_compute(make_record(), lambda: 1.0, version="v1")
+    assert cache.stats()["entries"] == 1
+
+
+def test_cache_does_not_coalesce_across_versions():
+    cache = PredictionCache(max_entries=10)
+    started = threading.Event()
+    release = threading.Event()
+
+    def compute_v1():
+        started.set()
+        release.wait(timeout=5)
+        return "v1-result"
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        v1 = executor.submit(cache.get_or_compute, make_record(), compute_v1, "v1")
+        started.wait(timeout=5)
+        # The same record on v2 while v1 is still computing it
+        v2 = executor.submit(
+            cache.get_or_compute, make_record(), lambda: "v2-result", "v2"
+        )
+        assert v2.result(timeout=5) == "v2-result"
+        release.set()
+        assert v1.result(timeout=5) == "v1-result"
+
+    assert cache.stats()["coalesced"] == 0
+
+
+def test_cache_evicts_least_recently_used():
+    cache = PredictionCache(max_entries=2)
+    for score in (10.0, 20.0, 30.0):
+        cache.get_or_compute(make_record(score), lambda: score, version="v1")
+
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["evictions"] == 1
+
+
+def test_cache_respects_memory_bound():
+    cache = PredictionCache(max_entries=100, max_bytes=1)
+    cache.get_or_compute(make_record(), lambda: 1.0, version="v1")
+
+    assert cache.stats()["entries"] == 0
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_expires_entries():
+    cache = PredictionCache(max_entries=10, ttl_seconds=0.01)
+    cache.get_or_compute(make_record(), lambda: 1.0, version="v1")
+    time.sleep(0.02)
+    cache.get_or_compute(make_record(), lambda: 1.0, version="v1")
+
+    assert cache.stats()["expirations"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_cache_coalesces_concurrent_requests():
+    cache = PredictionCache(max_entries=10)
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(timeout=5)
+        return 7.0
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        leader = executor.submit(cache.get_or_compute, make_record(), compute, "v1")
+        started.wait(timeout=5)
+        followers = [
+            executor.submit(cache.get_or_compute, make_record(), compute, "v1")
+            for _ in range(3)
+        ]
+        while cache.stats()["coalesced"] < 3:
+            time.sleep(0.001)
+        release.set()
+        results = [leader.result()] + [f.result() for f in followers]
+
+    assert results == [7.0] * 4
+    assert len(calls) == 1
+
+
+def test_cache_does_not_store_errors():
+    cache = PredictionCache(max_entries=10)
+
+    def compute():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        cache.get_or_compute(make_record(), compute, version="v1")
+    assert cache.get_or_compute(make_record(), lambda: 3.0, version="v1") == 3.0
@@ -0,0 +1,86 @@
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import httpx
+import pytest
+
+pytestmark = pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="Uses fork and /proc"
+)
+
+
+def get_children(pid):
+    with open(f"/proc/{pid}/task/{pid}/children") as f:
+        return [int(child) for child in f.read().split()]
+
+
+def wait_for(condition, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if condition():
+                return True
+        except (httpx.HTTPError, OSError):
+            pass
+        time.sleep(0.2)
+    return False
+
+
+@pytest.fixture
+def prefork_server(tmp_path):
+    uds = str(tmp_path / "predict.sock")
+    process = subprocess.Popen(
+        [sys.executable, "launch_rest_api.py", "--workers", "2", "--uds", uds],
+        env={**os.environ, "PIPELINE_RELOAD_INTERVAL": "0"},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    client = httpx.Client(
+        transport=httpx.HTTPTransport(uds=uds), base_url="http://prediction"
+    )
+    try:
+        assert wait_for(lambda: client.get("/").status_code == 200)
+        yield process, client, uds
+    finally:
+        client.close()
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+
+
+def test_prefork_server_serves_and_restarts_workers(prefork_server):
+    process, client, uds = prefork_server
+    payload = {
+        "payload": {
+            "data": {
+                "gender": "female",
+                "race_ethnicity": "group B",
+                "parental_level_of_education": "bachelor's degree",
+                "lunch": "standard",
+                "test_preparation_course": "none",
+                "reading_score": 72,
+                "writing_score": 74,
+            }
+        }
+    }
+
+    response = client.post("/predict", json=payload)
+    assert response.status_code == 200
+    assert "math_score" in response.json()["data"]
+
+    workers = get_children(process.pid)
+    assert len(workers) == 2
+
+    os.kill(workers[0], signal.SIGKILL)
+    assert wait_for(
+        lambda: len(get_children(process.pid)) == 2
+        and workers[0] not in get_children(process.pid)
+    )
+    assert wait_for(lambda: client.post("/predict", json=payload).status_code == 200)
+
+    process.send_signal(signal.SIGTERM)
+    assert process.wait(timeout=30) == 0
+    assert not os.path.exists(uds)
@@ -1,3 +1,5 @@
+import json
+
 import pytest
 from fastapi.testclient import TestClient
 from predict_rest_api import app
@@ -37,6 +39,25 @@ def test_predict_missing_payload():
     assert "detail" in data  # Standard FastAPI validation error response
 
 
+def test_predict_invalid_category(valid_payload):
+    valid_payload["payload"]["data"]["gender"] = "unknown"
+    response = client.post("/predict", json=valid_payload)
+
+    assert response.status_code == 400
+    errors = response.json()["detail"]["errors"]
+    assert errors == [
+        {"field": "gender", "error": "Input should be 'male' or 'female'"}
+    ]
+
+
+def test_predict_missing_data():
+    response = client.post("/predict", json={"payload": {}})
+
+    assert response.status_code == 400
+    errors = response.json()["detail"]["errors"]
+    assert errors == [{"field": "data", "error": "Field required"}]
+
+
 def test_root_endpoint():
     response = client.get("/")
     assert response.status_code == 200
@@ -44,6 +65,145 @@ def test_root_endpoint():
     assert data["message"] == "FastAPI Prediction Service is running"
 
 
+def test_predict_batch_success(valid_payload):
+    record = valid_payload["payload"]["data"]
+    response = client.post(
+        "/predict/batch", json={"payload": {"data": [record, record, record]}}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["code"] == 0
+    assert data["code_text"] == "ok"
+    assert [result["index"] for result in data["data"]] == [0, 1, 2]
+    assert all(result["errors"] is None for result in data["data"])
+
+    # Batch scores must match the single-record endpoint (up to float round-off)
+    single = client.post("/predict", json=valid_payload).json()
+    assert data["data"][0]["math_score"] == pytest.approx(single["data"]["math_score"])
+
+
+def test_predict_batch_partial_errors(valid_payload, invalid_payload):
+    records = [
+        valid_payload["payload"]["data"],
+        invalid_payload["payload"]["data"],
+        valid_payload["payload"]["data"],
+    ]
+    response = client.post("/predict/batch", json={"payload": {"data": records}})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["code"] == 1
+    assert data["code_text"] == "partial"
+
+    results = data["data"]
+    assert results[0]["math_score"] is not None
+    assert results[2]["math_score"] is not None
+    assert results[1]["math_score"] is None
+    assert results[1]["errors"][0]["field"] == "reading_score"
+
+
+def test_predict_batch_invalid_data():
+    response = client.post("/predict/batch", json={"payload": {"data": {}}})
+    assert response.status_code == 400
+    data = response.json()["detail"]
+    assert data["code"] == -1
+    assert data["errors"][0]["field"] == "data"
+
+
+def test_predict_stream(valid_payload, invalid_payload):
+    lines = [
+        json.dumps(valid_payload),
+        "{not json",
+        json.dumps(invalid_payload),
+        "",
+        json.dumps(valid_payload),
+    ]
+    response = client.post(
+        "/predict/stream",
+        content="\n".join(lines).encode(),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert [result["index"] for result in results] == [0, 1, 2, 3]
+    assert results[0]["math_score"] is not None
+    assert results[1]["errors"] is not None
+    assert results[2]["errors"][0]["field"] == "reading_score"
+    assert results[3]["math_score"] == pytest.approx(results[0]["math_score"])
+
+
+def test_predict_msgpack(valid_payload):
+    msgpack = pytest.importorskip("msgpack")
+    json_response = client.post("/predict", json=valid_payload)
+
+    response = client.post(
+        "/predict",
+        content=msgpack.packb(valid_payload),
+        headers={
+            "Content-Type": "application/msgpack",
+            "Accept": "application/msgpack",
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/msgpack"
+    assert msgpack.unpackb(response.content) == json_response.json()
+
+
+def test_predict_msgpack_invalid_body():
+    pytest.importorskip("msgpack")
+    response = client.post(
+        "/predict",
+        content=b"\xc1",
+        headers={"Content-Type": "application/msgpack"},
+    )
+
+    assert response.status_code == 422
+
+
+def test_predict_batch_arrow(valid_payload):
+    pa = pytest.importorskip("pyarrow")
+    record = valid_payload["payload"]["data"]
+    invalid_record = {**record, "lunch": "unknown"}
+    table = pa.Table.from_pylist([record, invalid_record])
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+
+    response = client.post(
+        "/predict/batch",
+        content=sink.getvalue().to_pybytes(),
+        headers={
+            "Content-Type": "application/vnd.apache.arrow.stream",
+            "Accept": "application/vnd.apache.arrow.stream",
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/vnd.apache.arrow.stream"
+    result = pa.ipc.open_stream(response.content).read_all()
+    assert result.schema.metadata[b"code_text"] == b"partial"
+    rows = result.to_pylist()
+    assert [row["index"] for row in rows] == [0, 1]
+    assert rows[0]["math_score"] is not None and rows[0]["errors"] is None
+    assert json.loads(rows[1]["errors"])[0]["field"] == "lunch"
+
+
+def test_predict_model_version_header(valid_payload):
+    response = client.post(
+        "/predict", json=valid_payload, headers={"X-Model-Version": "default"}
+    )
+    assert response.status_code == 200
+    assert response.headers["x-model-version"] == "default"
+
+    response = client.post(
+        "/predict", json=valid_payload, headers={"X-Model-Version": "missing"}
+    )
+    assert response.status_code == 404
+    assert "Unknown model version" in response.json()["detail"]["message"]
+
+
 @pytest.fixture
 def valid_payload():
     return {
@@ -76,3 +236,36 @@ def invalid_payload():
             }
         }
     }
+
+
+def test_metrics_endpoint(valid_payload):
+    client.post("/predict", json=valid_payload)
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    for stage in ("parse", "validation", "predict", "serialization"):
+        assert (
+            f'prediction_stage_duration_seconds_count{{endpoint="/predict",stage="{stage}"}}'
+            in text
+        )
+    assert 'prediction_requests_total{endpoint="/predict",status="200"}' in text
+    assert 'predictions_total{endpoint="/predict",model_version="default"}' in text
+    assert "prediction_requests_in_flight" in text
+    assert "admission_queue_depth" in text
+
+
+def test_predict_expired_deadline(valid_payload):
+    response = client.post(
+        "/predict", json=valid_payload, headers={"X-Request-Timeout-Ms": "0"}
+    )
+
+    assert response.status_code == 503
+    assert "retry-after" in response.headers
+    assert "deadline" in response.json()["detail"]["message"]
+    assert (
+        'prediction_requests_shed_total{endpoint="/predict",reason="deadline"}'
+        in client.get("/metrics").text
+    )
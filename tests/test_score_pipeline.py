@@ -0,0 +1,102 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.pipeline.predict_pipeline import PredictPipeline
+from src.pipeline.score_pipeline import PREDICTION_COLUMN, ScorePipeline
+
+INPUT_PATH = "notebook/data/stud.csv"
+
+
+@pytest.fixture
+def expected_predictions():
+    return PredictPipeline().predict(pd.read_csv(INPUT_PATH))
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_score_writes_predictions_in_order(tmp_path, expected_predictions, workers):
+    output_path = str(tmp_path / "predictions.csv")
+
+    summary = ScorePipeline(
+        INPUT_PATH, output_path, chunk_size=128, workers=workers
+    ).run()
+
+    scored = pd.read_csv(output_path)
+    assert summary["rows"] == len(expected_predictions)
+    assert list(scored.columns) == list(pd.read_csv(INPUT_PATH).columns) + [
+        PREDICTION_COLUMN
+    ]
+    np.testing.assert_allclose(scored[PREDICTION_COLUMN], expected_predictions)
+    assert not (tmp_path / "predictions.csv.checkpoint.json").exists()
+
+
+def test_score_resumes_from_checkpoint(tmp_path, expected_predictions):
+    output_path = str(tmp_path / "predictions.csv")
+    ScorePipeline(INPUT_PATH, output_path, chunk_size=128, workers=0).run()
+
+    # Simulate an interruption after the first two chunks plus a partial write
+    scored = pd.read_csv(output_path)
+    scored.iloc[:256].to_csv(output_path, index=False)
+    with open(output_path, "rb") as f:
+        output_bytes = len(f.read())
+    with open(output_path, "a") as f:
+        f.write("partial,row")
+    with open(f"{output_path}.checkpoint.json", "w") as f:
+        json.dump(
+            {
+                "input_path": os.path.abspath(INPUT_PATH),
+                "chunk_size": 128,
+                "rows_done": 256,
+                "output_bytes": output_bytes,
+            },
+            f,
+        )
+
+    summary = ScorePipeline(
+        INPUT_PATH, output_path, chunk_size=128, workers=0, resume=True
+    ).run()
+
+    resumed = pd.read_csv(output_path)
+    assert summary["rows_scored"] == len(expected_predictions) - 256
+    assert len(resumed) == len(expected_predictions)
+    np.testing.assert_allclose(resumed[PREDICTION_COLUMN], expected_predictions)
+
+
+def test_score_rejects_checkpoint_of_another_run(tmp_path):
+    output_path = str(tmp_path / "predictions.csv")
+    ScorePipeline(INPUT_PATH, output_path, chunk_size=128, workers=0).run()
+    with open(f"{output_path}.checkpoint.json", "w") as f:
+        json.dump(
+            {"input_path": "other.csv", "chunk_size": 128, "rows_done": 0, "output_bytes": 0},
+            f,
+        )
+
+    with pytest.raises(Exception, match="different input file"):
+        ScorePipeline(
+            INPUT_PATH, output_path, chunk_size=128, workers=0, resume=True
+        ).run()
+
+
+def test_score_restarts_when_the_output_is_missing(tmp_path, expected_predictions):
+    output_path = str(tmp_path / "predictions.csv")
+    with open(f"{output_path}.checkpoint.json", "w") as f:
+        json.dump(
+            {
+                "input_path": os.path.abspath(INPUT_PATH),
+                "chunk_size": 128,
+                "rows_done": 256,
+                "output_bytes": 4096,
+            },
+            f,
+        )
+
+    summary = ScorePipeline(
+        INPUT_PATH, output_path, chunk_size=128, workers=0, resume=True
+    ).run()
+
+    scored = pd.read_csv(output_path)
+    assert summary["rows_scored"] == len(expected_predictions)
+    np.testing.assert_allclose(scored[PREDICTION_COLUMN], expected_predictions)
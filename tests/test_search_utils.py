@@ -0,0 +1,136 @@
+import numpy as np
+import pytest
+from sklearn.datasets import make_regression
+from sklearn.ensemble import GradientBoostingRegressor
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import (
+    GridSearchCV,
+    HalvingGridSearchCV,
+    HalvingRandomSearchCV,
+    RandomizedSearchCV,
+)
+from sklearn.tree import DecisionTreeRegressor
+
+from src.pipeline.cpu_budget import CpuBudgetManager
+from src.pipeline.training_scheduler import SEARCH, TrainingScheduler
+from src.services import model_training_service
+from src.services.model_training_service import ModelTrainingService
+from src.utils.search_utils import (
+    SearchConfig,
+    build_search,
+    count_candidates,
+    sample_candidates,
+    search_summary,
+)
+
+PARAM_GRID = {"max_depth": [2, 3, 4, 5, 6, 7], "min_samples_leaf": [1, 2, 4]}
+
+MODEL_CONFIG = {
+    "models": {
+        "Decision Tree": {
+            "type": "DecisionTreeRegressor",
+            "params": {**PARAM_GRID, "random_state": [0]},
+            "search": {"strategy": "random", "n_iter": 5},
+        },
+        "Gradient Boosting": {
+            "type": "GradientBoostingRegressor",
+            "params": {"n_estimators": [9, 27], "max_depth": [2, 3], "random_state": [0]},
+            "search": {"strategy": "halving", "resource": "n_estimators"},
+        },
+    }
+}
+
+
+@pytest.fixture
+def data():
+    X, y = make_regression(n_samples=240, n_features=5, noise=5.0, random_state=0)
+    return X, y
+
+
+def test_search_config_validates_the_search_block():
+    assert SearchConfig.from_dict(None) == SearchConfig()
+    assert SearchConfig.from_dict({"strategy": "random", "n_iter": 4}).n_iter == 4
+    with pytest.raises(ValueError, match="Unknown search strategy"):
+        SearchConfig.from_dict({"strategy": "bayes"})
+    with pytest.raises(ValueError, match="Unknown search option"):
+        SearchConfig.from_dict({"strategy": "random", "iterations": 4})
+
+
+@pytest.mark.parametrize(
+    "search, expected_class, candidates",
+    [
+        ({}, GridSearchCV, 18),
+        ({"strategy": "random", "n_iter": 5}, RandomizedSearchCV, 5),
+        ({"strategy": "halving"}, HalvingGridSearchCV, 18),
+        ({"strategy": "halving", "n_candidates": 6}, HalvingRandomSearchCV, 6),
+    ],
+)
+def test_build_search_selects_the_strategy(search, expected_class, candidates):
+    search_config = SearchConfig.from_dict(search)
+    search = build_search(DecisionTreeRegressor(), PARAM_GRID, search_config, 3, 1)
+
+    assert type(search) is expected_class
+    assert count_candidates(PARAM_GRID, search_config) == candidates
+
+
+def test_random_candidates_match_randomized_search(data):
+    search_config = SearchConfig(strategy="random", n_iter=5)
+    search = build_search(DecisionTreeRegressor(), PARAM_GRID, search_config, 3, 1)
+    search.fit(*data)
+
+    assert search.cv_results_["params"] == sample_candidates(PARAM_GRID, search_config)
+
+    summary = search_summary(search, "random", 18 * 3, 1.0)
+    assert summary["search_strategy"] == "random"
+    assert summary["n_fits"] == 15
+    assert summary["search_seconds_saved"] >= 0
+
+
+def test_halving_over_an_estimator_parameter(data):
+    param_grid = {"n_estimators": [9, 27], "max_depth": [2, 3, 4]}
+    search_config = SearchConfig(strategy="halving", resource="n_estimators")
+    search = build_search(GradientBoostingRegressor(), param_grid, search_config, 3, 1)
+
+    # The search sets the resource itself, up to the largest value of the grid
+    assert "n_estimators" not in search.param_grid
+    assert search.max_resources == 27
+    assert count_candidates(param_grid, search_config) == 3
+
+    search.fit(*data)
+    assert search.best_params_["n_estimators"] == 27
+    summary = search_summary(search, "halving", 6 * 3, 1.0)
+    assert summary["n_fits"] == len(search.cv_results_["params"]) * 3 < 6 * 3
+
+
+def test_training_reports_the_search(monkeypatch, data):
+    monkeypatch.setattr(
+        model_training_service, "load_model_config", lambda: MODEL_CONFIG
+    )
+    X, y = data
+    array = np.c_[X, y]
+    train_array, test_array = array[:200], array[200:]
+    model_names = list(MODEL_CONFIG["models"])
+
+    service = ModelTrainingService()
+    sequential = {
+        model_name: service.train_and_validate(model_name, train_array, test_array)
+        for model_name in model_names
+    }
+    scheduler = TrainingScheduler(CpuBudgetManager(2))
+    _, grids, ready = scheduler.build_tasks(model_names)
+    assert len(grids["Decision Tree"]) == 5
+    assert [task.kind for task in ready] == [SEARCH]
+    scheduled = scheduler.run(model_names, train_array, test_array)
+
+    for results in (sequential, scheduled):
+        assert results["Decision Tree"]["search"]["search_strategy"] == "random"
+        assert results["Decision Tree"]["search"]["n_fits"] == 15
+        assert results["Gradient Boosting"]["search"]["search_strategy"] == "halving"
+        assert results["Gradient Boosting"]["search"]["n_fits"] < 4 * 3
+    for model_name in model_names:
+        assert scheduled[model_name]["model"].get_params() == (
+            sequential[model_name]["model"].get_params()
+        )
+        assert scheduled[model_name]["test_r2"] == pytest.approx(
+            sequential[model_name]["test_r2"]
+        )
@@ -0,0 +1,81 @@
+import pytest
+
+from src.utils.serialization_utils import (
+    ARROW_MEDIA_TYPE,
+    JSON_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE,
+    decode_request_body,
+    dumps_json,
+    encode_arrow_table,
+    encode_content,
+    loads_json,
+    negotiate_media_type,
+)
+
+SUPPORTED = (JSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE, ARROW_MEDIA_TYPE)
+
+
+@pytest.mark.parametrize(
+    "accept, expected",
+    [
+        (None, JSON_MEDIA_TYPE),
+        ("*/*", JSON_MEDIA_TYPE),
+        ("text/html", JSON_MEDIA_TYPE),
+        ("application/msgpack", MSGPACK_MEDIA_TYPE),
+        ("application/x-msgpack", MSGPACK_MEDIA_TYPE),
+        ("application/msgpack;q=0.5, application/json", JSON_MEDIA_TYPE),
+        ("application/json;q=0.9, application/vnd.apache.arrow.stream", ARROW_MEDIA_TYPE),
+        ("application/msgpack;q=0", JSON_MEDIA_TYPE),
+    ],
+)
+def test_negotiate_media_type(accept, expected):
+    if expected == MSGPACK_MEDIA_TYPE:
+        pytest.importorskip("msgpack")
+    if expected == ARROW_MEDIA_TYPE:
+        pytest.importorskip("pyarrow")
+
+    assert negotiate_media_type(accept, SUPPORTED) == expected
+
+
+def test_negotiate_media_type_ignores_unsupported_types():
+    assert (
+        negotiate_media_type(ARROW_MEDIA_TYPE, (JSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE))
+        == JSON_MEDIA_TYPE
+    )
+
+
+def test_json_round_trip():
+    content = {"code": 0, "data": {"math_score": 66.25}, "errors": None}
+
+    body = dumps_json(content)
+
+    assert b" " not in body
+    assert loads_json(body) == content
+
+
+def test_msgpack_round_trip():
+    pytest.importorskip("msgpack")
+    content = {"payload": {"data": {"gender": "male", "reading_score": 72.0}}}
+
+    body = encode_content(content, MSGPACK_MEDIA_TYPE)
+
+    assert decode_request_body(body, MSGPACK_MEDIA_TYPE) == content
+
+
+def test_arrow_body_decodes_to_batch_envelope():
+    pytest.importorskip("pyarrow")
+    body = encode_arrow_table(
+        {"gender": ["male", "female"], "reading_score": [72.0, 88.0]},
+        metadata={"code": 0},
+    )
+
+    content = decode_request_body(body, ARROW_MEDIA_TYPE)
+
+    assert content == {
+        "payload": {
+            "data": [
+                {"gender": "male", "reading_score": 72.0},
+                {"gender": "female", "reading_score": 88.0},
+            ]
+        }
+    }
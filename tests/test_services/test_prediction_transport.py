@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+
+from src.services.prediction_transport_service import PredictionTransportService
+
+
+@pytest.fixture
+def valid_payload():
+    return {
+        "payload": {
+            "data": {
+                "gender": "male",
+                "race_ethnicity": "group A",
+                "parental_level_of_education": "high school",
+                "lunch": "standard",
+                "test_preparation_course": "none",
+                "reading_score": 72.0,
+                "writing_score": 74.0,
+            }
+        }
+    }
+
+
+def run_transport(mode, payload):
+    async def run():
+        transport = PredictionTransportService(mode)
+        await transport.start()
+        try:
+            return await transport.predict(payload)
+        finally:
+            await transport.close()
+
+    return asyncio.run(run())
+
+
+def test_inprocess_transport_success(valid_payload):
+    status_code, response_data = run_transport("inprocess", valid_payload)
+    assert status_code == 200
+    assert response_data["code"] == 0
+    assert "math_score" in response_data["data"]
+
+
+def test_inprocess_transport_validation_error(valid_payload):
+    valid_payload["payload"]["data"]["reading_score"] = ""
+    status_code, response_data = run_transport("inprocess", valid_payload)
+    assert status_code == 400
+    assert response_data["message"] == "Validation error occurred."
+    assert response_data["errors"][0]["field"] == "reading_score"
+
+
+def test_unsupported_transport_mode():
+    with pytest.raises(ValueError, match="Unsupported prediction transport"):
+        PredictionTransportService("carrier-pigeon")
@@ -0,0 +1,111 @@
+import numpy as np
+import pytest
+from catboost import CatBoostRegressor
+from sklearn.datasets import make_regression
+from sklearn.ensemble import (
+    AdaBoostRegressor,
+    GradientBoostingRegressor,
+    RandomForestRegressor,
+)
+from sklearn.model_selection import GridSearchCV
+from sklearn.tree import DecisionTreeRegressor
+from xgboost import XGBRegressor
+
+from src.pipeline.cpu_budget import CpuBudgetManager
+from src.pipeline.training_scheduler import STAGED, TrainingScheduler
+from src.services import model_training_service
+from src.services.model_training_service import ModelTrainingService
+from src.utils.search_utils import SearchConfig, build_search, count_candidates
+from src.utils.staged_search import StagedSearchCV, group_candidates, staged_parameter
+
+
+@pytest.fixture
+def data():
+    X, y = make_regression(n_samples=150, n_features=4, noise=5.0, random_state=0)
+    return X, y
+
+
+@pytest.mark.parametrize(
+    "estimator, param_grid, groups",
+    [
+        (
+            GradientBoostingRegressor(random_state=0),
+            {"n_estimators": [4, 8, 16], "subsample": [0.8, 1.0]},
+            2,
+        ),
+        (AdaBoostRegressor(random_state=0), {"n_estimators": [4, 8, 16]}, 1),
+        (RandomForestRegressor(random_state=0), {"n_estimators": [4, 8, 16]}, 1),
+        (XGBRegressor(), {"n_estimators": [4, 8, 16], "max_depth": [2, 3]}, 2),
+        (
+            CatBoostRegressor(verbose=False, allow_writing_files=False),
+            {"iterations": [4, 8, 16], "learning_rate": [0.1]},
+            1,
+        ),
+    ],
+)
+def test_staged_scores_match_grid_search(data, estimator, param_grid, groups):
+    search = build_search(estimator, param_grid, SearchConfig(), 3, 1)
+    assert isinstance(search, StagedSearchCV)
+    search.fit(*data)
+
+    grid_search = GridSearchCV(estimator, param_grid, cv=3, scoring="r2").fit(*data)
+    expected = grid_search.cv_results_
+    assert search.cv_results_["params"] == expected["params"]
+    for fold in range(3):
+        np.testing.assert_allclose(
+            search.cv_results_[f"split{fold}_test_score"],
+            expected[f"split{fold}_test_score"],
+            rtol=1e-6,
+        )
+    assert search.best_params_ == grid_search.best_params_
+    # One fit per fold of each group of sizes
+    assert search.n_fits_ == groups * 3
+
+
+def test_staging_only_applies_to_size_sweeps():
+    candidates = [{"n_estimators": 8}, {"n_estimators": 16}]
+
+    assert staged_parameter(GradientBoostingRegressor(), candidates) == "n_estimators"
+    assert staged_parameter(DecisionTreeRegressor(), [{"max_depth": 2}]) is None
+    assert staged_parameter(GradientBoostingRegressor(), candidates[:1]) is None
+    # Early stopping, or CatBoost's size-dependent default learning rate, change
+    # the first trees of a larger ensemble
+    assert staged_parameter(GradientBoostingRegressor(n_iter_no_change=2), candidates) is None
+    assert staged_parameter(CatBoostRegressor(), [{"iterations": 8}, {"iterations": 16}]) is None
+    assert group_candidates(
+        [{"n_estimators": 16, "a": 1}, {"n_estimators": 8, "a": 1}, {"n_estimators": 8, "a": 2}],
+        "n_estimators",
+    ) == [({"a": 1}, [(1, 8), (0, 16)]), ({"a": 2}, [(2, 8)])]
+
+    param_grid = {"n_estimators": [8, 16, 32], "learning_rate": [0.1, 0.2]}
+    assert count_candidates(param_grid, SearchConfig(), GradientBoostingRegressor()) == 2
+    assert count_candidates(param_grid, SearchConfig(staged=False), GradientBoostingRegressor()) == 6
+
+
+def test_scheduler_runs_one_task_per_staged_fold(monkeypatch, data):
+    config = {
+        "models": {
+            "Random Forest": {
+                "type": "RandomForestRegressor",
+                "params": {"n_estimators": [4, 8, 16], "random_state": [0]},
+            }
+        }
+    }
+    monkeypatch.setattr(model_training_service, "load_model_config", lambda: config)
+    X, y = data
+    array = np.c_[X, y]
+    train_array, test_array = array[:120], array[120:]
+
+    scheduler = TrainingScheduler(CpuBudgetManager(1))
+    fold_tasks, _, _ = scheduler.build_tasks(["Random Forest"])
+    assert [task.kind for task in fold_tasks] == [STAGED] * 3
+    assert fold_tasks[0].candidate == [0, 1, 2]
+
+    scheduled = scheduler.run(["Random Forest"], train_array, test_array)["Random Forest"]
+    expected = ModelTrainingService().train_and_validate(
+        "Random Forest", train_array, test_array
+    )
+    assert scheduled["model"].get_params() == expected["model"].get_params()
+    for results in (scheduled, expected):
+        assert results["search"]["staged_parameter"] == "n_estimators"
+        assert results["search"]["n_fits"] == 3
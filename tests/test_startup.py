@@ -0,0 +1,123 @@
+import os
+import subprocess
+import sys
+
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+
+from src.services.data_transformation_service import DataTransformationService
+from src.utils.file_utils import save_object
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Start-up import guarantees, as in benchmarks/startup_benchmark.py:
+# `launch_host.py --help` must not import the ML stack, `ingest` only pandas
+# and the split, and the REST app only the libraries of the model it serves
+ML_STACK = {"numpy", "pandas", "sklearn"}
+MODEL_LIBRARIES = {"catboost", "xgboost", "sklearn.ensemble"}
+
+RUN_LAUNCH_HOST = (
+    "import runpy, sys\n"
+    "sys.argv = {argv!r}\n"
+    "try:\n"
+    "    runpy.run_path('launch_host.py', run_name='__main__')\n"
+    "except SystemExit:\n"
+    "    pass\n"
+)
+
+
+def run_python(code: str, **env) -> str:
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        env={**os.environ, **env},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout
+
+
+def imported_modules(code: str, **env) -> set:
+    stdout = run_python(
+        code + "\nimport sys\nprint(' '.join(sorted(sys.modules)))", **env
+    )
+    return set(stdout.splitlines()[-1].split())
+
+
+def save_linear_model(base_dir):
+    # A few student records, covering both values of the binary features
+    features = pd.DataFrame(
+        {
+            "gender": ["female", "male", "female", "male"],
+            "race_ethnicity": ["group A", "group B", "group C", "group B"],
+            "parental_level_of_education": [
+                "some college",
+                "high school",
+                "master's degree",
+                "some college",
+            ],
+            "lunch": ["standard", "free/reduced", "standard", "free/reduced"],
+            "test_preparation_course": ["none", "completed", "completed", "none"],
+            "reading_score": [72.0, 55.0, 90.0, 64.0],
+            "writing_score": [74.0, 50.0, 88.0, 60.0],
+        }
+    )
+    preprocessor = DataTransformationService().get_data_transformer_object()
+    model = LinearRegression().fit(
+        preprocessor.fit_transform(features), [70.0, 52.0, 89.0, 61.0]
+    )
+    save_object(os.path.join(base_dir, "preprocessor.pkl"), preprocessor)
+    save_object(os.path.join(base_dir, "models", "model.pkl"), model)
+
+
+def test_help_does_not_import_the_ml_stack():
+    modules = imported_modules(
+        RUN_LAUNCH_HOST.format(argv=["launch_host.py", "--help"])
+    )
+
+    assert not ML_STACK & modules
+
+
+def test_ingest_does_not_import_model_libraries(tmp_path):
+    modules = imported_modules(
+        RUN_LAUNCH_HOST.format(argv=["launch_host.py", "ingest"]),
+        BASE_DIR=str(tmp_path / "artifacts"),
+    )
+
+    assert "src.pipeline.train_pipeline" not in modules
+    assert not MODEL_LIBRARIES & modules
+
+
+def test_rest_app_serves_a_linear_model_without_model_libraries(tmp_path):
+    # Serving a linear model needs none of the tree ensemble libraries
+    base_dir = tmp_path / "artifacts"
+    save_linear_model(str(base_dir))
+
+    modules = imported_modules("import predict_rest_api", BASE_DIR=str(base_dir))
+
+    assert "sklearn.linear_model" in modules
+    assert not MODEL_LIBRARIES & modules
+
+
+def test_host_does_not_import_model_libraries(tmp_path):
+    modules = imported_modules(
+        "import launch_host\n"
+        "from src.services.data_ingestion_service import DataIngestionService",
+        BASE_DIR=str(tmp_path / "artifacts"),
+    )
+
+    assert "src.pipeline.train_pipeline" not in modules
+    assert not MODEL_LIBRARIES & modules
+    # Reading the settings and creating loggers has no file system side effects
+    assert not os.path.exists(tmp_path / "artifacts")
+
+
+def test_model_class_is_imported_on_use():
+    modules = imported_modules(
+        "from src.utils.ml_utils import get_model_class\n"
+        "assert get_model_class('LinearRegression').__name__ == 'LinearRegression'"
+    )
+
+    assert "sklearn.linear_model" in modules
+    assert not {"catboost", "xgboost"} & modules
@@ -0,0 +1,174 @@
+import os
+
+import numpy as np
+import pytest
+from sklearn.datasets import make_regression
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.tree import DecisionTreeRegressor
+
+from src.config.config import Config
+from src.pipeline.cpu_budget import CpuBudgetManager
+from src.pipeline.train_pipeline import TrainPipeline
+from src.pipeline.training_cache import (
+    FOLD_SCORE,
+    MODEL,
+    SEARCH,
+    TrainingCache,
+    hash_arrays,
+    hash_folds,
+)
+from src.pipeline.training_scheduler import TrainingScheduler
+from src.services import model_training_service
+from src.services.model_training_service import ModelTrainingService
+from src.utils.file_utils import load_object, save_object
+
+MODEL_CONFIG = {
+    "models": {
+        "Decision Tree": {
+            "type": "DecisionTreeRegressor",
+            "params": {"max_depth": [2, 4], "random_state": [0]},
+        },
+        "Gradient Boosting": {
+            "type": "GradientBoostingRegressor",
+            "params": {"n_estimators": [8, 16], "random_state": [0]},
+        },
+        "Early Gradient Boosting": {
+            "type": "GradientBoostingRegressor",
+            "params": {"learning_rate": [0.1, 0.3], "random_state": [0]},
+            "early_stopping": {"rounds": 5, "max_rounds": 50},
+        },
+        "Linear Regression": {"type": "LinearRegression", "params": {}},
+    }
+}
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    config = Config()
+    monkeypatch.setattr(config, "TRAINING_CACHE_ENABLED", True)
+    monkeypatch.setattr(config, "TRAINING_CACHE_DIR", str(tmp_path / "training_cache"))
+    return config.TRAINING_CACHE_DIR
+
+
+@pytest.fixture
+def arrays(cache_dir, monkeypatch):
+    monkeypatch.setattr(
+        model_training_service, "load_model_config", lambda: MODEL_CONFIG
+    )
+    X, y = make_regression(n_samples=200, n_features=5, noise=5.0, random_state=0)
+    data = np.c_[X, y]
+    return data[:160], data[160:]
+
+
+def test_keys_cover_data_params_and_folds_but_not_threads(cache_dir):
+    cache = TrainingCache()
+    X = np.arange(12.0).reshape(4, 3)
+    key = cache.make_key(MODEL, RandomForestRegressor(n_jobs=1), data=hash_arrays(X))
+
+    assert key == cache.make_key(
+        MODEL, RandomForestRegressor(n_jobs=4), data=hash_arrays(X.copy())
+    )
+    assert key != cache.make_key(
+        MODEL, RandomForestRegressor(), {"max_depth": 3}, data=hash_arrays(X)
+    )
+    assert key != cache.make_key(MODEL, RandomForestRegressor(), data=hash_arrays(X + 1))
+    assert key != cache.make_key(
+        FOLD_SCORE, RandomForestRegressor(), data=hash_arrays(X)
+    )
+    assert hash_folds([(np.arange(2), np.arange(2, 4))]) != hash_folds(
+        [(np.arange(3), np.arange(3, 4))]
+    )
+
+
+def test_cache_evicts_the_least_recently_used_entries(cache_dir):
+    value = np.zeros(1000)
+    cache = TrainingCache()
+    cache.put("a" * 64, value, MODEL)
+    cache.put("b" * 64, value, MODEL)
+    cache.max_bytes = cache.size() + cache.size() // 2
+    cache.put("c" * 64, {"score": 0.5}, FOLD_SCORE, inline=True)
+
+    # Reading an entry makes it the most recently used
+    assert cache.get("a" * 64) is not None
+    cache.put("d" * 64, value, MODEL)
+
+    assert sorted(cache.index) == ["a" * 64, "c" * 64, "d" * 64]
+    assert not os.path.exists(cache.object_path("b" * 64))
+    assert cache.size() <= cache.max_bytes
+    assert cache.stats()["evictions"] == 1
+
+    # The index survives the process once flushed
+    cache.flush()
+    reloaded = TrainingCache()
+    assert sorted(reloaded.index) == ["a" * 64, "c" * 64, "d" * 64]
+    assert np.array_equal(reloaded.get("d" * 64), value)
+    assert reloaded.get("b" * 64) is None
+
+
+def test_training_reuses_cached_results(arrays):
+    train_array, test_array = arrays
+    model_names = list(MODEL_CONFIG["models"])
+
+    first = TrainingScheduler(CpuBudgetManager(1)).run(
+        model_names, train_array, test_array
+    )
+    assert not any(results["cached"] for results in first.values())
+
+    # The searches and fitted models are cached: nothing is trained again
+    scheduler = TrainingScheduler(CpuBudgetManager(1))
+    second = scheduler.run(model_names, train_array, test_array)
+    assert scheduler.stats["tasks"] == len(model_names)
+    service = ModelTrainingService()
+    for model_name in model_names:
+        sequential = service.train_and_validate(model_name, train_array, test_array)
+        for results in (second[model_name], sequential):
+            assert results["cached"], model_name
+            assert results["cache_key"] == first[model_name]["cache_key"]
+            assert results["test_r2"] == first[model_name]["test_r2"]
+            assert results["search"] == first[model_name]["search"]
+
+    # Without the searches, the scheduler reuses the cached fold scores
+    cache = TrainingCache()
+    for key, _ in cache.entries(SEARCH):
+        del cache.index[key]
+    cache.flush()
+    third = TrainingScheduler(CpuBudgetManager(1)).run(
+        ["Decision Tree", "Gradient Boosting"], train_array, test_array
+    )
+    for model_name, results in third.items():
+        assert results["cached"] and results["search"]["n_fits"] == 0
+        assert results["model"].get_params() == first[model_name]["model"].get_params()
+
+
+def test_promote_saves_a_cached_model(cache_dir, tmp_path, monkeypatch):
+    config = Config()
+    monkeypatch.setattr(config, "MODEL_FILE_PATH", str(tmp_path / "model.pkl"))
+    monkeypatch.setattr(
+        config, "FOLDED_MODEL_FILE_PATH", str(tmp_path / "folded_model.pkl")
+    )
+    monkeypatch.setattr(
+        config, "PREPROCESSOR_FILE_PATH", str(tmp_path / "preprocessor.pkl")
+    )
+    monkeypatch.setattr(config, "model_version", None)
+
+    # A run whose preprocessor has since been replaced by another run's
+    model = DecisionTreeRegressor(max_depth=2).fit([[0.0], [1.0]], [0.0, 1.0])
+    train_results = {"model": model, "model_name": "Decision Tree"}
+    train_results.update(train_r2=1.0, test_r2=0.5, best_iteration=None)
+    cache = TrainingCache()
+    key = cache.make_key(MODEL, model, data="data")
+    ModelTrainingService.cache_model(cache, key, train_results, {"max_depth": 2})
+    cache.flush()
+    save_object(config.PREPROCESSOR_FILE_PATH, "preprocessor-1")
+    TrainPipeline().cache_preprocessor(
+        config.PREPROCESSOR_FILE_PATH, {"Decision Tree": {"cache_key": key}}
+    )
+    save_object(config.PREPROCESSOR_FILE_PATH, "preprocessor-2")
+
+    entry = TrainPipeline().promote(key[:8])
+
+    assert entry["model_name"] == "Decision Tree"
+    assert load_object(config.MODEL_FILE_PATH).get_params() == model.get_params()
+    assert load_object(config.PREPROCESSOR_FILE_PATH) == "preprocessor-1"
+    with pytest.raises(Exception, match="No cached model matches"):
+        TrainPipeline().promote("unknown")
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+from sklearn.datasets import make_regression
+
+from src.pipeline.cpu_budget import CpuBudgetManager
+from src.pipeline.training_scheduler import (
+    FOLD,
+    TrainingScheduler,
+    estimate_cost,
+)
+from src.services import model_training_service
+from src.services.model_training_service import ModelTrainingService
+
+MODEL_CONFIG = {
+    "models": {
+        "Decision Tree": {
+            "type": "DecisionTreeRegressor",
+            "params": {"max_depth": [2, 4, 8], "random_state": [0]},
+            # A fixed constructor parameter, outside the grid
+            "min_samples_leaf": 2,
+        },
+        "Gradient Boosting": {
+            "type": "GradientBoostingRegressor",
+            "params": {"n_estimators": [8, 32], "random_state": [0]},
+            # One fold task per candidate (see tests/test_staged_search.py)
+            "search": {"staged": False},
+        },
+        "Linear Regression": {"type": "LinearRegression", "params": {}},
+    }
+}
+
+
+@pytest.fixture
+def arrays(monkeypatch):
+    monkeypatch.setattr(
+        model_training_service, "load_model_config", lambda: MODEL_CONFIG
+    )
+    X, y = make_regression(n_samples=200, n_features=5, noise=5.0, random_state=0)
+    data = np.c_[X, y]
+    return data[:160], data[160:]
+
+
+def test_scheduler_matches_sequential_training(arrays):
+    train_array, test_array = arrays
+    model_names = list(MODEL_CONFIG["models"])
+
+    scheduler = TrainingScheduler(CpuBudgetManager(2))
+    scheduled = scheduler.run(model_names, train_array, test_array)
+
+    service = ModelTrainingService()
+    for model_name in model_names:
+        expected = service.train_and_validate(model_name, train_array, test_array)
+        assert scheduled[model_name]["model"].get_params() == expected["model"].get_params()
+        assert scheduled[model_name]["train_r2"] == pytest.approx(expected["train_r2"])
+        assert scheduled[model_name]["test_r2"] == pytest.approx(expected["test_r2"])
+        assert scheduled[model_name]["cpu_split"]["outer_jobs"] >= 1
+    assert scheduled["Decision Tree"]["model"].min_samples_leaf == 2
+
+    # 3 + 2 candidates x 3 folds, plus one refit per model
+    assert scheduler.stats["tasks"] == 15 + 3
+    assert 0 < scheduler.stats["utilization"] <= 1
+
+
+def test_scheduler_starts_expensive_tasks_first(arrays):
+    fold_tasks, grids, refits = TrainingScheduler(CpuBudgetManager(1)).build_tasks(
+        list(MODEL_CONFIG["models"])
+    )
+
+    assert len(fold_tasks) == 15 and all(task.kind == FOLD for task in fold_tasks)
+    assert [len(grid) for grid in grids.values()] == [3, 2, 0]
+    assert [task.model_name for task in refits] == ["Linear Regression"]
+
+    first = min(fold_tasks + refits)
+    assert first.model_name == "Gradient Boosting"
+    assert first.params["n_estimators"] == 32
+    assert estimate_cost("GradientBoostingRegressor", {"n_estimators": 32}) > (
+        estimate_cost("DecisionTreeRegressor", {"max_depth": 8})
+    )
@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+import pytest
+from catboost import CatBoostRegressor
+from sklearn.ensemble import (
+    AdaBoostRegressor,
+    GradientBoostingRegressor,
+    RandomForestRegressor,
+)
+from sklearn.linear_model import LinearRegression
+from sklearn.tree import DecisionTreeRegressor
+from xgboost import XGBRegressor
+
+from src.pipeline.tree_ensemble import TreeEnsemble
+from src.services.data_transformation_service import DataTransformationService
+
+MODELS = {
+    "DecisionTreeRegressor": lambda: DecisionTreeRegressor(random_state=0),
+    "RandomForestRegressor": lambda: RandomForestRegressor(
+        n_estimators=16, random_state=0
+    ),
+    "GradientBoostingRegressor": lambda: GradientBoostingRegressor(
+        n_estimators=32, subsample=0.8, random_state=0
+    ),
+    "AdaBoostRegressor": lambda: AdaBoostRegressor(n_estimators=16, random_state=0),
+    "XGBRegressor": lambda: XGBRegressor(n_estimators=32, max_depth=5),
+    "CatBoostRegressor": lambda: CatBoostRegressor(
+        iterations=30, depth=6, verbose=False, allow_writing_files=False
+    ),
+}
+
+
+@pytest.fixture(scope="module")
+def student_data():
+    df = pd.read_csv("notebook/data/stud.csv")
+    features = df.drop(columns=["math_score"])
+    preprocessor = DataTransformationService().get_data_transformer_object()
+    return preprocessor.fit_transform(features), df["math_score"].to_numpy()
+
+
+@pytest.mark.parametrize("model_name", list(MODELS))
+def test_engine_matches_native_predict(model_name, student_data):
+    X, y = student_data
+    model = MODELS[model_name]().fit(X, y)
+
+    engine = TreeEnsemble.from_model(model)
+    engine.verify(model, X)
+
+    np.testing.assert_allclose(
+        engine.predict(X), model.predict(X), rtol=1e-12, atol=1e-9
+    )
+    np.testing.assert_allclose(
+        engine.predict(X[:1]), model.predict(X[:1]), rtol=1e-12, atol=1e-9
+    )
+
+
+@pytest.mark.parametrize(
+    "model_name", ["RandomForestRegressor", "XGBRegressor", "CatBoostRegressor"]
+)
+def test_engine_handles_missing_values(model_name, student_data):
+    X, y = student_data
+    model = MODELS[model_name]().fit(X, y)
+    X_missing = X.copy()
+    X_missing[::5, 0] = np.nan
+    X_missing[::3, -1] = np.nan
+
+    engine = TreeEnsemble.from_model(model)
+    np.testing.assert_allclose(
+        engine.predict(X_missing), model.predict(X_missing), rtol=1e-12, atol=1e-9
+    )
+
+
+def test_engine_uses_xgboost_best_iteration(student_data):
+    X, y = student_data
+    model = XGBRegressor(n_estimators=200, learning_rate=0.3, early_stopping_rounds=5)
+    model.fit(X[:800], y[:800], eval_set=[(X[800:], y[800:])], verbose=False)
+    assert model.best_iteration < 199
+
+    engine = TreeEnsemble.from_model(model)
+    assert engine.n_trees == model.best_iteration + 1
+    np.testing.assert_allclose(engine.predict(X), model.predict(X), rtol=1e-12)
+
+
+def test_engine_rejects_unsupported_model(student_data):
+    X, y = student_data
+    model = LinearRegression().fit(X, y)
+
+    assert not TreeEnsemble.is_supported(model)
+    with pytest.raises(ValueError, match="Unsupported model type"):
+        TreeEnsemble.from_model(model)
+
+
+def test_engine_rejects_wrong_feature_count(student_data):
+    X, y = student_data
+    engine = TreeEnsemble.from_model(MODELS["RandomForestRegressor"]().fit(X, y))
+
+    with pytest.raises(ValueError, match="features"):
+        engine.predict(X[:, :3])
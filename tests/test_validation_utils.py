@@ -0,0 +1,81 @@
+import pytest
+from pydantic import ValidationError
+
+from src.models.prediction_request import PredictionRequest
+from src.utils.validation_utils import (
+    format_validation_errors,
+    validate_columns,
+    validate_records,
+)
+
+
+def make_record(**overrides):
+    record = {
+        "gender": "female",
+        "race_ethnicity": "group B",
+        "parental_level_of_education": "some college",
+        "lunch": "standard",
+        "test_preparation_course": "completed",
+        "reading_score": 72,
+        "writing_score": 74,
+    }
+    record.update(overrides)
+    return record
+
+
+def test_validate_records_all_valid():
+    records = [make_record(), make_record(gender="male")]
+
+    validated, valid_indices, errors = validate_records(records)
+
+    assert [record.gender for record in validated] == ["female", "male"]
+    assert valid_indices == [0, 1]
+    assert errors == {}
+
+
+def test_validate_records_collects_errors_per_record():
+    records = [
+        make_record(),
+        make_record(lunch="free"),
+        "not a record",
+        make_record(reading_score=101),
+    ]
+
+    validated, valid_indices, errors = validate_records(records)
+
+    assert len(validated) == 1
+    assert valid_indices == [0]
+    assert errors[1] == [
+        {"field": "lunch", "error": "Input should be 'standard' or 'free/reduced'"}
+    ]
+    assert errors[2][0]["field"] == ""
+    assert errors[3][0]["field"] == "reading_score"
+
+
+def test_validate_columns_returns_valid_records_as_columns():
+    records = [make_record(), make_record(gender="x"), make_record(gender="male")]
+
+    columns, valid_indices, errors = validate_columns(records)
+
+    assert valid_indices == [0, 2]
+    assert list(errors) == [1]
+    assert columns["gender"] == ["female", "male"]
+    assert columns["reading_score"] == [72.0, 72.0]
+
+
+def test_format_validation_errors_strips_prefix():
+    with pytest.raises(ValidationError) as exc_info:
+        PredictionRequest.model_validate(
+            {"payload": {"data": make_record(writing_score="")}}
+        )
+
+    errors = format_validation_errors(exc_info.value, loc_prefix=("payload", "data"))
+
+    assert errors[0]["field"] == "writing_score"
+
+    with pytest.raises(ValidationError) as exc_info:
+        PredictionRequest.model_validate({"payload": {}})
+
+    errors = format_validation_errors(exc_info.value, loc_prefix=("payload", "data"))
+
+    assert errors == [{"field": "data", "error": "Field required"}]